@@ -0,0 +1,196 @@
+"""
+Async load scenario for the CRUD routers: `--concurrency` virtual users run
+a weighted mix of list, detail, create, update and delete requests for
+`--duration` seconds. Without `--url` it runs in-process against the app on
+its `lifespan_test` database, seeded first.
+
+    python -m benchmarks.load [--url https://host] [--concurrency 20] \
+        [--duration 30] [--tasks 10000] [--output load-results.json]
+
+Against a server, log in with `--username/--password` as a user whose group
+may read groups and users and manage tags.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+# before `.seed`, whose imports of `src.app.*` shadow the `src.app` attribute
+from src import app
+from src.helper.common.model import Tag
+
+from .seed import PASSWORD, USERNAME, seed
+
+LOGIN = "/api/user/auth/login"
+TAGS = "/api/c/tag/"
+SEEDED_TAGS = 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Server to load; in-process when omitted.")
+    parser.add_argument("--username", default=USERNAME)
+    parser.add_argument("--password", default=PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--output", default="load-results.json")
+    return parser.parse_args()
+
+
+class Scenario:
+    """The request mix of one virtual user; weights are relative."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.created: list[int] = []
+        self.actions = {
+            self.list_tags: 5,
+            self.get_tag: 3,
+            self.list_groups: 2,
+            self.list_users: 1,
+            self.create_tag: 1,
+            self.update_tag: 1,
+            self.delete_tag: 1,
+        }
+
+    def pick(self):
+        return random.choices(list(self.actions), weights=self.actions.values())[0]
+
+    async def list_tags(self):
+        page = random.randint(1, SEEDED_TAGS // 10)
+        return "list tags", await self.client.get(TAGS, params={"page": page})
+
+    async def get_tag(self):
+        return "get tag", await self.client.get(
+            f"{TAGS}{random.randint(1, SEEDED_TAGS)}"
+        )
+
+    async def list_groups(self):
+        return "list groups", await self.client.get("/api/group/")
+
+    async def list_users(self):
+        return "list users", await self.client.get("/api/user/")
+
+    async def create_tag(self):
+        response = await self.client.post(TAGS, json={"name": uuid.uuid4().hex})
+        if response.status_code == 200:
+            self.created.append(response.json()["id"])
+        return "create tag", response
+
+    async def update_tag(self):
+        if not self.created:
+            return await self.create_tag()
+        return "update tag", await self.client.put(
+            f"{TAGS}{random.choice(self.created)}", json={"name": uuid.uuid4().hex}
+        )
+
+    async def delete_tag(self):
+        if not self.created:
+            return await self.create_tag()
+        return "delete tag", await self.client.delete(f"{TAGS}{self.created.pop()}")
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str):
+    response = await client.post(
+        LOGIN, json={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    client.cookies.set("access_token", response.json()["access_token"])
+
+
+async def virtual_user(client, deadline: float, samples: dict, errors: dict):
+    scenario = Scenario(client)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            name, response = await scenario.pick()()
+        except httpx.HTTPError as error:
+            errors[type(error).__name__] += 1
+            continue
+        samples[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            errors[f"{name} {response.status_code}"] += 1
+
+
+def summarize(samples: dict, errors: dict, duration: float) -> dict:
+    summary = {}
+    for name, durations in sorted(samples.items()):
+        durations.sort()
+        summary[name] = {
+            "requests": len(durations),
+            "rps": len(durations) / duration,
+            "median_ms": statistics.median(durations) * 1000,
+            "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+            "p99_ms": durations[int(len(durations) * 0.99) - 1] * 1000,
+        }
+    total = sum(len(durations) for durations in samples.values())
+    return {
+        "total_requests": total,
+        "total_rps": total / duration,
+        "errors": dict(errors),
+        "routes": summary,
+    }
+
+
+async def load(client: httpx.AsyncClient, args) -> dict:
+    await login(client, args.username, args.password)
+    samples, errors = defaultdict(list), defaultdict(int)
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(
+        *(
+            virtual_user(client, deadline, samples, errors)
+            for _ in range(args.concurrency)
+        )
+    )
+    return summarize(samples, errors, time.perf_counter() - start)
+
+
+async def load_in_process(args) -> dict:
+    app.state.testing = True
+    async with app.router.lifespan_context(app):
+        await seed(args.tasks)
+        await Tag.bulk_create([Tag(name=f"tag-{i}") for i in range(SEEDED_TAGS)])
+        transport = httpx.ASGITransport(app=app)
+        # https so the secure auth cookies are kept
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://benchmark"
+        ) as client:
+            return await load(client, args)
+
+
+async def main():
+    args = parse_args()
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+            results = await load(client, args)
+    else:
+        results = await load_in_process(args)
+    results["meta"] = {
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    for name, route in results["routes"].items():
+        print(
+            f"{name:<14} {route['requests']:>7} req  {route['rps']:8.1f} rps  "
+            f"median {route['median_ms']:7.2f} ms  p95 {route['p95_ms']:7.2f} ms"
+        )
+    print(f"errors: {results['errors'] or 'none'}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
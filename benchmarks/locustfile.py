@@ -0,0 +1,70 @@
+"""
+The `benchmarks.load` scenario for locust, to load a deployed server from
+several machines:
+
+    locust -f benchmarks/locustfile.py --host https://host -u 50 -r 5
+
+The target must hold the `benchmarks.seed` user and at least `SEEDED_TAGS`
+tags.
+"""
+
+import random
+import uuid
+
+from locust import HttpUser, between, task
+
+from benchmarks.load import LOGIN, SEEDED_TAGS, TAGS
+from benchmarks.seed import PASSWORD, USERNAME
+
+
+class ApiUser(HttpUser):
+    wait_time = between(0.1, 1)
+
+    def on_start(self):
+        self.created: list[int] = []
+        response = self.client.post(
+            LOGIN, json={"username": USERNAME, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        self.client.cookies.set("access_token", response.json()["access_token"])
+
+    @task(5)
+    def list_tags(self):
+        page = random.randint(1, SEEDED_TAGS // 10)
+        self.client.get(TAGS, params={"page": page}, name="list tags")
+
+    @task(3)
+    def get_tag(self):
+        self.client.get(f"{TAGS}{random.randint(1, SEEDED_TAGS)}", name="get tag")
+
+    @task(2)
+    def list_groups(self):
+        self.client.get("/api/group/", name="list groups")
+
+    @task(1)
+    def list_users(self):
+        self.client.get("/api/user/", name="list users")
+
+    @task(1)
+    def create_tag(self):
+        response = self.client.post(
+            TAGS, json={"name": uuid.uuid4().hex}, name="create tag"
+        )
+        if response.status_code == 200:
+            self.created.append(response.json()["id"])
+
+    @task(1)
+    def update_tag(self):
+        if not self.created:
+            return self.create_tag()
+        self.client.put(
+            f"{TAGS}{random.choice(self.created)}",
+            json={"name": uuid.uuid4().hex},
+            name="update tag",
+        )
+
+    @task(1)
+    def delete_tag(self):
+        if not self.created:
+            return self.create_tag()
+        self.client.delete(f"{TAGS}{self.created.pop()}", name="delete tag")
@@ -0,0 +1,228 @@
+"""
+Micro-benchmarks for the API hot paths against a freshly seeded database,
+configured the way `lifespan_test` does (in-memory sqlite by default).
+
+    python -m benchmarks.run [--sizes 10000 100000 1000000] [--iterations 50] \
+        [--db sqlite://:memory:] [--output results.json] \
+        [--baseline previous.json --threshold 0.2]
+
+With `--baseline`, medians are compared to an earlier results file and the
+run exits with status 1 when any benchmark got slower than `--threshold`.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+from tortoise import Tortoise, generate_config
+
+from src.app.project.model import Board, Column, Task
+from src.app.project.scheme import TaskResponseScheme
+from src.config.settings import APPS
+from src.helper.filters import Filter, build_filter_schema
+from src.helper.logger import log_action
+from src.helper.metrics import instrument_connections, track_queries
+from src.helper.paginate import Paginator
+from src.helper.permission.controller import has_access
+from src.helper.user.model import User
+
+from .seed import seed
+
+PAGE_SIZE = 20
+TaskFilterSchema = build_filter_schema(Task)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--db", default="sqlite://:memory:")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    return parser.parse_args()
+
+
+def fake_request(method: str = "GET", path: str = "/api/task/") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "headers": [(b"user-agent", b"benchmark")],
+            "client": ("127.0.0.1", 50000),
+        }
+    )
+
+
+async def noop(**kwargs):
+    return None
+
+
+async def prepare(dataset: dict) -> dict:
+    """Builds what the benchmarks need, outside of the timed part."""
+    user = await User.get(id=dataset["user_id"])
+    return {
+        **dataset,
+        "user": user,
+        "request": fake_request(),
+        "page": max(1, dataset["tasks"] // PAGE_SIZE // 2),
+        "tasks_page": await Task.filter(board_id=dataset["board_id"]).limit(100),
+        "guarded": has_access(action="view_all", to=Task._meta.db_table)(noop),
+        "logged": log_action(action="view_all", model=Task._meta.db_table)(noop),
+    }
+
+
+async def bench_paginated(context):
+    await Paginator(limit=PAGE_SIZE, page=context["page"]).paginated(
+        TaskResponseScheme, Task.all()
+    )
+
+
+async def bench_filter_create(context):
+    filters = TaskFilterSchema(
+        board_id=context["board_id"], name__startswith="Task 1"
+    )
+    await Filter.create(Task.all(), filters).limit(PAGE_SIZE)
+
+
+async def bench_from_tortoise_orm(context):
+    await TaskResponseScheme.from_tortoise_orm(
+        TaskResponseScheme, context["tasks_page"], many=True
+    )
+
+
+async def bench_has_access(context):
+    await context["guarded"](user=context["user"], request=context["request"])
+
+
+async def bench_log_action(context):
+    await context["logged"](user=context["user"], request=context["request"])
+
+
+async def bench_board_load(context):
+    board_id = context["board_id"]
+    await Board.get(id=board_id)
+    await Column.filter(board_id=board_id).order_by("position")
+    tasks = await Task.filter(board_id=board_id).order_by("position")
+    await TaskResponseScheme.from_tortoise_orm(TaskResponseScheme, tasks, many=True)
+
+
+BENCHMARKS = {
+    "paginated": bench_paginated,
+    "filter_create": bench_filter_create,
+    "from_tortoise_orm": bench_from_tortoise_orm,
+    "has_access": bench_has_access,
+    "log_action": bench_log_action,
+    "board_load": bench_board_load,
+}
+
+
+async def measure(benchmark, context, iterations: int) -> dict:
+    await benchmark(context)  # warm up caches and prepared statements
+    durations, queries = [], 0
+    for _ in range(iterations):
+        with track_queries() as stats:
+            start = time.perf_counter()
+            await benchmark(context)
+            durations.append(time.perf_counter() - start)
+        queries += stats.count
+    durations.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(durations) * 1000,
+        "median_ms": statistics.median(durations) * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+        "min_ms": durations[0] * 1000,
+        "max_ms": durations[-1] * 1000,
+        "ops_per_sec": len(durations) / sum(durations),
+        "queries_per_op": queries / iterations,
+    }
+
+
+async def run_size(db_url: str, tasks: int, iterations: int) -> dict:
+    await Tortoise.init(
+        config=generate_config(
+            db_url,
+            app_modules={"models": APPS},
+            testing=True,
+            connection_label="default",
+        ),
+        _create_db=True,
+    )
+    try:
+        await Tortoise.generate_schemas()
+        instrument_connections()
+        start = time.perf_counter()
+        context = await prepare(await seed(tasks))
+        results = {"seed_seconds": time.perf_counter() - start}
+        for name, benchmark in BENCHMARKS.items():
+            results[name] = await measure(benchmark, context, iterations)
+            print(
+                f"{tasks:>9} tasks  {name:<18} "
+                f"median {results[name]['median_ms']:8.2f} ms  "
+                f"p95 {results[name]['p95_ms']:8.2f} ms  "
+                f"{results[name]['queries_per_op']:5.1f} queries"
+            )
+        return results
+    finally:
+        await Tortoise._drop_databases()
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for size, benchmarks in results["results"].items():
+        for name, current in benchmarks.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if not isinstance(current, dict) or not previous:
+                continue
+            change = current["median_ms"] / previous["median_ms"] - 1
+            print(f"{size:>9} tasks  {name:<18} {change:+8.1%} vs baseline")
+            if change > threshold:
+                regressions.append(f"{name}@{size}: {change:+.1%}")
+    return regressions
+
+
+async def main():
+    args = parse_args()
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db": args.db,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        results["results"][str(size)] = await run_size(args.db, size, args.iterations)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressions:", ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
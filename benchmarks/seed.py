@@ -0,0 +1,84 @@
+"""
+Seeds a benchmark dataset: one user whose group holds every permission, and
+`tasks` tasks spread over projects, boards and columns the way real data is.
+"""
+
+from tortoise import Tortoise
+
+from src.app.project.model import Board, Column, Project, Task
+from src.helper.permission import refresh_group_permissions
+from src.helper.permission.model import Group, Permission
+from src.helper.user.model import User
+
+USERNAME = PASSWORD = "bench"
+TASKS_PER_BOARD = 1000
+BOARDS_PER_PROJECT = 10
+COLUMNS_PER_BOARD = 5
+BATCH_SIZE = 10_000
+ACTIONS = ("view", "view_all", "create", "update", "delete", "patch")
+
+
+async def seed_permissions() -> User:
+    tables = [model._meta.db_table for model in Tortoise.apps["models"].values()]
+    await Permission.bulk_create(
+        [
+            Permission(name=f"{action}_{table}", action=action, to=table)
+            for table in tables
+            for action in ACTIONS
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    group = await Group.create(name="bench")
+    await group.permissions.add(*await Permission.all())
+    await refresh_group_permissions(group.id)
+    return await User.create(
+        username=USERNAME,
+        name=USERNAME,
+        password=PASSWORD,
+        group_id=group.id,
+    )
+
+
+async def seed(tasks: int) -> dict:
+    user = await seed_permissions()
+    boards = max(1, tasks // TASKS_PER_BOARD)
+    projects = max(1, boards // BOARDS_PER_PROJECT)
+    await Project.bulk_create(
+        [Project(name=f"Project {i}", owner_id=user.id) for i in range(projects)]
+    )
+    project_ids = await Project.all().order_by("id").values_list("id", flat=True)
+    await Board.bulk_create(
+        [
+            Board(name=f"Board {i}", project_id=project_ids[i % projects])
+            for i in range(boards)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    board_ids = await Board.all().order_by("id").values_list("id", flat=True)
+    await Column.bulk_create(
+        [
+            Column(name=f"Column {i}", board_id=board_id, position=i * 1000.0)
+            for board_id in board_ids
+            for i in range(COLUMNS_PER_BOARD)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    for start in range(0, tasks, BATCH_SIZE):
+        await Task.bulk_create(
+            [
+                Task(
+                    name=f"Task {i}",
+                    description=f"Benchmark task number {i}",
+                    board_id=board_ids[i % boards],
+                    position=(i // boards) * 1000.0,
+                )
+                for i in range(start, min(start + BATCH_SIZE, tasks))
+            ]
+        )
+    return {
+        "user_id": user.id,
+        "projects": projects,
+        "boards": boards,
+        "tasks": tasks,
+        "board_id": board_ids[len(board_ids) // 2],
+    }
@@ -0,0 +1,48 @@
+"""
+Rebuilds the task analytics rollup (`task_daily_rollup`) from the tasks,
+for existing data or after bulk writes that bypassed the model signals.
+
+    python scripts/backfill_analytics.py [--board 3 --board 7] \
+        [--chunk-size 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tortoise import Tortoise  # noqa: E402
+
+from src.app.project import backfill_task_rollups  # noqa: E402
+from src.config.settings import TORTOISE_ORM  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--board",
+        type=int,
+        action="append",
+        default=[],
+        help="Only rebuild this board; repeatable. Every board by default.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        started = time.perf_counter()
+        read = await backfill_task_rollups(*args.board, chunk_size=args.chunk_size)
+        print(f"Rolled up {read} tasks in {time.perf_counter() - started:.1f}s")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
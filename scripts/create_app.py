@@ -142,12 +142,13 @@ async def get_{model_name}s_router(
     user: User=Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = {model_title}.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        {model_title}ResponseScheme, objects, apply=pagination
+        {model_title}ResponseScheme, objects, apply=pagination, fields=fields
     )
 
 @router.post("/", response_model={model_title}ResponseScheme)
@@ -4,6 +4,8 @@ REPO_URL="git@192.168.10.44:oghaf/backend.git"
 BRANCH="main"
 
 PROJECT_DIR="./oghaf_backend"
+PID_FILE="server.pid"
+export SERVER_PORT="${SERVER_PORT:-5885}"
 
 if [ ! -d "$PROJECT_DIR" ]; then
   git clone "$REPO_URL" "$PROJECT_DIR"
@@ -17,6 +19,20 @@ git pull origin "$BRANCH"
 
 pip install -r requirements.txt
 
-killall uvicorn
+if [ -f "$PID_FILE" ] && kill -0 "$(cat "$PID_FILE")" 2>/dev/null; then
+  # workers are replaced one at a time, each after its successor is ready
+  kill -HUP "$(cat "$PID_FILE")"
+else
+  nohup python -m src >> server.log 2>&1 &
+  echo $! > "$PID_FILE"
+fi
 
-uvicorn src:app --host 0.0.0.0 --port 5885 --reload
+for _ in $(seq 30); do
+  if curl -sf "http://127.0.0.1:$SERVER_PORT/health/ready" > /dev/null; then
+    echo "Server is ready"
+    exit 0
+  fi
+  sleep 1
+done
+echo "Server did not become ready, see server.log" >&2
+exit 1
@@ -0,0 +1,92 @@
+"""
+Reports where worker boot time goes: imports `module` in a fresh interpreter
+with `-X importtime`, then lists the slowest modules by their own and their
+cumulative import time and sums the time per top-level package.
+
+    python scripts/profile_imports.py [src] [--top 25] [--eager] \
+        [--output imports.json]
+
+`--eager` turns LAZY_STARTUP off to compare both startup modes.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("module", nargs="?", default="src")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--eager", action="store_true")
+    parser.add_argument("--output", help="Also write the report as JSON.")
+    return parser.parse_args()
+
+
+def import_times(module: str, eager: bool) -> list[dict]:
+    env = {**os.environ, "LAZY_STARTUP": str(not eager)}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode:
+        sys.exit(process.stderr)
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append(
+            {
+                "module": name.strip(),
+                "self_ms": int(own) / 1000,
+                "cumulative_ms": int(cumulative) / 1000,
+            }
+        )
+    return rows
+
+
+def report(rows: list[dict], module: str, top: int) -> dict:
+    packages = defaultdict(float)
+    for row in rows:
+        packages[row["module"].split(".")[0]] += row["self_ms"]
+    total = next(
+        (row["cumulative_ms"] for row in rows if row["module"] == module),
+        sum(packages.values()),
+    )
+    return {
+        "module": module,
+        "total_ms": total,
+        "slowest_self": sorted(rows, key=lambda row: -row["self_ms"])[:top],
+        "slowest_cumulative": sorted(rows, key=lambda row: -row["cumulative_ms"])[
+            :top
+        ],
+        "packages": dict(sorted(packages.items(), key=lambda item: -item[1])[:top]),
+    }
+
+
+def main():
+    args = parse_args()
+    result = report(import_times(args.module, args.eager), args.module, args.top)
+    print(f"import {args.module}: {result['total_ms']:.0f} ms\n")
+    print(f"{'self ms':>9} {'cumul. ms':>10}  module")
+    for row in result["slowest_self"]:
+        print(f"{row['self_ms']:9.1f} {row['cumulative_ms']:10.1f}  {row['module']}")
+    print(f"\n{'self ms':>9}  package")
+    for package, milliseconds in result["packages"].items():
+        print(f"{milliseconds:9.1f}  {package}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
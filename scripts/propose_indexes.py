@@ -0,0 +1,200 @@
+"""
+Reads postgres slow-query logs (log_min_duration_statement output) and
+proposes indexes for the filter/sort columns of the slowest statements that
+no declared index covers, optionally writing them as an aerich migration.
+
+    python scripts/propose_indexes.py postgresql.log [more.log ...] \
+        [--min-total-ms 1000] [--top 20] [--write migrations/models]
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENTRY = re.compile(
+    r"duration: (?P<ms>[\d.]+) ms\s+(?:statement|execute [^:]*):\s*(?P<sql>.*)"
+)
+FROM = re.compile(r'\bFROM "(\w+)"', re.IGNORECASE)
+WHERE = re.compile(
+    r"\bWHERE\b(?P<where>.*?)(?=\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bOFFSET\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+ORDER = re.compile(
+    r"\bORDER BY\b(?P<order>.*?)(?=\bLIMIT\b|\bOFFSET\b|$)", re.IGNORECASE | re.DOTALL
+)
+COLUMN = r'(?:"(?P<table>\w+)"\.)?"(?P<column>\w+)"'
+LIKE = re.compile(rf"CAST\({COLUMN} AS VARCHAR\)\)?\s+(?:NOT\s+)?I?LIKE", re.I)
+COMPARE = re.compile(rf"{COLUMN}\s*(?P<op>=|<>|!=|>=|<=|>|<|\bIN\b|\bIS\b)", re.I)
+SORT = re.compile(COLUMN)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("logs", nargs="+", help="Slow-query log files ('-' = stdin).")
+    parser.add_argument("--min-total-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--write",
+        metavar="DIR",
+        help="Write the proposals as an aerich migration into DIR.",
+    )
+    return parser.parse_args()
+
+
+def read_statements(paths: list[str]):
+    """Yields (duration_ms, sql), joining the log's continuation lines."""
+    for path in paths:
+        handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with handle:
+            current = None
+            for line in handle:
+                match = ENTRY.search(line)
+                if match:
+                    if current:
+                        yield current
+                    current = [float(match["ms"]), match["sql"].strip()]
+                elif current and line[:1] in (" ", "\t"):
+                    current[1] += " " + line.strip()
+                elif current:
+                    yield current
+                    current = None
+            if current:
+                yield current
+
+
+def analyse(sql: str):
+    """Returns {table: (equality, range, like, order)} column lists for `sql`."""
+    tables = FROM.findall(sql)
+    if not tables:
+        return {}
+    default = tables[0]
+    found = defaultdict(lambda: ([], [], [], []))
+    if where := WHERE.search(sql):
+        clause = where["where"]
+        for match in LIKE.finditer(clause):
+            found[match["table"] or default][2].append(match["column"])
+        for match in COMPARE.finditer(clause):
+            op = match["op"].upper()
+            bucket = 0 if op in ("=", "IN", "IS") else 1
+            found[match["table"] or default][bucket].append(match["column"])
+    if order := ORDER.search(sql):
+        for match in SORT.finditer(order["order"]):
+            found[match["table"] or default][3].append(match["column"])
+    return found
+
+
+def load_models():
+    from tortoise import Tortoise
+
+    from src.config.settings import APPS
+
+    Tortoise.init_models(APPS, "models")
+    return {model._meta.db_table: model for model in Tortoise.apps["models"].values()}
+
+
+def propose(statements, models):
+    from src.helper.db import btree_fields, trigram_fields
+
+    proposals: dict[tuple, list] = {}
+    for duration, sql in statements:
+        for table, (equal, ranged, like, order) in analyse(sql).items():
+            model = models.get(table)
+            btree = btree_fields(model) if model else set()
+            trigram = set(trigram_fields(model)) if model else set()
+            columns = list(dict.fromkeys([*equal, *ranged, *order]))[:3]
+            if columns and columns[0] not in btree:
+                key = (table, "btree", tuple(columns))
+                proposals.setdefault(key, [0.0, 0])
+                proposals[key][0] += duration
+                proposals[key][1] += 1
+            for column in dict.fromkeys(like):
+                if column in trigram:
+                    continue
+                key = (table, "trigram", (column,))
+                proposals.setdefault(key, [0.0, 0])
+                proposals[key][0] += duration
+                proposals[key][1] += 1
+    return sorted(proposals.items(), key=lambda item: -item[1][0])
+
+
+def index_sql(table: str, kind: str, columns: tuple[str, ...]) -> tuple[str, str]:
+    # plain CREATE INDEX: aerich runs migrations in a transaction, which rules
+    # out CONCURRENTLY; run these off-peak on large tables
+    name = f"{table}_{'_'.join(columns)}_{'trgm_idx' if kind == 'trigram' else 'idx'}"
+    if kind == "trigram":
+        column = f'CAST("{columns[0]}" AS VARCHAR)'
+        create = (
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING GIN '
+            f"(({column}) gin_trgm_ops, (UPPER({column})) gin_trgm_ops);"
+        )
+    else:
+        quoted = ", ".join(f'"{column}"' for column in columns)
+        create = f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({quoted});'
+    return create, f'DROP INDEX IF EXISTS "{name}";'
+
+
+def write_migration(directory: str, statements: list[tuple[str, str | None]]) -> str:
+    os.makedirs(directory, exist_ok=True)
+    numbers = [
+        int(name.split("_", 1)[0])
+        for name in os.listdir(directory)
+        if name.split("_", 1)[0].isdigit()
+    ]
+    number = max(numbers) + 1 if numbers else 0
+    stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    path = os.path.join(directory, f"{number}_{stamp}_slow_query_indexes.py")
+    upgrade = "\n        ".join(create for create, _ in statements)
+    downgrade = "\n        ".join(drop for _, drop in reversed(statements) if drop)
+    with open(path, "w") as f:
+        f.write(f'''from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        {upgrade}"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        {downgrade}"""
+''')
+    return path
+
+
+def main():
+    args = parse_args()
+    models = load_models()
+    proposals = [
+        item
+        for item in propose(read_statements(args.logs), models)
+        if item[1][0] >= args.min_total_ms
+    ][: args.top]
+    if not proposals:
+        print("No unindexed hot paths found.")
+        return
+    statements = []
+    if any(kind == "trigram" for (_, kind, _), _ in proposals):
+        statements.append(("CREATE EXTENSION IF NOT EXISTS pg_trgm;", None))
+    for (table, kind, columns), (total, count) in proposals:
+        model = models.get(table)
+        hint = (
+            f"@trigram_index({columns[0]!r})"
+            if kind == "trigram"
+            else f"Meta.indexes += ({columns!r},)"
+        )
+        print(
+            f"{total:>12.1f} ms  {count:>6}x  {table}: {kind} {', '.join(columns)}"
+            f"  -> {model.__name__ if model else table}: {hint}"
+        )
+        statements.append(index_sql(table, kind, columns))
+    if args.write:
+        print(f"Wrote {write_migration(args.write, statements)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,24 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from src.config import (
+    DB_READ_URL,
     DEBUG,
+    QUERY_STATS,
     SHOW_QUERIES_IN_SWAGGER,
+    USE_METRICS,
     api_router,
     lifespan,
     remove_queries_from_swagger,
 )
+from src.helper.health.api import router as health_router
+from src.helper.response import ORJSONResponse
 
-app = FastAPI(title="TASKFLOW Backend", lifespan=lifespan, debug=DEBUG)
+app = FastAPI(
+    title="TASKFLOW Backend",
+    lifespan=lifespan,
+    debug=DEBUG,
+    default_response_class=ORJSONResponse,
+)
 if DEBUG:
     from debug_toolbar.middleware import DebugToolbarMiddleware
 
@@ -34,7 +44,20 @@ else:
         allow_headers=["*"],
         expose_headers=["*"],
     )
+if DB_READ_URL:
+    from src.helper.db import ReadReplicaMiddleware
+
+    app.add_middleware(ReadReplicaMiddleware)
+if QUERY_STATS:
+    from src.helper.metrics import QueryStatsMiddleware
+
+    app.add_middleware(QueryStatsMiddleware)
+if USE_METRICS:
+    from src.helper.metrics.http import HTTPMetricsMiddleware
+
+    app.add_middleware(HTTPMetricsMiddleware)
 app.include_router(api_router, prefix="")
+app.include_router(health_router)
 
 
 if not SHOW_QUERIES_IN_SWAGGER:
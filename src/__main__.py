@@ -0,0 +1,71 @@
+"""
+Production server: `python -m src`.
+
+Runs uvicorn's process supervisor with one worker per usable CPU, on
+uvloop/httptools when installed. SIGTERM stops accepting connections, lets
+in-flight requests finish for SERVER_GRACEFUL_TIMEOUT seconds, then drains
+each worker (see `src.helper.health.drain`). SIGHUP replaces the workers one
+at a time, each only after its successor is up, for a reload without
+dropped requests. The supervisor runs even for a single worker, which plain
+uvicorn would serve without one, so SIGHUP always reloads.
+"""
+
+import os
+import tempfile
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from src.config.settings import (
+    SERVER_FORWARDED_ALLOW_IPS,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_KEEP_ALIVE,
+    SERVER_MAX_REQUESTS,
+    SERVER_PORT,
+    SERVER_WORKERS,
+    USE_METRICS,
+)
+
+
+def cpu_count() -> int:
+    """CPUs this process may use, bounded by a cgroup v2 quota if any."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def main():
+    workers = SERVER_WORKERS or cpu_count()
+    if USE_METRICS and workers > 1:
+        # every worker writes its samples here for the metrics server to merge
+        os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="prometheus-")
+        )
+    config = uvicorn.Config(
+        "src:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        workers=workers,
+        proxy_headers=True,
+        forwarded_allow_ips=SERVER_FORWARDED_ALLOW_IPS,
+        timeout_keep_alive=SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=SERVER_MAX_REQUESTS or None,
+        limit_max_requests_jitter=SERVER_MAX_REQUESTS // 10,
+        server_header=False,
+    )
+    Multiprocess(config, sockets=[config.bind_socket()]).run()
+
+
+if __name__ == "__main__":
+    main()
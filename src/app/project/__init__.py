@@ -1,19 +1,49 @@
-from .model import BaseData, Board, CheckList, Column, Project, Task
+from src.config.settings import USE_SCHEDULER, USE_SEARCH
+
+from .access import (
+    accessible_project_ids,
+    check_project_access,
+    invalidate_project_access,
+    scoped,
+)
+from .analytics import backfill_task_rollups, burndown, retract_tasks, throughput
+from .model import (
+    BaseData,
+    Board,
+    CheckList,
+    Column,
+    Project,
+    RecurringTask,
+    Task,
+    TaskDailyRollup,
+    TaskReminder,
+)
 from .scheme import (
     BaseDataCreateScheme,
     BaseDataResponseScheme,
     BoardCreateScheme,
     BoardResponseScheme,
+    BurndownPointScheme,
     CheckListCreateScheme,
     CheckListResponseScheme,
     ColumnCreateScheme,
     ColumnResponseScheme,
     ProjectCreateScheme,
+    ProjectImportScheme,
     ProjectResponseScheme,
+    RecurringTaskCreateScheme,
+    RecurringTaskResponseScheme,
     TaskCreateScheme,
+    TaskReminderResponseScheme,
     TaskResponseScheme,
+    ThroughputPointScheme,
 )
 
+if USE_SEARCH:
+    from . import search  # noqa: F401
+if USE_SCHEDULER:
+    from . import schedule  # noqa: F401
+
 __all__ = [
     "Project",
     "BaseData",
@@ -21,8 +51,12 @@ __all__ = [
     "CheckList",
     "Column",
     "Task",
+    "TaskDailyRollup",
+    "RecurringTask",
+    "TaskReminder",
     "ProjectCreateScheme",
     "ProjectResponseScheme",
+    "ProjectImportScheme",
     "BaseDataCreateScheme",
     "BaseDataResponseScheme",
     "BoardCreateScheme",
@@ -33,4 +67,17 @@ __all__ = [
     "ColumnResponseScheme",
     "TaskCreateScheme",
     "TaskResponseScheme",
+    "BurndownPointScheme",
+    "ThroughputPointScheme",
+    "RecurringTaskCreateScheme",
+    "RecurringTaskResponseScheme",
+    "TaskReminderResponseScheme",
+    "accessible_project_ids",
+    "check_project_access",
+    "invalidate_project_access",
+    "scoped",
+    "backfill_task_rollups",
+    "retract_tasks",
+    "burndown",
+    "throughput",
 ]
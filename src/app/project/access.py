@@ -0,0 +1,158 @@
+"""
+Row-level access to projects. A user reaches a project as its owner or
+through an `Access(user, role)` linked to `Project.user`; boards, columns and
+tasks follow their project. `scoped` narrows a queryset in SQL, so pagination
+counts and pages only ever see rows the user may reach.
+"""
+
+from typing import Iterable
+
+from fastapi import HTTPException
+from tortoise import Model
+from tortoise.expressions import Subquery
+from tortoise.queryset import Q, QuerySet
+from tortoise.signals import post_delete, post_save
+
+from src.config.settings import (
+    PROJECT_ACCESS_TTL,
+    PROJECT_SCOPE_INLINE_IDS,
+    USE_REDIS,
+)
+from src.helper.cache import TieredCache
+from src.helper.cache.tiered import redis_backend
+from src.helper.common.comment import commentable
+from src.helper.db import read_replica
+from src.helper.health import on_shutdown
+from src.helper.permission.model import Access
+
+from .model import Board, Column, Project, RecurringTask, Task
+
+OWNER = "owner"
+EDITOR = "editor"
+# roles that may create, change or delete a project's rows, besides its owner;
+# any other role only reads
+EDIT_ROLES = (EDITOR,)
+# the owner alone: deleting a project, or changing its owner or members
+OWNER_ROLES: tuple[str, ...] = ()
+
+# each scoped model's link towards its project: (field, model it points to)
+PROJECT_LINKS: dict[type[Model], tuple[str, type[Model] | None]] = {
+    Project: ("id", None),
+    Board: ("project_id", None),
+    Column: ("board_id", Board),
+    Task: ("board_id", Board),
+    RecurringTask: ("template_id", Task),
+}
+
+# a removed member must lose access in every worker at once, so with redis
+# there is no per-process copy to outlive an invalidation
+access_cache = TieredCache(
+    redis_backend("cache:") if USE_REDIS else None,
+    local_ttl=0 if USE_REDIS else PROJECT_ACCESS_TTL,
+)
+on_shutdown(access_cache.close)
+
+
+def _key(user_id: int) -> str:
+    return f"project_access:{user_id}"
+
+
+async def _project_roles(user_id: int) -> list[list]:
+    # read from the primary: a stale replica would be cached for the full TTL
+    with read_replica(False):
+        owned = await Project.filter(owner_id=user_id).values_list("id", flat=True)
+        shared = await Project.filter(user__user_id=user_id).values_list(
+            "id", "user__role"
+        )
+    return [[project_id, OWNER] for project_id in owned] + [
+        [project_id, role] for project_id, role in shared
+    ]
+
+
+async def accessible_project_ids(
+    user, roles: Iterable[str] | None = None
+) -> list[int]:
+    """
+    Ids of the projects `user` owns or holds one of `roles` in (any role when
+    None), cached per user.
+    """
+    pairs = await access_cache.get_or_set(
+        _key(user.id), lambda: _project_roles(user.id), PROJECT_ACCESS_TTL
+    )
+    roles = None if roles is None else {OWNER, *roles}
+    return sorted({id for id, role in pairs if roles is None or role in roles})
+
+
+async def invalidate_project_access(*user_ids: int):
+    for user_id in set(user_ids):
+        await access_cache.delete(_key(user_id))
+
+
+async def project_users(*project_ids: int) -> list[int]:
+    """Owners and members of `project_ids`, whose cached access they affect."""
+    rows = await Project.filter(id__in=project_ids).values_list(
+        "owner_id", "user__user_id"
+    )
+    return [user_id for row in rows for user_id in row if user_id is not None]
+
+
+def _project_filter(model: type[Model], ids) -> Q:
+    field, parent = PROJECT_LINKS[model]
+    if parent is None:
+        return Q(**{f"{field}__in": ids})
+    # a semi-join rather than a join: no duplicate rows, and `.delete()`
+    # works on the scoped queryset
+    return Q(
+        **{
+            f"{field}__in": Subquery(
+                parent.filter(_project_filter(parent, ids)).values("id")
+            )
+        }
+    )
+
+
+async def scoped(
+    queryset: QuerySet, user, roles: Iterable[str] | None = None
+) -> QuerySet:
+    """Filters `queryset` to the rows of projects `user` may reach."""
+    ids = await accessible_project_ids(user, roles)
+    if len(ids) > PROJECT_SCOPE_INLINE_IDS:
+        # resolved in SQL, so the statement stays small for users in many
+        # projects
+        reach = Q(owner_id=user.id)
+        if roles is None:
+            reach |= Q(user__user_id=user.id)
+        elif roles:
+            reach |= Q(user__user_id=user.id, user__role__in=list(roles))
+        ids = Subquery(Project.filter(reach).values("id"))
+    return queryset.filter(_project_filter(queryset.model, ids))
+
+
+async def check_project_access(
+    user, model: type[Model], id: int | None, roles: Iterable[str] | None = None
+):
+    """Refuses to attach a row to a `model` row outside the user's projects."""
+    if id is not None and not await (
+        await scoped(model.filter(id=id), user, roles)
+    ).exists():
+        raise HTTPException(
+            status_code=403,
+            detail=f"No access to {model._meta.db_table} {id}",
+        )
+
+
+async def check_task_access(user, task_id: int):
+    await check_project_access(user, Task, task_id)
+
+
+commentable(Task, "task", check=check_task_access)
+
+
+@post_save(Access)
+async def on_access_save(sender, instance, created, using_db, update_fields):
+    await invalidate_project_access(instance.user_id)
+
+
+@post_delete(Access)
+async def on_access_delete(sender, instance, using_db):
+    await invalidate_project_access(instance.user_id)
@@ -0,0 +1,318 @@
+"""
+Burndown and throughput series from `task_daily_rollup`.
+
+Every task contributes to its board's row of a day, under its priority:
+created +1 on the day it was created, completed +1 on the day it was
+completed, and overdue +1 on the day after its `end_date` (or its creation,
+if later), taken back on the day it is completed if that comes later. The
+open and overdue counts of a day are then running sums of the rows up to it.
+Task writes apply the difference between the task's contribution before and
+after, so the rollup stays current without rescanning tasks. Deletes that
+skip the signals, a queryset `.delete()` or tasks cascading from a `BaseData`
+row, go through `retract_tasks` first; a board's rows go with the board.
+`backfill_task_rollups` rebuilds it from the tasks.
+"""
+
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+from tortoise import Tortoise, timezone
+from tortoise.expressions import F, Subquery
+from tortoise.functions import Sum
+from tortoise.queryset import QuerySet
+from tortoise.signals import post_delete, post_save, pre_save
+from tortoise.transactions import in_transaction
+
+from src.config.settings import TASK_DONE_PROGRESS
+
+from .model import BaseData, Board, Task, TaskDailyRollup
+
+FIELDS = ("board_id", "priority_id", "created_at", "completed_at", "end_date")
+COUNTERS = ("created", "completed", "overdue")
+MAX_DAYS = 3660
+
+
+def _day(value: datetime | date | None) -> date | None:
+    if isinstance(value, datetime):
+        return (timezone.localtime(value) if timezone.is_aware(value) else value).date()
+    return value
+
+
+def _snapshot(task: Task) -> dict:
+    return {field: getattr(task, field) for field in FIELDS}
+
+
+def contribution(task: dict | None) -> Counter:
+    """The task's share of the rollup, keyed by (board, day, priority, counter)."""
+    counts = Counter()
+    if not task or not task["created_at"]:
+        return counts
+    board, priority = task["board_id"], task["priority_id"] or 0
+    created = _day(task["created_at"])
+    counts[board, created, priority, "created"] += 1
+    completed = _day(task["completed_at"])
+    if completed:
+        counts[board, completed, priority, "completed"] += 1
+    if task["end_date"]:
+        overdue = max(created, _day(task["end_date"]) + timedelta(days=1))
+        counts[board, overdue, priority, "overdue"] += 1
+        if completed:
+            counts[board, max(completed, overdue), priority, "overdue"] -= 1
+    return counts
+
+
+def _rows(counts: Counter) -> list[list]:
+    rows = defaultdict(lambda: [0, 0, 0])
+    for (board, day, priority, counter), value in counts.items():
+        rows[board, day, priority][COUNTERS.index(counter)] += value
+    return [[*key, *values] for key, values in rows.items() if any(values)]
+
+
+async def apply_rollup(counts: Counter, connection=None):
+    """Adds `counts` to the rollup rows, creating the missing ones."""
+    rows = _rows(counts)
+    if not rows:
+        return
+    connection = connection or Tortoise.get_connection("default")
+    table = TaskDailyRollup._meta.db_table
+    columns = ("board_id", "day", "priority", *COUNTERS)
+    if connection.capabilities.dialect == "postgres":
+        values = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    else:
+        values = ", ".join("?" * len(columns))
+    await connection.execute_many(
+        f"""
+        INSERT INTO "{table}" ({", ".join(f'"{c}"' for c in columns)})
+        VALUES ({values})
+        ON CONFLICT ("board_id", "day", "priority") DO UPDATE SET
+        {", ".join(f'"{c}" = "{table}"."{c}" + excluded."{c}"' for c in COUNTERS)}
+        """,
+        rows,
+    )
+
+
+async def _done(progress_id: int | None) -> bool:
+    return bool(progress_id) and await BaseData.exists(
+        id=progress_id, key__in=TASK_DONE_PROGRESS
+    )
+
+
+@pre_save(Task)
+async def before_task_save(sender, instance, using_db, update_fields):
+    before = None
+    if instance._saved_in_db:
+        before = (
+            await Task.filter(id=instance.id)
+            .using_db(using_db)
+            .first()
+            .values(*FIELDS, "progress_id")
+        )
+    progress = before.pop("progress_id") if before else None
+    # a partial save leaves completed_at alone, it would not be written
+    if update_fields is None and (not before or progress != instance.progress_id):
+        if not await _done(instance.progress_id):
+            instance.completed_at = None
+        elif not instance.completed_at:
+            instance.completed_at = timezone.now()
+    instance._rollup_before = before
+
+
+@post_save(Task)
+async def after_task_save(sender, instance, created, using_db, update_fields):
+    counts = contribution(_snapshot(instance))
+    counts.subtract(contribution(getattr(instance, "_rollup_before", None)))
+    await apply_rollup(counts, using_db)
+
+
+@post_delete(Task)
+async def after_task_delete(sender, instance, using_db):
+    counts = Counter()
+    counts.subtract(contribution(_snapshot(instance)))
+    await apply_rollup(counts, using_db)
+
+
+async def retract_tasks(tasks: QuerySet, connection=None):
+    """
+    Takes `tasks` out of the rollup ahead of a delete the Task signals do not
+    see. Run it in the deleting transaction.
+    """
+    if connection:
+        tasks = tasks.using_db(connection)
+    counts = Counter()
+    for task in await tasks.values(*FIELDS):
+        counts.subtract(contribution(task))
+    await apply_rollup(counts, connection)
+
+
+async def backfill_task_rollups(*board_ids: int, chunk_size: int = 5000) -> int:
+    """
+    Rebuilds the rollup of `board_ids` (every board when none are given)
+    from their tasks, first stamping `completed_at` on done tasks that lack
+    it with their last update. Returns the number of tasks read.
+    """
+    tasks = Task.filter(board_id__in=board_ids) if board_ids else Task.all()
+    await tasks.filter(
+        completed_at=None,
+        progress_id__in=Subquery(
+            BaseData.filter(key__in=TASK_DONE_PROGRESS).values("id")
+        ),
+    ).update(completed_at=F("updated_at"))
+    counts, read, last = Counter(), 0, 0
+    while True:
+        chunk = (
+            await tasks.filter(id__gt=last)
+            .order_by("id")
+            .limit(chunk_size)
+            .values("id", *FIELDS)
+        )
+        for task in chunk:
+            counts.update(contribution(task))
+        read += len(chunk)
+        if len(chunk) < chunk_size:
+            break
+        last = chunk[-1]["id"]
+    rollups = (
+        TaskDailyRollup.filter(board_id__in=board_ids)
+        if board_ids
+        else TaskDailyRollup.all()
+    )
+    async with in_transaction("default") as connection:
+        await rollups.using_db(connection).delete()
+        await TaskDailyRollup.bulk_create(
+            [
+                TaskDailyRollup(
+                    board_id=board,
+                    day=day,
+                    priority=priority,
+                    **dict(zip(COUNTERS, values)),
+                )
+                for board, day, priority, *values in _rows(counts)
+            ],
+            batch_size=1000,
+            using_db=connection,
+        )
+    return read
+
+
+def _range(start: date | None, end: date | None) -> tuple[date, date]:
+    end = end or timezone.localtime().date()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days > MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"start must precede end by at most {MAX_DAYS} days",
+        )
+    return start, end
+
+
+def _scope(
+    project_id: int | None, board_id: int | None, priority: int | None
+) -> QuerySet:
+    if board_id is not None:
+        query = TaskDailyRollup.filter(board_id=board_id)
+    else:
+        query = TaskDailyRollup.filter(
+            board_id__in=Subquery(Board.filter(project_id=project_id).values("id"))
+        )
+    if priority is not None:
+        query = query.filter(priority=priority)
+    return query
+
+
+async def _daily(
+    project_id: int | None,
+    board_id: int | None,
+    start: date,
+    end: date,
+    priority: int | None = None,
+) -> list[dict]:
+    """Per-day sums from `start` to `end`, a range read on the unique index."""
+    return (
+        await _scope(project_id, board_id, priority)
+        .filter(day__gte=start, day__lte=end)
+        .annotate(new=Sum("created"), done=Sum("completed"), late=Sum("overdue"))
+        .group_by("day")
+        .order_by("day")
+        .values("day", "new", "done", "late")
+    )
+
+
+async def _opening(
+    project_id: int | None,
+    board_id: int | None,
+    start: date,
+    priority: int | None = None,
+) -> dict:
+    """The running sums before `start`, added up in the database as one row."""
+    rows = (
+        await _scope(project_id, board_id, priority)
+        .filter(day__lt=start)
+        .annotate(new=Sum("created"), done=Sum("completed"), late=Sum("overdue"))
+        .values("new", "done", "late")
+    )
+    return rows[0] if rows else {}
+
+
+async def burndown(
+    project_id: int | None = None,
+    board_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    priority: int | None = None,
+) -> list[dict]:
+    """Per day: tasks in scope, completed, remaining and overdue, cumulative."""
+    start, end = _range(start, end)
+    opening = await _opening(project_id, board_id, start, priority)
+    scope = opening.get("new") or 0
+    completed = opening.get("done") or 0
+    overdue = opening.get("late") or 0
+    rows = iter(await _daily(project_id, board_id, start, end, priority))
+    row = next(rows, None)
+    series = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        while row and _day(row["day"]) <= day:
+            scope += row["new"] or 0
+            completed += row["done"] or 0
+            overdue += row["late"] or 0
+            row = next(rows, None)
+        series.append(
+            {
+                "day": day,
+                "scope": scope,
+                "completed": completed,
+                "remaining": scope - completed,
+                "overdue": overdue,
+            }
+        )
+    return series
+
+
+def _period(day: date, interval: str) -> date:
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+async def throughput(
+    project_id: int | None = None,
+    board_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    interval: str = "day",
+    priority: int | None = None,
+) -> list[dict]:
+    """Tasks created and completed per day, week or month."""
+    start, end = _range(start, end)
+    periods = {}
+    for offset in range((end - start).days + 1):
+        period = _period(start + timedelta(days=offset), interval)
+        periods.setdefault(period, {"period": period, "created": 0, "completed": 0})
+    for row in await _daily(project_id, board_id, start, end, priority):
+        period = periods[_period(_day(row["day"]), interval)]
+        period["created"] += row["new"] or 0
+        period["completed"] += row["done"] or 0
+    return list(periods.values())
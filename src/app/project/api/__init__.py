@@ -1,11 +1,14 @@
 from fastapi import APIRouter
 
+from src.app.project.api.analytics import router as analytics_router
 from src.app.project.api.base_data import router as base_data_router
 from src.app.project.api.board import router as board_router
 from src.app.project.api.check_list import router as check_list_router
 from src.app.project.api.column import router as column_router
 from src.app.project.api.project import router as project_router
+from src.app.project.api.recurring_task import router as recurring_task_router
 from src.app.project.api.task import router as task_router
+from src.app.project.api.task_reminder import router as task_reminder_router
 from src.helper import add_patterns
 
 api_patterns = [
@@ -15,6 +18,9 @@ api_patterns = [
     (check_list_router, "/check_list", ["Check List"], {}),
     (column_router, "/column", ["Column"], {}),
     (task_router, "/task", ["Task"], {}),
+    (analytics_router, "/analytics", ["Analytics"], {}),
+    (recurring_task_router, "/recurring_task", ["Recurring Task"], {}),
+    (task_reminder_router, "/task_reminder", ["Task Reminder"], {}),
 ]
 
 router = add_patterns(APIRouter(), api_patterns)
@@ -0,0 +1,69 @@
+from datetime import date
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from src.app.project import (
+    Board,
+    BurndownPointScheme,
+    Project,
+    Task,
+    ThroughputPointScheme,
+    burndown,
+    check_project_access,
+    throughput,
+)
+from src.config.settings import DB_REPORT_STATEMENT_TIMEOUT
+from src.helper import ActionEnum, has_access, log_action, login_required
+from src.helper.db import statement_timeout
+from src.helper.user.model import User
+
+router = APIRouter()
+
+MODEL_NAME: str = Task._meta.db_table
+
+
+async def check_scope(user, project_id: int | None, board_id: int | None):
+    if (project_id is None) == (board_id is None):
+        raise HTTPException(
+            status_code=400, detail="Pass exactly one of project_id and board_id"
+        )
+    if board_id is not None:
+        await check_project_access(user, Board, board_id)
+    else:
+        await check_project_access(user, Project, project_id)
+
+
+@router.get("/burndown", response_model=List[BurndownPointScheme])
+@log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@statement_timeout(DB_REPORT_STATEMENT_TIMEOUT)
+async def get_burndown_router(
+    request: Request,
+    project_id: int | None = Query(None),
+    board_id: int | None = Query(None),
+    start: date | None = Query(None),
+    end: date | None = Query(None),
+    priority: int | None = Query(None),
+    user: User = Depends(login_required),
+):
+    await check_scope(user, project_id, board_id)
+    return await burndown(project_id, board_id, start, end, priority)
+
+
+@router.get("/throughput", response_model=List[ThroughputPointScheme])
+@log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@statement_timeout(DB_REPORT_STATEMENT_TIMEOUT)
+async def get_throughput_router(
+    request: Request,
+    project_id: int | None = Query(None),
+    board_id: int | None = Query(None),
+    start: date | None = Query(None),
+    end: date | None = Query(None),
+    interval: Literal["day", "week", "month"] = Query("day"),
+    priority: int | None = Query(None),
+    user: User = Depends(login_required),
+):
+    await check_scope(user, project_id, board_id)
+    return await throughput(project_id, board_id, start, end, interval, priority)
@@ -2,8 +2,15 @@ from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from tortoise.queryset import Q
+from tortoise.transactions import in_transaction
 
-from src.app.project import BaseData, BaseDataCreateScheme, BaseDataResponseScheme
+from src.app.project import (
+    BaseData,
+    BaseDataCreateScheme,
+    BaseDataResponseScheme,
+    Task,
+    retract_tasks,
+)
 from src.helper import (
     ActionEnum,
     Filter,
@@ -11,8 +18,10 @@ from src.helper import (
     Paginated,
     Paginator,
     Status,
+    cache_response,
     create_filter_schema,
     has_access,
+    invalidate_cache,
     log_action,
     login_required,
 )
@@ -30,6 +39,7 @@ MODEL_NAME: str = BaseData._meta.db_table
 )
 @log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_base_datas_router(
     request: Request,
     page: int = Query(1, ge=1),
@@ -38,18 +48,20 @@ async def get_base_datas_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = BaseData.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        BaseDataResponseScheme, objects, apply=pagination
+        BaseDataResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
 @router.post("/", response_model=BaseDataResponseScheme)
 @log_action(action=ActionEnum.CREATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def create_base_data_router(
     object: BaseDataCreateScheme,
     user: User = Depends(login_required),
@@ -65,6 +77,7 @@ async def create_base_data_router(
 @router.get("/{id}", response_model=BaseDataResponseScheme)
 @log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_base_data_router(
     id: str,
     request: Request,
@@ -80,6 +93,7 @@ async def get_base_data_router(
 @router.put("/{id}", response_model=BaseDataResponseScheme)
 @log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.UPDATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def update_base_data_router(
     id: int,
     object: BaseDataCreateScheme,
@@ -97,9 +111,16 @@ async def update_base_data_router(
 @router.delete("/{id}", response_model=Status)
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def delete_base_data_router(id: int, user: User = Depends(login_required)):
     objects = BaseData.filter().all()
-    deleted_count = await objects.filter(id=id).delete()
+    async with in_transaction("default") as connection:
+        # the tasks pointing at it are deleted with it, past the rollup signals
+        await retract_tasks(
+            Task.filter(Q(color_id=id) | Q(progress_id=id) | Q(priority_id=id)),
+            connection,
+        )
+        deleted_count = await objects.filter(id=id).using_db(connection).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"BaseData {id} not found")
     return Status(message=f"Deleted base_data {id}")
@@ -3,7 +3,8 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from tortoise.queryset import Q
 
-from src.app.project import Board, BoardCreateScheme, BoardResponseScheme
+from src.app.project import Board, BoardCreateScheme, BoardResponseScheme, Project
+from src.app.project.access import EDIT_ROLES, check_project_access, scoped
 from src.helper import (
     ActionEnum,
     Filter,
@@ -38,12 +39,13 @@ async def get_boards_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
-    objects = Board.all()
+    objects = await scoped(Board.all(), user)
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        BoardResponseScheme, objects, apply=pagination
+        BoardResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
@@ -54,6 +56,7 @@ async def create_board_router(
     object: BoardCreateScheme,
     user: User = Depends(login_required),
 ):
+    await check_project_access(user, Project, object.project_id, EDIT_ROLES)
     return await object.create(
         Board,
         serialize=True,
@@ -70,7 +73,7 @@ async def get_board_router(
     request: Request,
     user: User = Depends(login_required),
 ):
-    objects = Board.all()
+    objects = await scoped(Board.all(), user)
     return await BoardResponseScheme.from_tortoise_orm(
         BoardResponseScheme,
         await objects.get(Q(id=id) if str(id).isdigit() else Q(slug=str(id))),
@@ -85,7 +88,8 @@ async def update_board_router(
     object: BoardCreateScheme,
     user: User = Depends(login_required),
 ):
-    objects = Board.all()
+    await check_project_access(user, Project, object.project_id, EDIT_ROLES)
+    objects = await scoped(Board.all(), user, EDIT_ROLES)
     return await object.update(
         await objects.get(id=id),
         serialize=True,
@@ -98,7 +102,7 @@ async def update_board_router(
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
 async def delete_board_router(id: int, user: User = Depends(login_required)):
-    objects = Board.filter().all()
+    objects = await scoped(Board.all(), user, EDIT_ROLES)
     deleted_count = await objects.filter(id=id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"Board {id} not found")
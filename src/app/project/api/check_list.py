@@ -39,12 +39,13 @@ async def get_check_lists_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = CheckList.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        CheckListResponseScheme, objects, apply=pagination
+        CheckListResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
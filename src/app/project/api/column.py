@@ -3,7 +3,8 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from tortoise.queryset import Q
 
-from src.app.project import Column, ColumnCreateScheme, ColumnResponseScheme
+from src.app.project import Board, Column, ColumnCreateScheme, ColumnResponseScheme
+from src.app.project.access import EDIT_ROLES, check_project_access, scoped
 from src.helper import (
     ActionEnum,
     Filter,
@@ -38,12 +39,13 @@ async def get_columns_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
-    objects = Column.all()
+    objects = await scoped(Column.all(), user)
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        ColumnResponseScheme, objects, apply=pagination
+        ColumnResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
@@ -54,6 +56,7 @@ async def create_column_router(
     object: ColumnCreateScheme,
     user: User = Depends(login_required),
 ):
+    await check_project_access(user, Board, object.board_id, EDIT_ROLES)
     return await object.create(
         Column,
         serialize=True,
@@ -70,7 +73,7 @@ async def get_column_router(
     request: Request,
     user: User = Depends(login_required),
 ):
-    objects = Column.all()
+    objects = await scoped(Column.all(), user)
     return await ColumnResponseScheme.from_tortoise_orm(
         ColumnResponseScheme,
         await objects.get(Q(id=id) if str(id).isdigit() else Q(slug=str(id))),
@@ -85,7 +88,8 @@ async def update_column_router(
     object: ColumnCreateScheme,
     user: User = Depends(login_required),
 ):
-    objects = Column.all()
+    await check_project_access(user, Board, object.board_id, EDIT_ROLES)
+    objects = await scoped(Column.all(), user, EDIT_ROLES)
     return await object.update(
         await objects.get(id=id),
         serialize=True,
@@ -98,7 +102,7 @@ async def update_column_router(
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
 async def delete_column_router(id: int, user: User = Depends(login_required)):
-    objects = Column.filter().all()
+    objects = await scoped(Column.all(), user, EDIT_ROLES)
     deleted_count = await objects.filter(id=id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"Column {id} not found")
@@ -1,9 +1,35 @@
+import asyncio
+import os
+import shutil
+import tempfile
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from tortoise.queryset import Q
 
-from src.app.project import Project, ProjectCreateScheme, ProjectResponseScheme
+from src.app.project import (
+    Project,
+    ProjectCreateScheme,
+    ProjectImportScheme,
+    ProjectResponseScheme,
+)
+from src.app.project.access import (
+    EDIT_ROLES,
+    OWNER_ROLES,
+    invalidate_project_access,
+    project_users,
+    scoped,
+)
+from src.app.project.transfer import (
+    FORMATS,
+    MEDIA_TYPES,
+    import_project,
+    ndjson_export,
+    parquet_export,
+)
+from src.config.settings import DB_EXPORT_STATEMENT_TIMEOUT
 from src.helper import (
     ActionEnum,
     Filter,
@@ -16,6 +42,8 @@ from src.helper import (
     log_action,
     login_required,
 )
+from src.helper.db import statement_timeout
+from src.helper.permission.model import Access
 from src.helper.user.model import User
 
 router = APIRouter()
@@ -25,6 +53,10 @@ ProjectFilterSchema = create_filter_schema(Project)
 MODEL_NAME: str = Project._meta.db_table
 
 
+def members(object: ProjectCreateScheme) -> list:
+    return [("user", object.user, Access)] if object.user is not None else []
+
+
 @router.get(
     "/", response_model=Paginated[ProjectResponseScheme] | List[ProjectResponseScheme]
 )
@@ -38,12 +70,13 @@ async def get_projects_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
-    objects = Project.all()
+    objects = await scoped(Project.all(), user)
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        ProjectResponseScheme, objects, apply=pagination
+        ProjectResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
@@ -54,12 +87,15 @@ async def create_project_router(
     object: ProjectCreateScheme,
     user: User = Depends(login_required),
 ):
-    return await object.create(
+    project = await object.create(
         Project,
         serialize=True,
         serializer=ProjectResponseScheme,
-        m2m=[],
+        m2m=members(object),
+        owner_id=user.id,
     )
+    await invalidate_project_access(*await project_users(project.id))
+    return project
 
 
 @router.get("/{id}", response_model=ProjectResponseScheme)
@@ -70,7 +106,7 @@ async def get_project_router(
     request: Request,
     user: User = Depends(login_required),
 ):
-    objects = Project.all()
+    objects = await scoped(Project.all(), user)
     return await ProjectResponseScheme.from_tortoise_orm(
         ProjectResponseScheme,
         await objects.get(Q(id=id) if str(id).isdigit() else Q(slug=str(id))),
@@ -85,21 +121,86 @@ async def update_project_router(
     object: ProjectCreateScheme,
     user: User = Depends(login_required),
 ):
-    objects = Project.all()
-    return await object.update(
-        await objects.get(id=id),
+    objects = await scoped(Project.all(), user, EDIT_ROLES)
+    project = await objects.get(id=id)
+    if object.model_fields_set & {"owner_id", "user"} and project.owner_id != user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="Only the owner can change a project's owner or members",
+        )
+    before = await project_users(id)
+    project = await object.update(
+        project,
         serialize=True,
         serializer=ProjectResponseScheme,
-        m2m=[],
+        m2m=members(object),
     )
+    await invalidate_project_access(*before, *await project_users(id))
+    return project
 
 
 @router.delete("/{id}", response_model=Status)
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
 async def delete_project_router(id: int, user: User = Depends(login_required)):
-    objects = Project.filter().all()
+    objects = await scoped(Project.all(), user, OWNER_ROLES)
+    users = await project_users(id)
     deleted_count = await objects.filter(id=id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"Project {id} not found")
+    await invalidate_project_access(*users)
     return Status(message=f"Deleted project {id}")
+
+
+@router.get("/{id}/export")
+@log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@statement_timeout(DB_EXPORT_STATEMENT_TIMEOUT)
+async def export_project_router(
+    id: int,
+    request: Request,
+    format: str = Query("ndjson"),
+    user: User = Depends(login_required),
+):
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid export format: {format}")
+    if not await (await scoped(Project.filter(id=id), user)).exists():
+        raise HTTPException(status_code=404, detail=f"Project {id} not found")
+    filename = f"project-{id}.{'zip' if format == 'parquet' else format}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if format == "ndjson":
+        return StreamingResponse(
+            ndjson_export(id), media_type=MEDIA_TYPES[format], headers=headers
+        )
+    fd, path = tempfile.mkstemp(suffix=".zip")
+    os.close(fd)
+    try:
+        await parquet_export(id, path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+        background=BackgroundTask(os.unlink, path),
+    )
+
+
+@router.post("/import", response_model=ProjectImportScheme)
+@log_action(action=ActionEnum.CREATE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
+async def import_project_router(
+    file: UploadFile,
+    format: str = Query("ndjson"),
+    user: User = Depends(login_required),
+):
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid import format: {format}")
+    # copied to disk so the parquet reader can seek, in bounded memory
+    with tempfile.NamedTemporaryFile(suffix=f".{format}") as copy:
+        await asyncio.to_thread(shutil.copyfileobj, file.file, copy)
+        copy.flush()
+        result = await import_project(copy.name, format, user.id)
+    await invalidate_project_access(user.id)
+    return result
@@ -0,0 +1,121 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from src.app.project import (
+    RecurringTask,
+    RecurringTaskCreateScheme,
+    RecurringTaskResponseScheme,
+    Task,
+)
+from src.app.project.access import EDIT_ROLES, check_project_access, scoped
+from src.helper import (
+    ActionEnum,
+    Filter,
+    OrderBy,
+    Paginated,
+    Paginator,
+    Status,
+    create_filter_schema,
+    has_access,
+    log_action,
+    login_required,
+)
+from src.helper.user.model import User
+
+router = APIRouter()
+
+RecurringTaskFilterSchema = create_filter_schema(RecurringTask)
+
+# recurrences are managed with the permissions of the tasks they copy
+MODEL_NAME: str = Task._meta.db_table
+
+
+@router.get(
+    "/",
+    response_model=Paginated[RecurringTaskResponseScheme]
+    | List[RecurringTaskResponseScheme],
+)
+@log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+async def get_recurring_tasks_router(
+    request: Request,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, le=100),
+    filters: RecurringTaskFilterSchema = Depends(),  # type: ignore
+    user: User = Depends(login_required),
+    sort_by: list[str] = Query([]),
+    pagination: bool = Query(True),
+    fields: list[str] = Query(None),
+):
+    objects = await scoped(RecurringTask.all(), user)
+    sort = OrderBy.create(objects, sort_by)
+    objects = Filter.create(sort, filters)
+    return await Paginator(limit=limit, page=page).paginated(
+        RecurringTaskResponseScheme, objects, apply=pagination, fields=fields
+    )
+
+
+@router.post("/", response_model=RecurringTaskResponseScheme)
+@log_action(action=ActionEnum.CREATE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
+async def create_recurring_task_router(
+    object: RecurringTaskCreateScheme,
+    user: User = Depends(login_required),
+):
+    if object.template_id is None or object.next_run_at is None:
+        raise HTTPException(
+            status_code=400, detail="template_id and next_run_at are required"
+        )
+    await check_project_access(user, Task, object.template_id, EDIT_ROLES)
+    return await object.create(
+        RecurringTask,
+        serialize=True,
+        serializer=RecurringTaskResponseScheme,
+        m2m=[],
+    )
+
+
+@router.get("/{id}", response_model=RecurringTaskResponseScheme)
+@log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+async def get_recurring_task_router(
+    id: int,
+    request: Request,
+    user: User = Depends(login_required),
+):
+    objects = await scoped(RecurringTask.all(), user)
+    return await RecurringTaskResponseScheme.from_tortoise_orm(
+        RecurringTaskResponseScheme, await objects.get(id=id)
+    )
+
+
+@router.put("/{id}", response_model=RecurringTaskResponseScheme)
+@log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.UPDATE.value, to=MODEL_NAME)
+async def update_recurring_task_router(
+    id: int,
+    object: RecurringTaskCreateScheme,
+    user: User = Depends(login_required),
+):
+    await check_project_access(user, Task, object.template_id, EDIT_ROLES)
+    objects = await scoped(RecurringTask.all(), user, EDIT_ROLES)
+    return await object.update(
+        await objects.get(id=id),
+        serialize=True,
+        serializer=RecurringTaskResponseScheme,
+        m2m=[],
+    )
+
+
+@router.delete("/{id}", response_model=Status)
+@log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
+async def delete_recurring_task_router(id: int, user: User = Depends(login_required)):
+    objects = await scoped(RecurringTask.all(), user, EDIT_ROLES)
+    # deleted through the instance so post_delete takes it off the schedule
+    recurrence = await objects.get_or_none(id=id)
+    if not recurrence:
+        raise HTTPException(status_code=404, detail=f"Recurring task {id} not found")
+    await recurrence.delete()
+    return Status(message=f"Deleted recurring task {id}")
@@ -3,7 +3,9 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from tortoise.queryset import Q
 
-from src.app.project import Task, TaskCreateScheme, TaskResponseScheme
+from src.app.project import Board, Task, TaskCreateScheme, TaskResponseScheme
+from src.app.project.access import EDIT_ROLES, check_project_access, scoped
+from src.config.settings import USE_SEARCH
 from src.helper import (
     ActionEnum,
     Filter,
@@ -16,6 +18,8 @@ from src.helper import (
     log_action,
     login_required,
 )
+from src.helper.common.model import Comment
+from src.helper.search import reindex
 from src.helper.user.model import User
 
 router = APIRouter()
@@ -25,6 +29,17 @@ TaskFilterSchema = create_filter_schema(Task)
 MODEL_NAME: str = Task._meta.db_table
 
 
+def comments(object: TaskCreateScheme) -> list:
+    return [("comment", object.comment, Comment)] if object.comment is not None else []
+
+
+async def reindex_comments(*ids: int):
+    # a comment is indexed under its task's project, but linking it is an m2m
+    # add, which fires no post_save
+    if USE_SEARCH and ids:
+        await reindex("comment", ids=ids)
+
+
 @router.get(
     "/", response_model=Paginated[TaskResponseScheme] | List[TaskResponseScheme]
 )
@@ -38,12 +53,13 @@ async def get_tasks_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
-    objects = Task.all()
+    objects = await scoped(Task.all(), user)
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        TaskResponseScheme, objects, apply=pagination
+        TaskResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
@@ -54,12 +70,15 @@ async def create_task_router(
     object: TaskCreateScheme,
     user: User = Depends(login_required),
 ):
-    return await object.create(
+    await check_project_access(user, Board, object.board_id, EDIT_ROLES)
+    task = await object.create(
         Task,
         serialize=True,
         serializer=TaskResponseScheme,
-        m2m=[],
+        m2m=comments(object),
     )
+    await reindex_comments(*object.comment or [])
+    return task
 
 
 @router.get("/{id}", response_model=TaskResponseScheme)
@@ -70,7 +89,7 @@ async def get_task_router(
     request: Request,
     user: User = Depends(login_required),
 ):
-    objects = Task.all()
+    objects = await scoped(Task.all(), user)
     return await TaskResponseScheme.from_tortoise_orm(
         TaskResponseScheme,
         await objects.get(Q(id=id) if str(id).isdigit() else Q(slug=str(id))),
@@ -85,21 +104,29 @@ async def update_task_router(
     object: TaskCreateScheme,
     user: User = Depends(login_required),
 ):
-    objects = Task.all()
-    return await object.update(
-        await objects.get(id=id),
+    await check_project_access(user, Board, object.board_id, EDIT_ROLES)
+    objects = await scoped(Task.all(), user, EDIT_ROLES)
+    task = await objects.get(id=id)
+    # unlinked comments, and the kept ones if the task moved project, too
+    before = await task.comment.all().values_list("id", flat=True)
+    task = await object.update(
+        task,
         serialize=True,
         serializer=TaskResponseScheme,
-        m2m=[],
+        m2m=comments(object),
     )
+    await reindex_comments(*{*before, *(object.comment or [])})
+    return task
 
 
 @router.delete("/{id}", response_model=Status)
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
 async def delete_task_router(id: int, user: User = Depends(login_required)):
-    objects = Task.filter().all()
-    deleted_count = await objects.filter(id=id).delete()
-    if not deleted_count:
+    objects = await scoped(Task.all(), user, EDIT_ROLES)
+    # deleted through the instance so post_delete keeps the rollup in step
+    task = await objects.get_or_none(id=id)
+    if not task:
         raise HTTPException(status_code=404, detail=f"Task {id} not found")
+    await task.delete()
     return Status(message=f"Deleted task {id}")
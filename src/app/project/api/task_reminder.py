@@ -0,0 +1,78 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from src.app.project import Task, TaskReminder, TaskReminderResponseScheme
+from src.helper import (
+    ActionEnum,
+    Filter,
+    OrderBy,
+    Paginated,
+    Paginator,
+    Status,
+    create_filter_schema,
+    has_access,
+    log_action,
+    login_required,
+)
+from src.helper.user.model import User
+
+router = APIRouter()
+
+TaskReminderFilterSchema = create_filter_schema(TaskReminder)
+
+MODEL_NAME: str = Task._meta.db_table
+
+
+@router.get(
+    "/",
+    response_model=Paginated[TaskReminderResponseScheme]
+    | List[TaskReminderResponseScheme],
+)
+@log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+async def get_task_reminders_router(
+    request: Request,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, le=100),
+    filters: TaskReminderFilterSchema = Depends(),  # type: ignore
+    user: User = Depends(login_required),
+    sort_by: list[str] = Query([]),
+    pagination: bool = Query(True),
+    fields: list[str] = Query(None),
+):
+    objects = TaskReminder.filter(user_id=user.id)
+    # unread first, latest due first, unless sort_by says otherwise
+    sort = (
+        OrderBy.create(objects, sort_by)
+        if sort_by
+        else objects.order_by("is_read", "-due_at")
+    )
+    objects = Filter.create(sort, filters)
+    return await Paginator(limit=limit, page=page).paginated(
+        TaskReminderResponseScheme, objects, apply=pagination, fields=fields
+    )
+
+
+@router.post("/read", response_model=Status)
+@log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.UPDATE.value, to=MODEL_NAME)
+async def read_task_reminders_router(
+    ids: list[int] = Query(None),
+    user: User = Depends(login_required),
+):
+    """Marks the given reminders, or all of them, as read."""
+    objects = TaskReminder.filter(user_id=user.id, is_read=False)
+    if ids:
+        objects = objects.filter(id__in=ids)
+    read = await objects.update(is_read=True)
+    return Status(message=f"Marked {read} reminders as read")
+
+
+@router.delete("/{id}", response_model=Status)
+@log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
+async def delete_task_reminder_router(id: int, user: User = Depends(login_required)):
+    if not await TaskReminder.filter(id=id, user_id=user.id).delete():
+        raise HTTPException(status_code=404, detail=f"Task reminder {id} not found")
+    return Status(message=f"Deleted task reminder {id}")
@@ -1,8 +1,10 @@
-from tortoise import fields
+from tortoise import fields, models
 
 from src.base import BaseModel
+from src.helper.db import trigram_index
 
 
+@trigram_index("name", "description")
 class Project(BaseModel):
     name = fields.CharField(max_length=256)
     description = fields.TextField(null=True)
@@ -38,6 +40,7 @@ class Board(BaseModel):
 
     class Meta:
         table = "board"
+        indexes = (("project_id",),)
 
 
 class Column(BaseModel):
@@ -51,6 +54,7 @@ class Column(BaseModel):
 
     class Meta:
         table = "column"
+        indexes = (("board_id", "position"),)
 
 
 class CheckList(BaseModel):
@@ -66,6 +70,7 @@ class CheckList(BaseModel):
         table = "check_list"
 
 
+@trigram_index("name", "description")
 class Task(BaseModel):
     name = fields.CharField(max_length=256)
     board = fields.ForeignKeyField("models.Board", related_name="task")
@@ -90,6 +95,9 @@ class Task(BaseModel):
         related_name="priority",
     )
 
+    # set when `progress` moves to one of TASK_DONE_PROGRESS, see `analytics`
+    completed_at = fields.DatetimeField(null=True)
+
     checklist = fields.ManyToManyField("models.CheckList", related_name="task")
     comment = fields.ManyToManyField("models.Comment", related_name="task")
 
@@ -98,3 +106,69 @@ class Task(BaseModel):
 
     class Meta:
         table = "task"
+        indexes = (("board_id", "position"),)
+
+
+class TaskDailyRollup(models.Model):
+    """
+    How a board's task counts changed on a day, per priority (`BaseData` id,
+    0 for none). Maintained by `analytics`; running sums give the counts.
+    """
+
+    id = fields.IntField(primary_key=True)
+    board = fields.ForeignKeyField(
+        "models.Board", related_name="rollup", on_delete=fields.CASCADE
+    )
+    day = fields.DateField()
+    priority = fields.IntField(default=0)
+    created = fields.IntField(default=0)
+    completed = fields.IntField(default=0)
+    overdue = fields.IntField(default=0)
+
+    class Meta:
+        table = "task_daily_rollup"
+        unique_together = (("board_id", "day", "priority"),)
+
+
+class RecurringTask(BaseModel):
+    """
+    Copies `template` onto its board every `every` days, weeks or months
+    (`unit`), starting at `next_run_at` and stopping after `until`. Fired by
+    the scheduler, see `schedule`.
+    """
+
+    template = fields.ForeignKeyField(
+        "models.Task", related_name="recurrence", on_delete=fields.CASCADE
+    )
+    unit = fields.CharField(max_length=16, default="week")
+    every = fields.IntField(default=1)
+    next_run_at = fields.DatetimeField()
+    until = fields.DatetimeField(null=True)
+    is_active = fields.BooleanField(default=True)
+
+    def __repr__(self):
+        return self.__str__()
+
+    class Meta:
+        table = "recurring_task"
+        indexes = (("template_id",),)
+
+
+class TaskReminder(models.Model):
+    """A user's notice that a task is due at `due_at`, created by `schedule`."""
+
+    id = fields.IntField(primary_key=True)
+    task = fields.ForeignKeyField(
+        "models.Task", related_name="reminder", on_delete=fields.CASCADE
+    )
+    user = fields.ForeignKeyField(
+        "models.User", related_name="task_reminder", on_delete=fields.CASCADE
+    )
+    due_at = fields.DatetimeField()
+    is_read = fields.BooleanField(default=False)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "task_reminder"
+        unique_together = (("task_id", "user_id", "due_at"),)
+        indexes = (("user_id", "is_read", "due_at"),)
@@ -0,0 +1,172 @@
+"""
+Recurring tasks and due-date reminders, fired through `scheduler`.
+
+Saving a `RecurringTask` queues it at `next_run_at`; saving a task with an
+open `end_date` queues its reminder `TASK_REMINDER_LEAD` seconds before.
+The handlers take a whole batch of due ids and may see an id twice, so both
+write conditionally: a recurrence copies its template only while moving its
+own `next_run_at` forward, and reminders are unique per task, user and due
+time.
+"""
+
+import calendar
+from datetime import datetime, timedelta
+
+from tortoise import timezone
+from tortoise.signals import post_delete, post_save
+from tortoise.transactions import in_transaction
+
+from src.config.settings import STREAM_CHUNK_SIZE, TASK_REMINDER_LEAD
+from src.helper.scheduler import scheduler
+from src.helper.stream import iterate_values
+
+from .model import Project, RecurringTask, Task, TaskReminder
+
+RECURRING = "recurring_task"
+REMINDER = "task_reminder"
+UNITS = ("day", "week", "month")
+
+
+def advance(at: datetime, unit: str, every: int) -> datetime:
+    """`at` moved `every` `unit`s on; month ends clamp to shorter months."""
+    if unit == "day":
+        return at + timedelta(days=every)
+    if unit == "week":
+        return at + timedelta(weeks=every)
+    month = at.month - 1 + every
+    year, month = at.year + month // 12, month % 12 + 1
+    return at.replace(
+        year=year, month=month, day=min(at.day, calendar.monthrange(year, month)[1])
+    )
+
+
+def _reminder_at(task: Task | dict) -> datetime:
+    end_date = task["end_date"] if isinstance(task, dict) else task.end_date
+    return end_date - timedelta(seconds=TASK_REMINDER_LEAD)
+
+
+async def copy_template(template: Task, start: datetime, connection) -> Task:
+    """A new task from `template` starting at `start`, same length if it has one."""
+    end_date = None
+    if template.start_date and template.end_date:
+        end_date = start + (template.end_date - template.start_date)
+    return await Task.create(
+        name=template.name,
+        board_id=template.board_id,
+        position=template.position,
+        start_date=start,
+        end_date=end_date,
+        description=template.description,
+        is_show_on_card=template.is_show_on_card,
+        color_id=template.color_id,
+        priority_id=template.priority_id,
+        using_db=connection,
+    )
+
+
+@scheduler.handler(RECURRING)
+async def fire_recurring(ids: list[int]):
+    now = timezone.now()
+    recurrences = await RecurringTask.filter(
+        id__in=ids, is_active=True, next_run_at__lte=now
+    ).select_related("template")
+    queued = {}
+    async with in_transaction("default") as connection:
+        for recurrence in recurrences:
+            following = recurrence.next_run_at
+            # missed runs (the scheduler was down) are skipped, not replayed
+            while following <= now:
+                following = advance(following, recurrence.unit, recurrence.every)
+            active = recurrence.until is None or following <= recurrence.until
+            moved = (
+                await RecurringTask.filter(
+                    id=recurrence.id, next_run_at=recurrence.next_run_at
+                )
+                .using_db(connection)
+                .update(next_run_at=following, is_active=active)
+            )
+            if not moved:
+                continue
+            await copy_template(recurrence.template, recurrence.next_run_at, connection)
+            if active:
+                queued[recurrence.id] = following
+    await scheduler.schedule(RECURRING, queued)
+
+
+@scheduler.handler(REMINDER)
+async def fire_reminders(ids: list[int]):
+    now = timezone.now()
+    tasks = [
+        task
+        for task in await Task.filter(
+            id__in=ids, end_date__isnull=False, completed_at=None
+        ).values("id", "end_date", "board__project_id")
+        if _reminder_at(task) <= now
+    ]
+    if not tasks:
+        return
+    users: dict[int, set[int]] = {}
+    for project_id, owner_id, user_id in await Project.filter(
+        id__in={task["board__project_id"] for task in tasks}
+    ).values_list("id", "owner_id", "user__user_id"):
+        users.setdefault(project_id, set()).update(
+            id for id in (owner_id, user_id) if id is not None
+        )
+    await TaskReminder.bulk_create(
+        [
+            TaskReminder(task_id=task["id"], user_id=user_id, due_at=task["end_date"])
+            for task in tasks
+            for user_id in users.get(task["board__project_id"], ())
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+@post_save(RecurringTask)
+async def on_recurring_save(sender, instance, created, using_db, update_fields):
+    if instance.is_active:
+        await scheduler.schedule(RECURRING, {instance.id: instance.next_run_at})
+    else:
+        await scheduler.unschedule(RECURRING, instance.id)
+
+
+@post_delete(RecurringTask)
+async def on_recurring_delete(sender, instance, using_db):
+    await scheduler.unschedule(RECURRING, instance.id)
+
+
+@post_save(Task)
+async def on_task_save(sender, instance, created, using_db, update_fields):
+    if instance.end_date and not instance.completed_at:
+        await scheduler.schedule(REMINDER, {instance.id: _reminder_at(instance)})
+    elif not created:
+        await scheduler.unschedule(REMINDER, instance.id)
+
+
+@post_delete(Task)
+async def on_task_delete(sender, instance, using_db):
+    await scheduler.unschedule(REMINDER, instance.id)
+
+
+@scheduler.on_lead
+async def enqueue_schedules(chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+    """
+    Queues every active recurrence and every reminder still to come. Runs
+    when a process takes the lead, so a lost queue is rebuilt; queuing is
+    idempotent.
+    """
+    queued = 0
+    recurrences = RecurringTask.filter(is_active=True)
+    async for rows in iterate_values(recurrences, ["id", "next_run_at"], chunk_size):
+        await scheduler.schedule(
+            RECURRING, {row["id"]: row["next_run_at"] for row in rows}
+        )
+        queued += len(rows)
+    tasks = Task.filter(end_date__gt=timezone.now(), completed_at=None)
+    async for rows in iterate_values(tasks, ["id", "end_date"], chunk_size):
+        await scheduler.schedule(
+            REMINDER, {row["id"]: _reminder_at(row) for row in rows}
+        )
+        queued += len(rows)
+    return queued
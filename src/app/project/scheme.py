@@ -1,4 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 from src.base.scheme import BaseCreateScheme, BaseResponseScheme
 
@@ -44,7 +47,7 @@ class CheckListResponseScheme(CheckListCreateScheme, BaseResponseScheme): ...
 class ColumnCreateScheme(BaseCreateScheme):
     name: str | None = None
     board_id: int | None = None
-    position: str | None = None
+    position: float | None = None
     color_id: int | None = None
 
 
@@ -53,8 +56,8 @@ class ColumnResponseScheme(ColumnCreateScheme, BaseResponseScheme): ...
 
 class TaskCreateScheme(BaseCreateScheme):
     name: str | None = None
-    board_id: str | None = None
-    position: str | None = None
+    board_id: int | None = None
+    position: float | None = None
     start_date: datetime | None = None
     end_date: datetime | None = None
     description: str | None = None
@@ -66,4 +69,51 @@ class TaskCreateScheme(BaseCreateScheme):
     comment: list[int] | None = None
 
 
-class TaskResponseScheme(TaskCreateScheme, BaseResponseScheme): ...
+class TaskResponseScheme(TaskCreateScheme, BaseResponseScheme):
+    completed_at: datetime | None = None
+
+
+class BurndownPointScheme(BaseModel):
+    day: date
+    scope: int
+    completed: int
+    remaining: int
+    overdue: int
+
+
+class ThroughputPointScheme(BaseModel):
+    period: date
+    created: int
+    completed: int
+
+
+class ProjectImportScheme(BaseModel):
+    project_id: int
+    base_data: int
+    project: int
+    board: int
+    column: int
+    check_list: int
+    task: int
+    task_check_list: int
+
+
+class RecurringTaskCreateScheme(BaseCreateScheme):
+    template_id: int | None = None
+    unit: Literal["day", "week", "month"] = "week"
+    every: int = Field(1, ge=1)
+    next_run_at: datetime | None = None
+    until: datetime | None = None
+    is_active: bool = True
+
+
+class RecurringTaskResponseScheme(RecurringTaskCreateScheme, BaseResponseScheme): ...
+
+
+class TaskReminderResponseScheme(BaseCreateScheme):
+    id: int
+    task_id: int
+    user_id: int
+    due_at: datetime
+    is_read: bool
+    created_at: datetime | None = None
@@ -0,0 +1,77 @@
+from tortoise.expressions import Subquery
+from tortoise.signals import post_save, pre_save
+
+from src.helper.common.model import Comment
+from src.helper.search import SearchDocument, reindex, search_scope, searchable
+
+from .access import accessible_project_ids
+from .model import Board, Project, Task
+
+
+async def task_project(task: Task) -> int | None:
+    return (
+        await Board.filter(id=task.board_id)
+        .first()
+        .values_list("project_id", flat=True)
+    )
+
+
+async def comment_project(comment: Comment) -> int | None:
+    return (
+        await Task.filter(comment=comment.id)
+        .order_by("id")
+        .first()
+        .values_list("board__project_id", flat=True)
+    )
+
+
+search_scope(accessible_project_ids)
+
+
+searchable(
+    Project,
+    "project",
+    title="name",
+    body="description",
+    project=lambda p: p.id,
+    user="owner_id",
+)
+searchable(Task, "task", title="name", body="description", project=task_project)
+# a comment has no title of its own; indexing its text twice would weigh it
+# double
+searchable(
+    Comment,
+    "comment",
+    title=None,
+    body="text",
+    project=comment_project,
+    user="user_id",
+)
+
+
+@pre_save(Board)
+async def before_board_save(sender, instance, using_db, update_fields):
+    instance._search_project = (
+        await Board.filter(id=instance.id)
+        .using_db(using_db)
+        .first()
+        .values_list("project_id", flat=True)
+        if instance._saved_in_db
+        else None
+    )
+
+
+@post_save(Board)
+async def after_board_save(sender, instance, created, using_db, update_fields):
+    # its tasks and their comments are indexed under the board's project
+    if created or instance._search_project == instance.project_id:
+        return
+    tasks = Task.filter(board_id=instance.id)
+    await SearchDocument.filter(
+        kind="task", object_id__in=Subquery(tasks.values("id"))
+    ).update(project_id=instance.project_id)
+    comments = await tasks.filter(comment__id__isnull=False).values_list(
+        "comment__id", flat=True
+    )
+    if comments:
+        await reindex("comment", ids=set(comments))
@@ -0,0 +1,483 @@
+"""
+Project import and export. A project travels as its graph: the base data its
+rows point to, the project, its boards, columns and tasks, and the check
+lists linked to those tasks, with the links. Two formats:
+
+- `ndjson`: one row per line, tagged with its table in `_table`, streamed
+  straight from the database;
+- `parquet`: a zip of one Parquet file per table, each written a chunk (row
+  group) at a time.
+
+Export reads `STREAM_CHUNK_SIZE` rows at a time. Import inserts batches
+under ids reserved up front, and remaps foreign keys a batch at a time with
+Arrow `index_in`/`take` against the old → new id arrays, so neither side holds
+more than a batch of rows plus the id maps. Imported rows keep `created_at`;
+the task rollup of `analytics` and the search index are filled in the same
+transaction. File reads and writes, decoding and the Arrow work run in a
+worker thread, so a large transfer does not stall the event loop.
+
+pyarrow is imported on first use, it is only needed here.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO
+
+import orjson
+from fastapi import HTTPException
+from tortoise import Model, Tortoise, timezone
+from tortoise.expressions import Q, Subquery
+from tortoise.transactions import in_transaction
+
+from src.config.settings import STREAM_CHUNK_SIZE, USE_SEARCH
+from src.helper.search import index_rows
+from src.helper.stream import iterate_values
+
+from .analytics import apply_rollup, contribution
+from .model import BaseData, Board, CheckList, Column, Project, Task
+
+FORMATS = ("ndjson", "parquet")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "parquet": "application/zip"}
+
+# exported columns per table, in import order; `*_id` columns are remapped
+TABLES: dict[str, tuple[type[Model] | None, dict[str, str]]] = {
+    "base_data": (
+        BaseData,
+        {
+            "id": "int",
+            "created_at": "datetime",
+            "key": "str",
+            "value": "str",
+            "category": "str",
+        },
+    ),
+    "project": (
+        Project,
+        {"id": "int", "created_at": "datetime", "name": "str", "description": "str"},
+    ),
+    "board": (
+        Board,
+        {
+            "id": "int",
+            "created_at": "datetime",
+            "project_id": "int",
+            "name": "str",
+            "color_id": "int",
+        },
+    ),
+    "column": (
+        Column,
+        {
+            "id": "int",
+            "created_at": "datetime",
+            "board_id": "int",
+            "name": "str",
+            "position": "float",
+            "color_id": "int",
+        },
+    ),
+    "check_list": (
+        CheckList,
+        {
+            "id": "int",
+            "created_at": "datetime",
+            "name": "str",
+            "description": "str",
+            "is_done": "bool",
+        },
+    ),
+    "task": (
+        Task,
+        {
+            "id": "int",
+            "created_at": "datetime",
+            "board_id": "int",
+            "name": "str",
+            "position": "float",
+            "start_date": "datetime",
+            "end_date": "datetime",
+            "description": "str",
+            "is_show_on_card": "bool",
+            "color_id": "int",
+            "progress_id": "int",
+            "priority_id": "int",
+            "completed_at": "datetime",
+        },
+    ),
+    "task_check_list": (None, {"task_id": "int", "check_list_id": "int"}),
+}
+# rows whose parent is missing from the export are dropped
+REQUIRED = {"board": "project_id", "column": "board_id", "task": "board_id"}
+# which table each foreign key column points to
+REFERENCES = {
+    "project_id": "project",
+    "board_id": "board",
+    "color_id": "base_data",
+    "progress_id": "base_data",
+    "priority_id": "base_data",
+    "task_id": "task",
+    "check_list_id": "check_list",
+}
+
+
+def _schema(table: str):
+    import pyarrow as pa
+
+    types = {
+        "int": pa.int64(),
+        "str": pa.string(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in TABLES[table][1].items()])
+
+
+def _links():
+    field = Task._meta.fields_map["checklist"]
+    return field.through, field.backward_key, field.forward_key
+
+
+async def project_chunks(
+    project_id: int, chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[tuple[str, list[dict]]]:
+    """Yields `(table, rows)` chunks of the project graph, in import order."""
+    boards = Subquery(Board.filter(project_id=project_id).values("id"))
+    tasks = Task.filter(board_id__in=boards)
+    columns = Column.filter(board_id__in=boards)
+    referenced = (
+        Q(id__in=Subquery(Board.filter(project_id=project_id).values("color_id")))
+        | Q(id__in=Subquery(columns.values("color_id")))
+        | Q(id__in=Subquery(tasks.values("color_id")))
+        | Q(id__in=Subquery(tasks.values("progress_id")))
+        | Q(id__in=Subquery(tasks.values("priority_id")))
+    )
+    for table, query in (
+        ("base_data", BaseData.filter(referenced)),
+        ("project", Project.filter(id=project_id)),
+        ("board", Board.filter(project_id=project_id)),
+        ("column", columns),
+    ):
+        async for rows in iterate_values(query, list(TABLES[table][1]), chunk_size):
+            yield table, rows
+
+    through, task_key, check_list_key = _links()
+    connection = Tortoise.get_connection("default")
+    seen: set[int] = set()
+    async for rows in iterate_values(tasks, list(TABLES["task"][1]), chunk_size):
+        yield "task", rows
+        ids = ", ".join(str(row["id"]) for row in rows)
+        _, links = await connection.execute_query(
+            f'SELECT "{task_key}", "{check_list_key}" FROM "{through}" '
+            f'WHERE "{task_key}" IN ({ids})'
+        )
+        if not links:
+            continue
+        new = {link[1] for link in links} - seen
+        seen |= new
+        if new:
+            yield "check_list", await CheckList.filter(id__in=new).values(
+                *TABLES["check_list"][1]
+            )
+        yield "task_check_list", [
+            {"task_id": link[0], "check_list_id": link[1]} for link in links
+        ]
+
+
+async def ndjson_export(project_id: int) -> AsyncIterator[bytes]:
+    async for table, rows in project_chunks(project_id):
+        yield b"".join(
+            orjson.dumps({"_table": table, **row}, default=str) + b"\n" for row in rows
+        )
+
+
+async def parquet_export(project_id: int, path: str):
+    """Writes the project as a zip of per-table Parquet files to `path`."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    directory = tempfile.mkdtemp()
+    writers = {}
+    try:
+        async for table, rows in project_chunks(project_id):
+            if table not in writers:
+                writers[table] = pq.ParquetWriter(
+                    os.path.join(directory, f"{table}.parquet"), _schema(table)
+                )
+            await asyncio.to_thread(
+                writers[table].write_table,
+                pa.Table.from_pylist(rows, schema=_schema(table)),
+            )
+        for writer in writers.values():
+            writer.close()
+        await asyncio.to_thread(_zip, path, directory, list(writers))
+    finally:
+        for writer in writers.values():
+            if writer.is_open:
+                writer.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _zip(path: str, directory: str, tables: list[str]):
+    # parquet pages are compressed already
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for table in tables:
+            archive.write(os.path.join(directory, f"{table}.parquet"), table)
+
+
+def ndjson_batches(file: BinaryIO, batch_size: int = STREAM_CHUNK_SIZE):
+    """Yields `(table, Arrow table)` batches from an NDJSON export."""
+    import pyarrow as pa
+
+    table, rows = None, []
+    for line in file:
+        if not line.strip():
+            continue
+        row = orjson.loads(line)
+        name = row.pop("_table", None)
+        if name not in TABLES:
+            raise HTTPException(status_code=400, detail=f"Unknown table: {name}")
+        if rows and (name != table or len(rows) >= batch_size):
+            yield table, pa.Table.from_pylist(rows, schema=_schema(table))
+            rows = []
+        table = name
+        for column, kind in TABLES[name][1].items():
+            if kind == "datetime" and row.get(column):
+                row[column] = datetime.fromisoformat(row[column])
+        rows.append(row)
+    if rows:
+        yield table, pa.Table.from_pylist(rows, schema=_schema(table))
+
+
+def parquet_batches(file: BinaryIO, batch_size: int = STREAM_CHUNK_SIZE):
+    """Yields `(table, Arrow table)` batches from a Parquet export."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with zipfile.ZipFile(file) as archive:
+        names = set(archive.namelist())
+        unknown = names - set(TABLES)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown tables: {', '.join(unknown)}"
+            )
+        for table in TABLES:
+            if table not in names:
+                continue
+            with archive.open(table) as member:
+                for batch in pq.ParquetFile(member).iter_batches(batch_size):
+                    yield table, pa.Table.from_batches([batch]).select(
+                        list(TABLES[table][1])
+                    )
+
+
+class IdMap:
+    """Old → new ids of one table, kept as Arrow arrays for `remap`."""
+
+    def __init__(self):
+        self.old, self.new = [], []
+        self._arrays = None
+
+    def add(self, old, new):
+        self.old.append(old)
+        self.new.append(new)
+        self._arrays = None
+
+    def remap(self, column):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if not self.old:
+            return pa.nulls(len(column), pa.int64())
+        if self._arrays is None:
+            self._arrays = (
+                pa.concat_arrays(self.old).cast(pa.int64()),
+                pa.concat_arrays(self.new).cast(pa.int64()),
+            )
+        old, new = self._arrays
+        # ids missing from the export (dangling references) become null
+        return pc.take(new, pc.index_in(column, value_set=old))
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.old)
+
+
+async def _in_thread(batches):
+    """Steps a blocking batch reader in a worker thread."""
+    while (item := await asyncio.to_thread(next, batches, None)) is not None:
+        yield item
+
+
+def _remapped_rows(batch, maps: dict[str, IdMap]) -> list[dict]:
+    """The batch's rows, with foreign keys pointing at the new ids."""
+    for column in batch.column_names:
+        if column in REFERENCES:
+            batch = batch.set_column(
+                batch.schema.get_field_index(column),
+                column,
+                maps[REFERENCES[column]].remap(batch[column]),
+            )
+    return batch.to_pylist()
+
+
+async def reserve_ids(connection, model: type[Model], count: int) -> list[int]:
+    """Takes `count` ids for `model` rows the way its own inserts would."""
+    table = model._meta.db_table
+    if connection.capabilities.dialect == "postgres":
+        _, rows = await connection.execute_query(
+            f"SELECT nextval(pg_get_serial_sequence('\"{table}\"', 'id')) "
+            "FROM generate_series(1, $1)",
+            [count],
+        )
+        return [row[0] for row in rows]
+    # sqlite: the import transaction holds the write lock
+    _, rows = await connection.execute_query(
+        f'SELECT COALESCE(MAX("id"), 0) FROM "{table}"'
+    )
+    return list(range(rows[0][0] + 1, rows[0][0] + 1 + count))
+
+
+async def _base_data_ids(batch, maps: dict[str, IdMap], connection):
+    """Reuses base data rows that already exist with the same values."""
+    import pyarrow as pa
+
+    rows = batch.to_pylist()
+    existing = {
+        (row["key"], row["value"], row["category"]): row["id"]
+        for row in await BaseData.filter(key__in={row["key"] for row in rows})
+        .using_db(connection)
+        .values("id", "key", "value", "category")
+    }
+    missing = list(
+        {
+            (row["key"], row["value"], row["category"]): row
+            for row in rows
+            if (row["key"], row["value"], row["category"]) not in existing
+        }.values()
+    )
+    for row, id in zip(missing, await reserve_ids(connection, BaseData, len(missing))):
+        existing[row["key"], row["value"], row["category"]] = id
+    await BaseData.bulk_create(
+        [
+            BaseData(
+                **{**row, "id": existing[row["key"], row["value"], row["category"]]}
+            )
+            for row in missing
+        ],
+        batch_size=1000,
+        using_db=connection,
+    )
+    maps["base_data"].add(
+        batch["id"].combine_chunks(),
+        pa.array(
+            [existing[row["key"], row["value"], row["category"]] for row in rows],
+            pa.int64(),
+        ),
+    )
+
+
+async def import_project(
+    path: str, format: str, owner_id: int, batch_size: int = STREAM_CHUNK_SIZE
+) -> dict[str, int]:
+    """
+    Creates a copy of the exported project at `path`, owned by `owner_id`.
+    Returns the new project id and the number of rows read per table.
+    """
+    import pyarrow as pa
+
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}")
+    maps = {table: IdMap() for table in TABLES}
+    counts = dict.fromkeys(TABLES, 0)
+    now = timezone.now()
+    rollup = Counter()
+    through, task_key, check_list_key = _links()
+    with open(path, "rb") as file:
+        batches = (ndjson_batches if format == "ndjson" else parquet_batches)(
+            file, batch_size
+        )
+        async with in_transaction("default") as connection:
+            async for table, batch in _in_thread(batches):
+                counts[table] += len(batch)
+                if table == "base_data":
+                    await _base_data_ids(batch, maps, connection)
+                    continue
+                rows = await asyncio.to_thread(_remapped_rows, batch, maps)
+                if table == "task_check_list":
+                    await _insert(
+                        connection,
+                        through,
+                        [task_key, check_list_key],
+                        [
+                            [row["task_id"], row["check_list_id"]]
+                            for row in rows
+                            if row["task_id"] and row["check_list_id"]
+                        ],
+                    )
+                    continue
+                if table in REQUIRED:
+                    rows = [row for row in rows if row[REQUIRED[table]]]
+                for row in rows:
+                    row["created_at"] = row["created_at"] or now
+                model = TABLES[table][0]
+                ids = await reserve_ids(connection, model, len(rows))
+                maps[table].add(
+                    pa.array([row["id"] for row in rows], pa.int64()),
+                    pa.array(ids, pa.int64()),
+                )
+                extra = {"owner_id": owner_id} if model is Project else {}
+                if model is CheckList:
+                    extra = {"user_id": owner_id}
+                await _insert(
+                    connection,
+                    model._meta.db_table,
+                    ["id", "updated_at", *list(TABLES[table][1])[1:], *extra],
+                    [
+                        [id, now, *list(row.values())[1:], *extra.values()]
+                        for row, id in zip(rows, ids)
+                    ],
+                )
+                if model is Task:
+                    # the inserts skip the signals that keep it current
+                    for row in rows:
+                        rollup.update(contribution(row))
+                if USE_SEARCH and rows and model in (Project, Task):
+                    # and the ones that index rows for search
+                    await index_rows(
+                        table,
+                        [{**row, **extra, "id": id} for row, id in zip(rows, ids)],
+                        ids[0] if model is Project else _project_id(maps),
+                        connection,
+                    )
+            if len(maps["project"]) != 1:
+                raise HTTPException(
+                    status_code=400, detail="An export holds exactly one project"
+                )
+            await apply_rollup(rollup, connection)
+    return {"project_id": _project_id(maps), **counts}
+
+
+def _project_id(maps: dict[str, IdMap]) -> int | None:
+    return maps["project"].new[0][0].as_py() if len(maps["project"]) else None
+
+
+async def _insert(connection, table: str, columns: list[str], rows: list[list]):
+    """
+    Plain multi-row INSERT: building model instances for `bulk_create` costs
+    more than the database does at this volume.
+    """
+    if not rows:
+        return
+    if connection.capabilities.dialect == "postgres":
+        values = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    else:
+        values = ", ".join("?" * len(columns))
+    columns = ", ".join(f'"{column}"' for column in columns)
+    await connection.execute_many(
+        f'INSERT INTO "{table}" ({columns}) VALUES ({values})', rows
+    )
@@ -1,14 +1,17 @@
 from src.config.settings import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     APPS,
+    DB_READ_URL,
     DEBUG,
     FILTER_OPERATIONS,
     JWT_HASH_ALGORITHM,
+    QUERY_STATS,
     REFRESH_SECRET_KEY,
     REFRESH_TOKEN_EXPIRE_DAYS,
     SECRET_KEY,
     SHOW_QUERIES_IN_SWAGGER,
     TORTOISE_ORM,
+    USE_METRICS,
     USER_MODEL,
     USER_MODEL_PATH,
 )
@@ -17,15 +20,18 @@ from src.config.util import lifespan, remove_queries_from_swagger
 
 __all__ = [
     "DEBUG",
+    "DB_READ_URL",
     "ACCESS_TOKEN_EXPIRE_MINUTES",
     "APPS",
     "FILTER_OPERATIONS",
     "JWT_HASH_ALGORITHM",
+    "QUERY_STATS",
     "REFRESH_SECRET_KEY",
     "REFRESH_TOKEN_EXPIRE_DAYS",
     "SECRET_KEY",
     "SHOW_QUERIES_IN_SWAGGER",
     "TORTOISE_ORM",
+    "USE_METRICS",
     "USER_MODEL",
     "USER_MODEL_PATH",
     "api_router",
@@ -1,9 +1,33 @@
-import os
-
 from decouple import config
+from tortoise.backends.base.config_generator import expand_db_url
 
-DEBUG = True
-DB_URL = "sqlite://db.sqlite3"
+DEBUG = config("DEBUG", cast=bool, default=True)
+DB_URL = config("DB_URL", default="sqlite://db.sqlite3")
+# optional read replica; GET routers read from it when set
+DB_READ_URL = config("DB_READ_URL", default=None)
+# local stand-in for a replica: a second sqlite file refreshed from DB_URL
+DB_REPLICA_TEST = config("DB_REPLICA_TEST", cast=bool, default=False)
+DB_REPLICA_TEST_INTERVAL = config("DB_REPLICA_TEST_INTERVAL", cast=float, default=2)
+if DB_REPLICA_TEST and not DB_READ_URL:
+    DB_READ_URL = "sqlite://db.replica.sqlite3"
+# seconds a writer's reads stay on the primary; keep above the replica lag
+DB_RECENT_WRITE_TTL = config("DB_RECENT_WRITE_TTL", cast=float, default=5)
+DB_POOL_MIN_SIZE = config("DB_POOL_MIN_SIZE", cast=int, default=2)
+DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", cast=int, default=10)
+DB_POOL_MAX_QUERIES = config("DB_POOL_MAX_QUERIES", cast=int, default=50_000)
+DB_POOL_MAX_INACTIVE_LIFETIME = config(
+    "DB_POOL_MAX_INACTIVE_LIFETIME", cast=float, default=300
+)
+# milliseconds, 0 disables; routers can override it with `statement_timeout`
+DB_STATEMENT_TIMEOUT = config("DB_STATEMENT_TIMEOUT", cast=int, default=30_000)
+# per-router overrides: exports read whole tables, analytics reports should
+# fail fast rather than hold a connection
+DB_EXPORT_STATEMENT_TIMEOUT = config(
+    "DB_EXPORT_STATEMENT_TIMEOUT", cast=int, default=300_000
+)
+DB_REPORT_STATEMENT_TIMEOUT = config(
+    "DB_REPORT_STATEMENT_TIMEOUT", cast=int, default=10_000
+)
 
 APPS = [
     "src.helper.permission.model",
@@ -16,15 +40,22 @@ APPS = [
 
 USE_MINIO = config("USE_MINIO", cast=bool, default=False)
 USE_REDIS = config("USE_REDIS", cast=bool, default=False)
+USE_CELERY = config("USE_CELERY", cast=bool, default=False)
+USE_SEARCH = config("USE_SEARCH", cast=bool, default=True)
+USE_METRICS = config("USE_METRICS", cast=bool, default=False)
+USE_SCHEDULER = config("USE_SCHEDULER", cast=bool, default=False)
 
 
 if USE_MINIO:
     APPS.append("src.helper.minio.model")
+if USE_SEARCH:
+    APPS.append("src.helper.search.model")
 
 USER_MODEL = "models.User"
 USER_MODEL_PATH = "src.helper.user.model"
 
-GENERATE_SCHEMES = True
+# outside dev the schema is managed by aerich migrations
+GENERATE_SCHEMES = config("GENERATE_SCHEMES", cast=bool, default=DEBUG)
 ADD_EXCEPTION_HANDLERS = True
 
 USE_TZ = False
@@ -39,8 +70,40 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 JWT_HASH_ALGORITHM = "HS256"
 
+REVOCATION_SYNC_INTERVAL = config("REVOCATION_SYNC_INTERVAL", cast=float, default=5)
+REVOCATION_BLOOM_CAPACITY = config(
+    "REVOCATION_BLOOM_CAPACITY", cast=int, default=100_000
+)
+REVOCATION_BLOOM_ERROR_RATE = config(
+    "REVOCATION_BLOOM_ERROR_RATE", cast=float, default=0.001
+)
+
+# failed logins allowed per username from one ip, and per ip over all usernames
+LOGIN_MAX_ATTEMPTS_PER_USER = config("LOGIN_MAX_ATTEMPTS_PER_USER", cast=int, default=5)
+LOGIN_MAX_ATTEMPTS_PER_IP = config("LOGIN_MAX_ATTEMPTS_PER_IP", cast=int, default=20)
+LOGIN_ATTEMPT_WINDOW = config("LOGIN_ATTEMPT_WINDOW", cast=int, default=900)
+LOGIN_LOCKOUT_BASE = config("LOGIN_LOCKOUT_BASE", cast=int, default=5)
+LOGIN_LOCKOUT_MAX = config("LOGIN_LOCKOUT_MAX", cast=int, default=900)
+
+
+
+def db_connection(url: str) -> str | dict:
+    """Expands postgres urls with the asyncpg pool and session settings."""
+    if not url.startswith(("postgres://", "asyncpg://")):
+        return url
+    connection = expand_db_url(url)
+    connection["credentials"].update(
+        minsize=DB_POOL_MIN_SIZE,
+        maxsize=DB_POOL_MAX_SIZE,
+        max_queries=DB_POOL_MAX_QUERIES,
+        max_inactive_connection_lifetime=DB_POOL_MAX_INACTIVE_LIFETIME,
+        server_settings={"statement_timeout": str(DB_STATEMENT_TIMEOUT)},
+    )
+    return connection
+
+
 TORTOISE_ORM = {
-    "connections": {"default": os.getenv("DB_URL", DB_URL)},
+    "connections": {"default": db_connection(DB_URL)},
     "apps": {
         "models": {
             "models": [*APPS, "aerich.models"],
@@ -50,8 +113,15 @@ TORTOISE_ORM = {
     "use_tz": USE_TZ,
     "timezone": TIMEZONE,
 }
+if DB_READ_URL:
+    TORTOISE_ORM["connections"]["replica"] = db_connection(DB_READ_URL)
+    TORTOISE_ORM["routers"] = ["src.helper.db.routing.ReplicaRouter"]
 
 CACHE_TTL = config("CACHE_TTL", cast=int, default=3600)
+CACHE_L1_SIZE = config("CACHE_L1_SIZE", cast=int, default=2048)
+CACHE_L1_TTL = config("CACHE_L1_TTL", cast=float, default=60)
+CACHE_BACKEND_TIMEOUT = config("CACHE_BACKEND_TIMEOUT", cast=float, default=1)
+CACHE_EARLY_REFRESH_BETA = config("CACHE_EARLY_REFRESH_BETA", cast=float, default=1)
 
 if USE_MINIO:
     MINIO_HOST = config("MINIO_HOST", default="192.168.10.53")
@@ -71,7 +141,83 @@ if USE_REDIS:
     REDIS_KWARGS = {}
 
 
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", default=None)
+CELERY_TASK_ALWAYS_EAGER = config("CELERY_TASK_ALWAYS_EAGER", cast=bool, default=False)
+CELERY_DEFAULT_QUEUE = "default"
+CELERY_QUEUES = {
+    "mail": ["mail.*"],
+    "thumbnails": ["thumbnails.*"],
+    "exports": ["exports.*"],
+    "audit": ["audit.*"],
+}
+
+LOG_PARTITIONING = config("LOG_PARTITIONING", cast=bool, default=False)
+LOG_PARTITION_MONTHS_AHEAD = config("LOG_PARTITION_MONTHS_AHEAD", cast=int, default=2)
+LOG_VIEW_RETENTION_DAYS = config("LOG_VIEW_RETENTION_DAYS", cast=int, default=30)
+LOG_QUERY_WINDOW_DAYS = config("LOG_QUERY_WINDOW_DAYS", cast=int, default=30)
+
+STREAM_CHUNK_SIZE = config("STREAM_CHUNK_SIZE", cast=int, default=2000)
+
+RESPONSE_CACHE_TTL = config("RESPONSE_CACHE_TTL", cast=int, default=300)
+RESPONSE_CACHE_SIZE = config("RESPONSE_CACHE_SIZE", cast=int, default=1024)
+RESPONSE_CACHE_SYNC_INTERVAL = config(
+    "RESPONSE_CACHE_SYNC_INTERVAL", cast=float, default=1
+)
+
+SEARCH_LANGUAGE = config("SEARCH_LANGUAGE", default="simple")
+SEARCH_SNIPPET_WORDS = config("SEARCH_SNIPPET_WORDS", cast=int, default=16)
+
+# per-user project ids are cached this long; writes through the API evict them
+PROJECT_ACCESS_TTL = config("PROJECT_ACCESS_TTL", cast=int, default=300)
+# above this many ids, scoping uses a subquery instead of an IN list
+PROJECT_SCOPE_INLINE_IDS = config("PROJECT_SCOPE_INLINE_IDS", cast=int, default=500)
+# `BaseData.key`s of the task progress values that count as done
+TASK_DONE_PROGRESS = config("TASK_DONE_PROGRESS", default="done").split(",")
+# seconds before a task's end_date that its reminders are created
+TASK_REMINDER_LEAD = config("TASK_REMINDER_LEAD", cast=int, default=3600)
+
+SCHEDULER_POLL_INTERVAL = config("SCHEDULER_POLL_INTERVAL", cast=float, default=1)
+SCHEDULER_BATCH_SIZE = config("SCHEDULER_BATCH_SIZE", cast=int, default=500)
+# a claimed item comes due again this many seconds later unless it is acked
+SCHEDULER_LEASE = config("SCHEDULER_LEASE", cast=int, default=60)
+SCHEDULER_LEADER_TTL = config("SCHEDULER_LEADER_TTL", cast=int, default=10)
+
+
+# "warn" logs filters/sorts no index can serve, "reject" drops/refuses them
+INDEX_CHECK = config("INDEX_CHECK", default="warn")
+
+# per-request query counts; the sampled share also checks for N+1 patterns
+QUERY_STATS = config("QUERY_STATS", cast=bool, default=True)
+QUERY_STATS_SAMPLE_RATE = config(
+    "QUERY_STATS_SAMPLE_RATE", cast=float, default=1.0 if DEBUG else 0.05
+)
+QUERY_N_PLUS_ONE_THRESHOLD = config("QUERY_N_PLUS_ONE_THRESHOLD", cast=int, default=5)
+
+# prometheus is served on its own port, apart from the API
+METRICS_PORT = config("METRICS_PORT", cast=int, default=9100)
+METRICS_ADDR = config("METRICS_ADDR", default="0.0.0.0")
+# seconds between a worker's copies of its cache and websocket numbers into
+# PROMETHEUS_MULTIPROC_DIR
+METRICS_PUBLISH_INTERVAL = config("METRICS_PUBLISH_INTERVAL", cast=float, default=5)
+
+# production server, `python -m src`; 0 workers sizes them to the usable CPUs
+SERVER_HOST = config("SERVER_HOST", default="0.0.0.0")
+SERVER_PORT = config("SERVER_PORT", cast=int, default=8000)
+SERVER_WORKERS = config("SERVER_WORKERS", cast=int, default=0)
+SERVER_FORWARDED_ALLOW_IPS = config("SERVER_FORWARDED_ALLOW_IPS", default="127.0.0.1")
+SERVER_KEEP_ALIVE = config("SERVER_KEEP_ALIVE", cast=int, default=5)
+# seconds in-flight requests get to finish on shutdown or reload
+SERVER_GRACEFUL_TIMEOUT = config("SERVER_GRACEFUL_TIMEOUT", cast=int, default=30)
+# recycle a worker after this many requests (plus jitter), 0 never
+SERVER_MAX_REQUESTS = config("SERVER_MAX_REQUESTS", cast=int, default=0)
+SHUTDOWN_DRAIN_TIMEOUT = config("SHUTDOWN_DRAIN_TIMEOUT", cast=float, default=10)
+HEALTH_CHECK_TIMEOUT = config("HEALTH_CHECK_TIMEOUT", cast=float, default=2)
+
 SHOW_QUERIES_IN_SWAGGER = False
+# build filter schemas on their first request instead of at import; their
+# query parameters then stay out of the OpenAPI schema
+LAZY_STARTUP = config("LAZY_STARTUP", cast=bool, default=not SHOW_QUERIES_IN_SWAGGER)
 
 FILTER_OPERATIONS = [
     "exact",
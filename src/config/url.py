@@ -1,20 +1,28 @@
 from fastapi import APIRouter
 
-from src.config.settings import USE_MINIO
+from src.app.project.api import router as project_router
+from src.config.settings import USE_MINIO, USE_SEARCH
 from src.helper import add_patterns
 from src.helper.common.api import router as common_router
+from src.helper.logger.api import router as logger_router
 from src.helper.permission.api import router as permission_router
 from src.helper.user.api import router as user_router
 
 if USE_MINIO:
     from src.helper.minio.api import router as minio_router
+if USE_SEARCH:
+    from src.helper.search.api import router as search_router
 
 api_patterns = [
     (user_router, "/user"),
     (common_router, "/c"),
     (permission_router,),
+    (logger_router,),
+    (project_router,),
 ]
 
 if USE_MINIO:
     api_patterns += [(minio_router,)]
+if USE_SEARCH:
+    api_patterns += [(search_router,)]
 api_router = add_patterns(APIRouter(prefix="/api"), api_patterns)
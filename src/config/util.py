@@ -1,3 +1,4 @@
+import asyncio
 import importlib
 import os
 from contextlib import asynccontextmanager
@@ -7,26 +8,61 @@ from fastapi import FastAPI
 from tortoise import Model, Tortoise, generate_config
 from tortoise.contrib.fastapi import RegisterTortoise
 
-from src.config.settings import TORTOISE_ORM, USE_MINIO, USER_MODEL, USER_MODEL_PATH
+from src.config.settings import (
+    APPS,
+    DB_READ_URL,
+    DB_REPLICA_TEST,
+    DB_REPLICA_TEST_INTERVAL,
+    DB_URL,
+    GENERATE_SCHEMES,
+    LOG_PARTITIONING,
+    QUERY_STATS,
+    TORTOISE_ORM,
+    USE_METRICS,
+    USE_MINIO,
+    USE_SCHEDULER,
+    USE_SEARCH,
+    USER_MODEL,
+    USER_MODEL_PATH,
+)
+from src.helper.common import ensure_category_tree
+from src.helper.db import (
+    advisory_lock,
+    ensure_trigram_indexes,
+    install_statement_timeout,
+    replicate_sqlite,
+)
+from src.helper.health import drain, set_ready
+from src.helper.permission import ensure_group_permissions
 
 
 def remove_queries_from_swagger(app: FastAPI):
-    app.openapi_schema = app.openapi()
-    for path in app.openapi_schema["paths"].values():
-        for operation in path.values():
-            if isinstance(operation, dict) and "parameters" in operation:
-                operation["parameters"] = [
-                    param for param in operation["parameters"] if param["in"] != "query"
-                ]
+    """Strips query parameters from the schema once it is first requested."""
+    build = app.openapi
+
+    def openapi():
+        if app.openapi_schema:
+            return app.openapi_schema
+        for path in build()["paths"].values():
+            for operation in path.values():
+                if isinstance(operation, dict) and "parameters" in operation:
+                    operation["parameters"] = [
+                        param
+                        for param in operation["parameters"]
+                        if param["in"] != "query"
+                    ]
+        return app.openapi_schema
+
+    app.openapi = openapi
 
 
 @asynccontextmanager
 async def lifespan_test(app: FastAPI) -> AsyncGenerator[None, None]:
     config = generate_config(
         os.getenv("TORTOISE_TEST_DB", "sqlite://:memory:"),
-        app_modules={"models": ["models"]},
+        app_modules={"models": APPS},
         testing=True,
-        connection_label="models",
+        connection_label="default",
     )
     async with RegisterTortoise(
         app=app,
@@ -35,6 +71,12 @@ async def lifespan_test(app: FastAPI) -> AsyncGenerator[None, None]:
         add_exception_handlers=True,
         _create_db=True,
     ):
+        await ensure_category_tree()
+        await ensure_group_permissions()
+        if USE_SEARCH:
+            from src.helper.search import ensure_search_index
+
+            await ensure_search_index()
         yield
     await Tortoise._drop_databases()
 
@@ -47,15 +89,61 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
         await ensure_bucket_exists(MINIO_BASE_BUCKETS)
 
+    if USE_METRICS:
+        from src.helper.metrics.app import start_metrics_server
+
+        start_metrics_server()
+
     if getattr(app.state, "testing", None):
         async with lifespan_test(app) as _:
+            set_ready(True)
             yield
+            await drain()
     else:
         await Tortoise.init(config=TORTOISE_ORM)
-        await Tortoise.generate_schemas()
+        install_statement_timeout()
+        if QUERY_STATS or USE_METRICS:
+            from src.helper.metrics import instrument_connections
+
+            instrument_connections()
+        # every worker runs the schema setup on boot; one at a time, so none
+        # trips over another's half-finished DDL
+        async with advisory_lock("startup"):
+            if GENERATE_SCHEMES:
+                await Tortoise.generate_schemas()
+            if LOG_PARTITIONING:
+                from src.helper.logger.partition import (
+                    ensure_log_partitions,
+                    partition_log_table,
+                )
+
+                await partition_log_table()
+                await ensure_log_partitions()
+            await ensure_trigram_indexes()
+            await ensure_category_tree()
+            await ensure_group_permissions()
+            if USE_SEARCH:
+                from src.helper.search import ensure_search_index
+
+                await ensure_search_index()
+        if USE_SCHEDULER:
+            from src.helper.scheduler import scheduler
+
+            scheduler.start()
+        replication = None
+        if DB_REPLICA_TEST:
+            replication = asyncio.create_task(
+                replicate_sqlite(DB_URL, DB_READ_URL, DB_REPLICA_TEST_INTERVAL)
+            )
+        set_ready(True)
         try:
             yield
         finally:
+            if USE_SCHEDULER:
+                await scheduler.stop()
+            await drain()
+            if replication:
+                replication.cancel()
             await Tortoise.close_connections()
 
 
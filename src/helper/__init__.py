@@ -5,9 +5,11 @@ from src.helper.auth import (
     get_current_user,
     login,
     login_required,
+    login_throttle,
     logout,
     refresh_access_token,
 )
+from src.helper.cache import cache_response, invalidate_cache
 from src.helper.filters import Filter, create_filter_schema
 from src.helper.logger import (
     ActionEnum,
@@ -39,6 +41,7 @@ __all__ = [
     "get_current_user",
     "login",
     "login_required",
+    "login_throttle",
     "logout",
     "refresh_access_token",
     "Filter",
@@ -56,4 +59,6 @@ __all__ = [
     "Detail",
     "has_permission",
     "has_access",
+    "cache_response",
+    "invalidate_cache",
 ]
@@ -1,5 +1,8 @@
+import secrets
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from typing import Literal
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.responses import Response
@@ -15,15 +18,27 @@ from src.config import (
     REFRESH_TOKEN_EXPIRE_DAYS,
     SECRET_KEY,
 )
+from src.helper.auth.revocation import revocation_store
+from src.helper.auth.throttle import login_throttle
+from src.helper.db import read_replica, route_user
 from src.helper.user.model import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+TOKEN_EXPIRED = "Token has expired"
+
+
+@cache
+def dummy_password_hash() -> str:
+    return User.hash_password(secrets.token_urlsafe(16))
+
 
 async def authenticate_user(username: str, password: str) -> User | Literal[False]:
     try:
         user = await User.get(username=username)
     except DoesNotExist:
+        # burn the same argon2 work as a real account so timing doesn't leak it
+        User.veirfy_password(password, dummy_password_hash())
         return False
     if not user:
         return False
@@ -32,7 +47,7 @@ async def authenticate_user(username: str, password: str) -> User | Literal[Fals
     return user
 
 
-async def create_access_token(user_id: int) -> str:
+async def create_access_token(user_id: int, session_id: str | None = None) -> str:
     expiration = datetime.now(tz=timezone.utc) + timedelta(
         minutes=ACCESS_TOKEN_EXPIRE_MINUTES
     )
@@ -40,12 +55,13 @@ async def create_access_token(user_id: int) -> str:
         "exp": expiration,
         "iat": datetime.now(tz=timezone.utc),
         "id": user_id,
+        "sid": session_id,
     }
     access_token = encode(payload, SECRET_KEY, algorithm=JWT_HASH_ALGORITHM)
     return access_token
 
 
-async def create_refresh_token(user_id: int) -> str:
+async def create_refresh_token(user_id: int, session_id: str | None = None) -> str:
     expiration = datetime.now(tz=timezone.utc) + timedelta(
         days=REFRESH_TOKEN_EXPIRE_DAYS
     )
@@ -53,6 +69,8 @@ async def create_refresh_token(user_id: int) -> str:
         "exp": expiration,
         "iat": datetime.now(tz=timezone.utc),
         "id": user_id,
+        "sid": session_id,
+        "jti": uuid4().hex,
     }
     refresh_token = encode(payload, REFRESH_SECRET_KEY, algorithm=JWT_HASH_ALGORITHM)
     return refresh_token
@@ -66,19 +84,25 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
             algorithms=[JWT_HASH_ALGORITHM],
             options={"verify_exp": True},
         )
-        user = await User.get(id=payload.get("id"))
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
+            detail=TOKEN_EXPIRED,
         )
     except PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
+    if await revocation_store.check(payload.get("sid")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
 
-    return user
+    await route_user(payload.get("id"))
+    with read_replica():
+        return await User.get(id=payload.get("id"))
 
 
 async def login_required(request: Request, response: Response):
@@ -86,13 +110,40 @@ async def login_required(request: Request, response: Response):
     if not access_token:
         return None
     try:
-        user = await get_current_user(access_token)
-    except ExpiredSignatureError:
-        try:
-            refresh_access_token(request.cookies.get("refresh_token"), response)
-        except Exception as _:
-            return None
-    return user
+        return await get_current_user(access_token)
+    except HTTPException as err:
+        if err.detail != TOKEN_EXPIRED:
+            raise
+    try:
+        tokens = await refresh_access_token(
+            request.cookies.get("refresh_token"), response
+        )
+    except HTTPException:
+        return None
+    return await get_current_user(tokens["access_token"])
+
+
+def set_token_cookies(response: Response, access_token: str, refresh_token: str):
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,
+        secure=True,
+        max_age=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        expires=datetime.now(tz=timezone.utc)
+        + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        samesite="Strict",
+    )
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        secure=True,
+        max_age=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        expires=datetime.now(tz=timezone.utc)
+        + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        samesite="Strict",
+    )
 
 
 async def refresh_access_token(
@@ -103,9 +154,8 @@ async def refresh_access_token(
             refresh_token,
             REFRESH_SECRET_KEY,
             algorithms=[JWT_HASH_ALGORITHM],
-            options={"verify_exp": True},
+            options={"verify_exp": True, "require": ["jti", "sid"]},
         )
-        user = await User.get(id=payload.get("id"))
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -117,46 +167,47 @@ async def refresh_access_token(
             detail="Invalid refresh token",
         )
 
-    new_access_token = await create_access_token(user.id)
+    # a deactivated or deleted user keeps no session; read from the primary so
+    # a change just made is seen
+    with read_replica(False):
+        active = await User.exists(id=payload.get("id"), is_active=True)
+    if not active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+        )
 
-    response.set_cookie(
-        key="access_token",
-        value=new_access_token,
-        httponly=True,
-        secure=True,
-        max_age=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-        expires=datetime.now(tz=timezone.utc)
-        + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-        samesite="Strict",
-    )
+    session_id = payload["sid"]
+    if await revocation_store.is_revoked(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked",
+        )
+    if not await revocation_store.claim(payload["jti"]):
+        # a rotated token was replayed, so the whole session is compromised
+        await revocation_store.revoke(session_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked",
+        )
 
-    return {"access_token": new_access_token, "token_type": "bearer"}
+    new_access_token = await create_access_token(payload["id"], session_id)
+    new_refresh_token = await create_refresh_token(payload["id"], session_id)
+    set_token_cookies(response, new_access_token, new_refresh_token)
 
+    return {
+        "access_token": new_access_token,
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer",
+    }
 
-async def login(user: User, response: Response) -> dict[str, str]:
-    access_token = await create_access_token(user.id)
-    refresh_token = await create_refresh_token(user.id)
 
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        secure=True,
-        max_age=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-        expires=datetime.now(tz=timezone.utc)
-        + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-        samesite="Strict",
-    )
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=True,
-        max_age=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
-        expires=datetime.now(tz=timezone.utc)
-        + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
-        samesite="Strict",
-    )
+async def login(user: User, response: Response) -> dict[str, str]:
+    session_id = uuid4().hex
+    await revocation_store.add_session(user.id, session_id)
+    access_token = await create_access_token(user.id, session_id)
+    refresh_token = await create_refresh_token(user.id, session_id)
+    set_token_cookies(response, access_token, refresh_token)
 
     return {
         "access_token": access_token,
@@ -165,7 +216,18 @@ async def login(user: User, response: Response) -> dict[str, str]:
     }
 
 
-async def logout(response: Response):
+async def logout(response: Response, refresh_token: str | None = None):
+    if refresh_token:
+        try:
+            payload = decode(
+                refresh_token,
+                REFRESH_SECRET_KEY,
+                algorithms=[JWT_HASH_ALGORITHM],
+                options={"verify_exp": False},
+            )
+            await revocation_store.revoke_user(payload.get("id"))
+        except PyJWTError:
+            pass
     response.delete_cookie(
         key="access_token", secure=True, httponly=True, samesite="Strict"
     )
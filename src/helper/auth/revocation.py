@@ -0,0 +1,197 @@
+import hashlib
+import math
+import time
+
+from src.config.settings import (
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    REVOCATION_BLOOM_CAPACITY,
+    REVOCATION_BLOOM_ERROR_RATE,
+    REVOCATION_SYNC_INTERVAL,
+    USE_REDIS,
+)
+
+if USE_REDIS:
+    from src.helper.redis import async_redis
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationStore:
+    """
+    Revoked session ids and used refresh-token ids.
+
+    Redis keeps one set per `ttl`-long bucket (expiring two buckets later), so
+    an id is remembered at least as long as any token that carries it. Every
+    worker mirrors the revoked sessions into a local bloom filter, so
+    access-token checks only reach redis on a bloom hit. At most every
+    `sync_interval` seconds it adds the ids revoked since, read from a list
+    kept next to each set; the filter starts over when a new bucket opens.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        ttl: int = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+        sync_interval: float = REVOCATION_SYNC_INTERVAL,
+        capacity: int = REVOCATION_BLOOM_CAPACITY,
+        error_rate: float = REVOCATION_BLOOM_ERROR_RATE,
+        prefix: str = "auth",
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.prefix = prefix
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._version = None
+        self._synced_at = 0.0
+        self._bucket = None
+        # how far each bucket's list of revoked ids has been read
+        self._offsets: dict[str, int] = {}
+        self._memory: dict[str, dict[str, float]] = {"revoked": {}, "used": {}}
+        # user id -> session id -> when it expires
+        self._sessions: dict[int, dict[str, float]] = {}
+
+    def _bucket_keys(self, kind: str, now: float) -> tuple[str, str]:
+        bucket = int(now // self.ttl)
+        return (
+            f"{self.prefix}:{kind}:{bucket}",
+            f"{self.prefix}:{kind}:{bucket - 1}",
+        )
+
+    def _expire_at(self, now: float) -> int:
+        return (int(now // self.ttl) + 2) * self.ttl
+
+    async def revoke(self, *session_ids: str):
+        session_ids = [i for i in session_ids if i]
+        if not session_ids:
+            return
+        now = time.time()
+        for session_id in session_ids:
+            self._bloom.add(session_id)
+        if self.redis:
+            current, _ = self._bucket_keys("revoked", now)
+            pipeline = self.redis.pipeline()
+            pipeline.sadd(current, *session_ids)
+            pipeline.expireat(current, self._expire_at(now))
+            pipeline.rpush(f"{current}:log", *session_ids)
+            pipeline.expireat(f"{current}:log", self._expire_at(now))
+            pipeline.incr(f"{self.prefix}:revoked:version")
+            await pipeline.execute()
+            return
+        for session_id in session_ids:
+            self._memory["revoked"][session_id] = now + self.ttl
+
+    async def is_revoked(self, session_id: str) -> bool:
+        return await self._contains("revoked", session_id)
+
+    async def check(self, session_id: str | None) -> bool:
+        if not session_id:
+            return False
+        await self.sync()
+        if session_id not in self._bloom:
+            return False
+        return await self.is_revoked(session_id)
+
+    async def claim(self, token_id: str) -> bool:
+        now = time.time()
+        if self.redis:
+            current, previous = self._bucket_keys("used", now)
+            pipeline = self.redis.pipeline()
+            pipeline.sismember(previous, token_id)
+            pipeline.sadd(current, token_id)
+            pipeline.expireat(current, self._expire_at(now))
+            used_before, added, _ = await pipeline.execute()
+            return not used_before and bool(added)
+        if await self._contains("used", token_id):
+            return False
+        self._memory["used"][token_id] = now + self.ttl
+        return True
+
+    async def add_session(self, user_id: int, session_id: str):
+        if self.redis:
+            key = f"{self.prefix}:sessions:{user_id}"
+            pipeline = self.redis.pipeline()
+            pipeline.sadd(key, session_id)
+            pipeline.expire(key, self.ttl)
+            await pipeline.execute()
+            return
+        self._sessions.setdefault(user_id, {})[session_id] = time.time() + self.ttl
+
+    async def revoke_user(self, user_id: int):
+        if self.redis:
+            key = f"{self.prefix}:sessions:{user_id}"
+            pipeline = self.redis.pipeline()
+            pipeline.smembers(key)
+            pipeline.delete(key)
+            session_ids, _ = await pipeline.execute()
+            await self.revoke(*(i.decode() for i in session_ids))
+            return
+        await self.revoke(*self._sessions.pop(user_id, {}))
+
+    async def sync(self):
+        now = time.time()
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        if not self.redis:
+            for kind, entries in self._memory.items():
+                self._memory[kind] = {k: v for k, v in entries.items() if v > now}
+            sessions = {
+                user_id: {k: v for k, v in entries.items() if v > now}
+                for user_id, entries in self._sessions.items()
+            }
+            self._sessions = {k: v for k, v in sessions.items() if v}
+            return
+        version = await self.redis.get(f"{self.prefix}:revoked:version")
+        if version == self._version:
+            return
+        keys = self._bucket_keys("revoked", now)
+        if keys[0] != self._bucket:
+            # the oldest bucket has left the window, and its ids with it
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+            self._bucket, self._offsets = keys[0], {}
+        pipeline = self.redis.pipeline()
+        for key in keys:
+            pipeline.lrange(f"{key}:log", self._offsets.get(key, 0), -1)
+        for key, session_ids in zip(keys, await pipeline.execute()):
+            for session_id in session_ids:
+                self._bloom.add(session_id.decode())
+            self._offsets[key] = self._offsets.get(key, 0) + len(session_ids)
+        self._version = version
+
+    async def _contains(self, kind: str, value: str) -> bool:
+        now = time.time()
+        if self.redis:
+            pipeline = self.redis.pipeline()
+            for key in self._bucket_keys(kind, now):
+                pipeline.sismember(key, value)
+            return any(await pipeline.execute())
+        return self._memory[kind].get(value, 0) > now
+
+
+revocation_store = RevocationStore(async_redis if USE_REDIS else None)
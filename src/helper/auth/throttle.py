@@ -0,0 +1,120 @@
+import math
+import time
+
+from src.config.settings import (
+    LOGIN_ATTEMPT_WINDOW,
+    LOGIN_LOCKOUT_BASE,
+    LOGIN_LOCKOUT_MAX,
+    LOGIN_MAX_ATTEMPTS_PER_IP,
+    LOGIN_MAX_ATTEMPTS_PER_USER,
+    USE_REDIS,
+)
+
+if USE_REDIS:
+    from src.helper.redis import async_redis
+
+
+class LoginThrottle:
+    """
+    Failure counters per username and client ip pair, and per client ip.
+    Keying the username by ip too means nobody can lock an account's owner
+    out by failing its logins from elsewhere.
+
+    Once a counter reaches its limit the key is locked for
+    `lockout_base * 2 ** (failures - limit)` seconds (capped at `lockout_max`),
+    so every further failure doubles the wait. `locked` only touches redis (or
+    process memory when redis is disabled), never the database.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        max_user_attempts: int = LOGIN_MAX_ATTEMPTS_PER_USER,
+        max_ip_attempts: int = LOGIN_MAX_ATTEMPTS_PER_IP,
+        window: int = LOGIN_ATTEMPT_WINDOW,
+        lockout_base: int = LOGIN_LOCKOUT_BASE,
+        lockout_max: int = LOGIN_LOCKOUT_MAX,
+        prefix: str = "login",
+        max_entries: int = 100_000,
+    ):
+        self.redis = redis
+        self.max_user_attempts = max_user_attempts
+        self.max_ip_attempts = max_ip_attempts
+        self.window = window
+        self.lockout_base = lockout_base
+        self.lockout_max = lockout_max
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self._failures: dict[str, tuple[int, float]] = {}
+        self._locks: dict[str, float] = {}
+
+    def _user_key(self, username: str, ip: str | None) -> str:
+        return f"{self.prefix}:user:{username}:{ip or ''}"
+
+    def _keys(self, username: str, ip: str | None) -> list[tuple[str, int]]:
+        keys = [(self._user_key(username, ip), self.max_user_attempts)]
+        if ip:
+            keys.append((f"{self.prefix}:ip:{ip}", self.max_ip_attempts))
+        return keys
+
+    def lockout(self, failures: int, limit: int) -> int:
+        if failures < limit:
+            return 0
+        return min(self.lockout_base * 2 ** (failures - limit), self.lockout_max)
+
+    async def locked(self, username: str, ip: str | None = None) -> int:
+        keys = [f"{key}:lock" for key, _ in self._keys(username, ip)]
+        if self.redis:
+            pipeline = self.redis.pipeline()
+            for key in keys:
+                pipeline.ttl(key)
+            return max(0, *await pipeline.execute())
+        now = time.monotonic()
+        return max(0, *(math.ceil(self._locks.get(key, now) - now) for key in keys))
+
+    async def fail(self, username: str, ip: str | None = None) -> int:
+        retry_after = 0
+        for key, limit in self._keys(username, ip):
+            lockout = self.lockout(await self._incr(key), limit)
+            if lockout:
+                await self._lock(f"{key}:lock", lockout)
+                retry_after = max(retry_after, lockout)
+        return retry_after
+
+    async def reset(self, username: str, ip: str | None = None):
+        key = self._user_key(username, ip)
+        if self.redis:
+            await self.redis.delete(key, f"{key}:lock")
+            return
+        self._failures.pop(key, None)
+        self._locks.pop(f"{key}:lock", None)
+
+    async def _incr(self, key: str) -> int:
+        if self.redis:
+            pipeline = self.redis.pipeline()
+            pipeline.incr(key)
+            pipeline.expire(key, self.window)
+            failures, _ = await pipeline.execute()
+            return failures
+        now = time.monotonic()
+        if len(self._failures) >= self.max_entries:
+            self._prune(now)
+        failures, expires_at = self._failures.get(key, (0, now))
+        failures = failures + 1 if expires_at > now else 1
+        self._failures[key] = (failures, now + self.window)
+        return failures
+
+    async def _lock(self, key: str, seconds: int):
+        if self.redis:
+            await self.redis.set(key, 1, ex=seconds)
+            return
+        self._locks[key] = time.monotonic() + seconds
+
+    def _prune(self, now: float):
+        self._failures = {
+            key: value for key, value in self._failures.items() if value[1] > now
+        }
+        self._locks = {key: value for key, value in self._locks.items() if value > now}
+
+
+login_throttle = LoginThrottle(async_redis if USE_REDIS else None)
@@ -0,0 +1,19 @@
+from .response import (
+    ResponseCache,
+    cache_response,
+    invalidate_cache,
+    response_cache,
+)
+from .tiered import LRUCache, OrjsonSerializer, TieredCache, cache, cached
+
+__all__ = [
+    "LRUCache",
+    "OrjsonSerializer",
+    "TieredCache",
+    "cache",
+    "cached",
+    "ResponseCache",
+    "cache_response",
+    "invalidate_cache",
+    "response_cache",
+]
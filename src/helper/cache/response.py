@@ -0,0 +1,186 @@
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from src.config.settings import (
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_SYNC_INTERVAL,
+    RESPONSE_CACHE_TTL,
+    USE_METRICS,
+    USE_REDIS,
+)
+from src.helper.health import on_shutdown
+
+from .tiered import TieredCache
+
+if USE_REDIS:
+    from src.helper.redis import async_redis
+
+    from .tiered import redis_backend
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class ResponseCache:
+    """
+    Serialized JSON responses stored in a `TieredCache`.
+
+    Keys embed the current version of every tag they depend on, so
+    invalidating a tag only bumps its version: old entries stop being
+    addressed and expire on their own. Local writes bump the version at once;
+    versions changed by other workers are picked up from redis at most every
+    `sync_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        ttl: int = RESPONSE_CACHE_TTL,
+        size: int = RESPONSE_CACHE_SIZE,
+        sync_interval: float = RESPONSE_CACHE_SYNC_INTERVAL,
+        prefix: str = "response",
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.prefix = prefix
+        self.cache = TieredCache(
+            redis_backend(f"{prefix}:") if redis else None,
+            size=size,
+            local_ttl=ttl,
+        )
+        self._versions: dict[str, int] = {}
+        self._synced_at: dict[str, float] = {}
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def versions(self, tags: tuple[str, ...]) -> list[int]:
+        now = time.monotonic()
+        stale = [
+            tag
+            for tag in tags
+            if now - self._synced_at.get(tag, -self.sync_interval) >= self.sync_interval
+        ]
+        if self.redis and stale:
+            values = await self.redis.mget([self._tag_key(tag) for tag in stale])
+            for tag, value in zip(stale, values):
+                self._versions[tag] = int(value or 0)
+                self._synced_at[tag] = now
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    async def key(self, request: Request, tags: tuple[str, ...], scope) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        versions = await self.versions(tags)
+        raw = "|".join(
+            (
+                request.method,
+                request.url.path,
+                query,
+                str(scope),
+                ",".join(f"{tag}:{version}" for tag, version in zip(tags, versions)),
+            )
+        )
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    async def get_or_set(self, key: str, render, ttl: int | None = None):
+        return await self.cache.get_or_set(key, render, ttl or self.ttl)
+
+    async def invalidate(self, *tags: str):
+        if not self.redis:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            return
+        pipeline = self.redis.pipeline()
+        for tag in tags:
+            pipeline.incr(self._tag_key(tag))
+        now = time.monotonic()
+        for tag, version in zip(tags, await pipeline.execute()):
+            self._versions[tag] = version
+            self._synced_at[tag] = now
+
+
+response_cache = ResponseCache(async_redis if USE_REDIS else None)
+on_shutdown(response_cache.cache.close)
+if USE_METRICS:
+    from src.helper.metrics.collectors import track_cache
+
+    track_cache("response", response_cache.cache)
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def cache_response(
+    *tags: str,
+    ttl: int | None = None,
+    request_field: str = "request",
+    user_field: str = "user",
+):
+    """
+    Caches a GET router's JSON body per route, query string and the caller's
+    permission group, and answers `If-None-Match` with 304. Goes under
+    `log_action`/`has_access` so those still run on every request.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs.get(request_field)
+            if request is None:
+                return await func(*args, **kwargs)
+            user = kwargs.get(user_field)
+            scope = getattr(user, "group_id", None)
+            key = await response_cache.key(request, tags, scope)
+            result = None
+
+            async def render():
+                nonlocal result
+                result = await func(*args, **kwargs)
+                if not isinstance(result, Response):
+                    body = orjson.dumps(jsonable_encoder(result))
+                elif result.status_code == 200:
+                    body = bytes(result.body)
+                else:
+                    return None
+                return [body.decode(), make_etag(body)]
+
+            entry = await response_cache.get_or_set(key, render, ttl)
+            if entry is None:
+                return result if result is not None else await func(*args, **kwargs)
+            body, etag = entry
+            headers = {"ETag": etag, "X-Cache": "HIT" if result is None else "MISS"}
+            if not_modified(request, etag):
+                return Response(status_code=304, headers=headers)
+            return Response(body, media_type="application/json", headers=headers)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_cache(*tags: str):
+    """Bumps `tags` after the wrapped write router succeeds."""
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            await response_cache.invalidate(*tags)
+            return result
+
+        return wrapper
+
+    return decorator
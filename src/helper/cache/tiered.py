@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+import orjson
+
+from src.config.settings import (
+    CACHE_BACKEND_TIMEOUT,
+    CACHE_EARLY_REFRESH_BETA,
+    CACHE_L1_SIZE,
+    CACHE_L1_TTL,
+    CACHE_TTL,
+    USE_METRICS,
+    USE_REDIS,
+)
+from src.helper.health import on_shutdown
+
+if USE_REDIS:
+    from aiocache import RedisCache
+
+    from src.config.settings import (
+        REDIS_HOST,
+        REDIS_KWARGS,
+        REDIS_PASSWORD,
+        REDIS_PORT,
+        REDIS_USERNAME,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonSerializer:
+    # aiocache's serializer interface, without importing aiocache (and the
+    # redis client with it) unless USE_REDIS
+    encoding = None
+
+    def dumps(self, value):
+        return orjson.dumps(value, default=str)
+
+    def loads(self, value):
+        if value is None:
+            return None
+        return orjson.loads(value)
+
+
+class LRUCache:
+    def __init__(self, size: int):
+        self.size = size
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value, ttl: float):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+def redis_backend(namespace: str = "", timeout: float = CACHE_BACKEND_TIMEOUT):
+    return RedisCache(
+        endpoint=REDIS_HOST,
+        port=REDIS_PORT,
+        password=REDIS_PASSWORD,
+        namespace=namespace,
+        timeout=timeout,
+        serializer=OrjsonSerializer(),
+        connection_pool_kwargs={"username": REDIS_USERNAME, **REDIS_KWARGS},
+    )
+
+
+class TieredCache:
+    """
+    A per-process LRU (L1) in front of a shared backend (L2, redis).
+
+    Entries are stored as `[value, delta, expires_at]`, where `delta` is how
+    long the value took to compute. `get_or_set` lets one caller per key
+    recompute a missing value while concurrent callers wait for it, and
+    refreshes a present value early with a probability that rises as expiry
+    nears (`delta * beta * -log(random())` seconds ahead), so hot keys are
+    rebuilt by a single request instead of expiring under load.
+
+    Backend failures are logged and counted and degrade to a miss.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        size: int = CACHE_L1_SIZE,
+        local_ttl: float = CACHE_L1_TTL,
+        beta: float = CACHE_EARLY_REFRESH_BETA,
+    ):
+        self.backend = backend
+        self.local = LRUCache(size)
+        self.local_ttl = local_ttl
+        self.beta = beta
+        self.stats = Counter()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def _get_entry(self, key: str) -> list | None:
+        entry = self.local.get(key)
+        if entry is not None:
+            self.stats["l1_hits"] += 1
+            return entry
+        if self.backend:
+            try:
+                entry = await self.backend.get(key)
+            except Exception:
+                self.stats["errors"] += 1
+                logger.exception("cache backend get failed for %s", key)
+                entry = None
+            if entry is not None:
+                self.stats["l2_hits"] += 1
+                self._set_local(key, entry)
+                return entry
+        self.stats["misses"] += 1
+        return None
+
+    def _set_local(self, key: str, entry: list):
+        ttl = min(self.local_ttl, entry[2] - time.time())
+        if ttl > 0:
+            self.local.set(key, entry, ttl)
+
+    def _expiring(self, delta: float, expires_at: float) -> bool:
+        jitter = -delta * self.beta * math.log(1.0 - random.random())
+        return time.time() + jitter >= expires_at
+
+    async def get(self, key: str, default=None):
+        entry = await self._get_entry(key)
+        return default if entry is None else entry[0]
+
+    async def set(self, key: str, value, ttl: float = CACHE_TTL, delta: float = 0.0):
+        entry = [value, delta, time.time() + ttl]
+        self._set_local(key, entry)
+        if self.backend:
+            try:
+                await self.backend.set(key, entry, ttl=ttl)
+            except Exception:
+                self.stats["errors"] += 1
+                logger.exception("cache backend set failed for %s", key)
+
+    async def delete(self, key: str):
+        self.local.delete(key)
+        if self.backend:
+            try:
+                await self.backend.delete(key)
+            except Exception:
+                self.stats["errors"] += 1
+                logger.exception("cache backend delete failed for %s", key)
+
+    async def get_or_set(
+        self, key: str, factory: Callable[[], Awaitable[Any]], ttl: float = CACHE_TTL
+    ):
+        """
+        Returns the cached value for `key`, computing it with `factory` on a
+        miss. `None` results are returned but not cached.
+        """
+        entry = await self._get_entry(key)
+        if entry is not None:
+            value, delta, expires_at = entry
+            if key in self._inflight or not self._expiring(delta, expires_at):
+                return value
+            self.stats["early_refreshes"] += 1
+        elif key in self._inflight:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            started = time.monotonic()
+            value = await factory()
+            if value is not None:
+                await self.set(key, value, ttl, delta=time.monotonic() - started)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def close(self):
+        """Lets in-flight loads store their values, then closes the backend."""
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        if self.backend:
+            await self.backend.close()
+
+    def metrics(self) -> dict[str, float]:
+        hits = self.stats["l1_hits"] + self.stats["l2_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **{
+                name: self.stats[name]
+                for name in (
+                    "l1_hits",
+                    "l2_hits",
+                    "misses",
+                    "coalesced",
+                    "early_refreshes",
+                    "errors",
+                )
+            },
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+
+cache = TieredCache(redis_backend("cache:") if USE_REDIS else None)
+on_shutdown(cache.close)
+if USE_METRICS:
+    from src.helper.metrics.collectors import track_cache
+
+    track_cache("default", cache)
+
+
+def make_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    payload = orjson.dumps([args, sorted(kwargs.items())], default=str)
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return f"{func.__module__}.{func.__qualname__}:{digest}"
+
+
+def cached(
+    ttl: float = CACHE_TTL,
+    key_builder: Callable[..., str] | None = None,
+    cache: TieredCache = cache,
+):
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (
+                key_builder(func, *args, **kwargs)
+                if key_builder
+                else make_key(func, args, kwargs)
+            )
+            return await cache.get_or_set(key, lambda: func(*args, **kwargs), ttl)
+
+        return wrapper
+
+    return decorator
@@ -1,170 +1,231 @@
-from time import sleep
-from typing import Any, Callable, List
+import asyncio
+import logging
+import time
+from functools import wraps
+from typing import Any, Callable, Coroutine, List
 
 from celery import Celery, chain, chord, group
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+)
+from kombu import Queue
+from tortoise import Tortoise
+
+from src.config.settings import (
+    CELERY_BROKER_URL,
+    CELERY_DEFAULT_QUEUE,
+    CELERY_QUEUES,
+    CELERY_RESULT_BACKEND,
+    CELERY_TASK_ALWAYS_EAGER,
+    TIMEZONE,
+    TORTOISE_ORM,
+)
+from src.helper.health import on_shutdown
+
+logger = logging.getLogger(__name__)
 
-# تنظیمات Celery
 app = Celery(
-    "tasks", broker="redis://localhost:6379/0", backend="redis://localhost:6379/0"
+    "taskflow",
+    broker="memory://" if CELERY_TASK_ALWAYS_EAGER else CELERY_BROKER_URL,
+    backend=CELERY_RESULT_BACKEND,
+    include=["src.helper.celery.tasks"],
+)
+app.conf.update(
+    task_ignore_result=True,
+    task_always_eager=CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_default_queue=CELERY_DEFAULT_QUEUE,
+    task_queues=[Queue(name) for name in (CELERY_DEFAULT_QUEUE, *CELERY_QUEUES)],
+    task_routes={
+        pattern: {"queue": queue}
+        for queue, patterns in CELERY_QUEUES.items()
+        for pattern in patterns
+    },
+    timezone=TIMEZONE,
 )
 
-
-def simple_task(x: int) -> int:
-    return x * x
+_loop: asyncio.AbstractEventLoop | None = None
+_pending: set[asyncio.Task] = set()
 
 
-def retry_task_on_failure(
-    task, max_retries: int = 3, countdown: int = 5, *args: Any, **kwargs: Any
-) -> Any:
-    try:
-        return task(*args, **kwargs)
-    except Exception as e:
-        if task.request.retries < max_retries:
-            raise task.retry(exc=e, countdown=countdown)
-        else:
-            return f"Task failed after {max_retries} retries"
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        _loop.run_until_complete(Tortoise.init(config=TORTOISE_ORM))
+    return _loop
 
 
-@app.task(bind=True, max_retries=3, default_retry_delay=5)
-def long_running_task(self, x: int) -> int:
+def run_async(coroutine: Coroutine, name: str | None = None) -> Any:
     try:
-        # فرض کنید یه پردازش زمان‌بر دارین
-        sleep(10)
-        return x * x
-    except Exception as e:
-        raise self.retry(exc=e)
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return get_worker_loop().run_until_complete(coroutine)
+    # eager mode inside the api process, where Tortoise is already initialised.
+    # Celery sees the task finish as soon as it is scheduled, so its outcome
+    # and duration are recorded here once it is done.
+    name = name or coroutine.__qualname__
+    started = time.perf_counter()
+    task = running_loop.create_task(coroutine)
+    _pending.add(task)
+    task.add_done_callback(lambda task: _eager_done(task, name, started))
+    return task
 
 
-def chain_tasks(tasks: List[Callable], *args: Any) -> Any:
-    task_chain = chain(*tasks)
-    return task_chain(*args)
+def _eager_done(task: asyncio.Task, name: str, started: float):
+    _pending.discard(task)
+    error = None if task.cancelled() else task.exception()
+    if error is not None:
+        logger.error("task %s failed: %r", name, error, exc_info=error)
+    task_metrics.record(name, time.perf_counter() - started, failed=error is not None)
 
 
-def group_tasks(tasks: List[Callable], *args: Any) -> Any:
-    task_group = group(*tasks)
-    return task_group(*args)
+@on_shutdown
+async def finish_pending():
+    """Lets eager tasks still running in the api process (audit logs) finish."""
+    if _pending:
+        await asyncio.gather(*_pending, return_exceptions=True)
 
 
-def chord_tasks(tasks: List[Callable], header_tasks: List[Callable], *args: Any) -> Any:
-    task_chord = chord(header_tasks)(group(*tasks))
-    return task_chord(*args)
+def async_task(name: str, **options):
+    def decorator(func: Callable[..., Coroutine]):
+        @app.task(name=name, **options)
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return run_async(func(*args, **kwargs), name)
 
+        return wrapper
 
-@app.task
-def batch_task(data: List[int]) -> List[int]:
-    return [x * 2 for x in data]
+    return decorator
 
 
-def async_result_status(task_id: str) -> str:
-    result = app.AsyncResult(task_id)
-    if result.state == "PENDING":
-        return "Task is pending"
-    elif result.state == "STARTED":
-        return "Task has started"
-    elif result.state == "SUCCESS":
-        return f"Task succeeded with result: {result.result}"
-    elif result.state == "FAILURE":
-        return f"Task failed with error: {result.result}"
-    else:
-        return "Unknown status"
+@worker_process_shutdown.connect
+def close_worker_connections(**kwargs):
+    if _loop is not None:
+        _loop.run_until_complete(Tortoise.close_connections())
+        _loop.close()
 
 
-def apply_async_with_custom_retry(task: Callable, *args: Any, **kwargs: Any) -> Any:
-    return task.apply_async(args=args, kwargs=kwargs, countdown=10, max_retries=5)
+class TaskMetrics:
+    def __init__(self):
+        self.data: dict[str, dict[str, float]] = {}
+        self._started: dict[str, float] = {}
 
+    def start(self, task_id: str):
+        self._started[task_id] = time.perf_counter()
 
-@app.task
-def complex_task(x: int, y: int) -> int:
-    sleep(2)
-    return x + y
+    def finish(self, task_id: str, name: str, failed: bool = False):
+        started = self._started.pop(task_id, None)
+        duration = None if started is None else time.perf_counter() - started
+        self.record(name, duration, failed)
 
+    def discard(self, task_id: str):
+        self._started.pop(task_id, None)
 
-@app.task
-def task_with_dynamic_args(*args: Any) -> List[Any]:
-    return list(args)
+    def record(self, name: str, duration: float | None, failed: bool = False):
+        stats = self.data.setdefault(
+            name, {"count": 0, "failures": 0, "total": 0.0, "max": 0.0}
+        )
+        if failed:
+            stats["failures"] += 1
+        if duration is None:
+            return
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["max"] = max(stats["max"], duration)
+        logger.info("task %s finished in %.3fs", name, duration)
 
 
-def run_concurrent_tasks(tasks: List[Callable], *args: Any) -> List[Any]:
-    results = [task.apply_async(args=args) for task in tasks]
-    return [result.get() for result in results]
+task_metrics = TaskMetrics()
 
 
-def create_periodic_task(
-    schedule: str, task: Callable, *args: Any, **kwargs: Any
-) -> None:
-    app.conf.beat_schedule[task.name] = {
-        "task": task.name,
-        "schedule": schedule,
-        "args": args,
-        "kwargs": kwargs,
-    }
-    app.conf.timezone = "UTC"
+@task_prerun.connect
+def record_task_start(task_id=None, **kwargs):
+    task_metrics.start(task_id)
 
 
-def delay_task(task: Callable, *args: Any, **kwargs: Any) -> Any:
-    return task.delay(*args, **kwargs)
+@task_postrun.connect
+def record_task_finish(task_id=None, task=None, retval=None, state=None, **kwargs):
+    if isinstance(retval, asyncio.Task):
+        # an eager task still running on the api loop; `run_async` records it
+        task_metrics.discard(task_id)
+        return
+    task_metrics.finish(task_id, task.name, failed=state == "FAILURE")
 
 
-def revoke_task(task_id: str) -> bool:
-    task_result = app.AsyncResult(task_id)
-    if task_result.state == "PENDING":
-        task_result.revoke(terminate=True)
-        return True
-    return False
+@task_failure.connect
+def record_task_failure(task_id=None, sender=None, exception=None, **kwargs):
+    logger.error("task %s failed: %r", sender.name, exception)
 
 
-@app.task
-def example_periodic_task():
-    return "Periodic task executed!"
+def chain_tasks(tasks: List[Callable], *args: Any) -> Any:
+    return chain(*tasks).apply_async(args=args)
 
 
-def schedule_periodic_task(task: Callable, interval: int) -> None:
-    app.conf.beat_schedule[task.name] = {
-        "task": task.name,
-        "schedule": interval,
-    }
+def group_tasks(tasks: List[Callable], *args: Any) -> Any:
+    return group(*tasks).apply_async(args=args)
 
 
-def get_task_result(task_id: str) -> Any:
-    result = app.AsyncResult(task_id)
-    if result.ready():
-        return result.result
-    return "Task result is not ready yet"
+def chord_tasks(tasks: List[Callable], callback: Callable, *args: Any) -> Any:
+    return chord(group(*tasks))(callback, args=args)
 
 
-@app.task(bind=True)
-def fail_task(self) -> None:
-    raise Exception("This task fails")
+def delay_task(task: Callable, *args: Any, **kwargs: Any) -> Any:
+    return task.delay(*args, **kwargs)
 
 
-def check_task_failure(task_id: str) -> bool:
-    result = app.AsyncResult(task_id)
-    return result.failed()
+def delay_with_retry(task: Callable, *args: Any, **kwargs: Any) -> Any:
+    return task.apply_async(
+        args=args,
+        kwargs=kwargs,
+        retry=True,
+        retry_policy={"max_retries": 5},
+    )
 
 
-def chain_with_error_handling(tasks: List[Callable], *args: Any) -> Any:
-    try:
-        task_chain = chain(*tasks)
-        return task_chain(*args)
-    except Exception as e:
-        return f"Error during task chain execution: {str(e)}"
+def async_result_status(task_id: str) -> str:
+    return app.AsyncResult(task_id).state
 
 
-def delay_with_retry(task: Callable, *args: Any, **kwargs: Any) -> Any:
-    return task.apply_async(args=args, kwargs=kwargs, retry=True, max_retries=5)
+def get_task_result(task_id: str) -> Any:
+    result = app.AsyncResult(task_id)
+    if result.ready():
+        return result.result
+    return None
 
 
-def group_with_progress(tasks: List[Callable], *args: Any) -> Any:
-    task_group = group(*tasks)
-    result = task_group.apply_async(args=args)
-    return result.get()
+def revoke_task(task_id: str, terminate: bool = False) -> None:
+    app.control.revoke(task_id, terminate=terminate)
 
 
-def task_with_result_backend(task: Callable, *args: Any, **kwargs: Any) -> Any:
-    result = task.apply_async(args=args, kwargs=kwargs)
-    return result.get(timeout=10)
+def create_periodic_task(
+    schedule: Any, task: Callable, *args: Any, **kwargs: Any
+) -> None:
+    app.conf.beat_schedule[task.name] = {
+        "task": task.name,
+        "schedule": schedule,
+        "args": args,
+        "kwargs": kwargs,
+    }
 
 
-@app.task
-def task_with_logging(x: int) -> int:
-    return x * x
+__all__ = [
+    "app",
+    "async_task",
+    "run_async",
+    "task_metrics",
+    "chain_tasks",
+    "group_tasks",
+    "chord_tasks",
+    "delay_task",
+    "delay_with_retry",
+    "async_result_status",
+    "get_task_result",
+    "revoke_task",
+    "create_periodic_task",
+]
@@ -0,0 +1,91 @@
+import asyncio
+import io
+
+from celery.schedules import crontab
+
+from src.config.settings import (
+    DEFAULT_FROM_EMAIL,
+    SMTP_PASSWORD,
+    SMTP_PORT,
+    SMTP_SERVER,
+    SMTP_USERNAME,
+)
+from src.helper.celery import app, async_task, create_periodic_task
+from src.helper.logger.model import Log
+from src.helper.logger.partition import ensure_log_partitions
+from src.helper.logger.retention import compact_view_logs
+
+
+@app.task(name="mail.send_email")
+def send_email(
+    to_emails: str | list[str],
+    subject: str,
+    html_content: str,
+    from_email: str | None = None,
+):
+    from src.helper.mail import EmailClient
+
+    with EmailClient(
+        host=SMTP_SERVER,
+        port=SMTP_PORT,
+        username=SMTP_USERNAME,
+        password=SMTP_PASSWORD,
+    ) as client:
+        client.send(
+            to_emails=to_emails,
+            subject=subject,
+            html_content=html_content,
+            from_email=from_email or DEFAULT_FROM_EMAIL or None,
+        )
+
+
+@async_task("audit.write_log")
+async def write_log(data: dict):
+    await Log.create(**data)
+
+
+@async_task("audit.compact_logs")
+async def compact_logs():
+    await ensure_log_partitions()
+    await compact_view_logs()
+
+
+create_periodic_task(crontab(hour=3, minute=0), compact_logs)
+
+
+def _thumbnail(bucket: str, url: str, content_type: str, size: int):
+    from PIL import Image
+
+    from src.helper.minio.controller import minio_client
+
+    response = minio_client.get_object(bucket, url)
+    try:
+        image = Image.open(io.BytesIO(response.read()))
+    finally:
+        response.close()
+        response.release_conn()
+    image_format = image.format
+    image.thumbnail((size, size))
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    buffer.seek(0)
+    minio_client.put_object(
+        bucket,
+        f"thumbnails/{size}/{url}",
+        buffer,
+        length=buffer.getbuffer().nbytes,
+        content_type=content_type,
+    )
+
+
+@async_task("thumbnails.create_thumbnail")
+async def create_thumbnail(file_id: int, size: int = 256):
+    from src.helper.minio.model import File
+
+    file = await File.get(id=file_id)
+    if not file.content_type.startswith("image/"):
+        return
+    # minio and PIL block; off the loop, eager mode keeps serving requests
+    await asyncio.to_thread(
+        _thumbnail, file.bucket_name, file.url, file.content_type, size
+    )
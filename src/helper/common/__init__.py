@@ -1,18 +1,50 @@
-from .model import Action, Category, Comment, Language, React, Tag
+from .comment import (
+    check_comment_access,
+    comment_thread,
+    commentable,
+    react,
+    recount_reactions,
+    unreact,
+)
+from .model import (
+    Action,
+    Category,
+    CategoryClosure,
+    Comment,
+    CommentReaction,
+    Language,
+    React,
+    Tag,
+)
 from .scheme import (
     ActionCreateScheme,
     ActionResponseScheme,
     CategoryCreateScheme,
+    CategoryNodeScheme,
     CategoryResponseScheme,
+    CategoryTreeScheme,
+    CommentAuthorScheme,
     CommentCreateScheme,
     CommentResponseScheme,
+    CommentTagScheme,
+    CommentThreadScheme,
     LanguageCreateScheme,
     LanguageResponseScheme,
     ReactCreateScheme,
+    ReactionCountScheme,
     ReactResponseScheme,
     TagCreateScheme,
     TagResponseScheme,
 )
+from .tree import (
+    ancestors,
+    breadcrumb,
+    category_tree,
+    check_parents,
+    ensure_category_tree,
+    rebuild_closure,
+    subtree,
+)
 
 __all__ = [
     "Language",
@@ -20,7 +52,9 @@ __all__ = [
     "Action",
     "React",
     "Comment",
+    "CommentReaction",
     "Category",
+    "CategoryClosure",
     "LanguageCreateScheme",
     "LanguageResponseScheme",
     "TagCreateScheme",
@@ -31,6 +65,25 @@ __all__ = [
     "ReactResponseScheme",
     "CommentCreateScheme",
     "CommentResponseScheme",
+    "CommentAuthorScheme",
+    "CommentTagScheme",
+    "CommentThreadScheme",
+    "ReactionCountScheme",
     "CategoryCreateScheme",
     "CategoryResponseScheme",
+    "CategoryNodeScheme",
+    "CategoryTreeScheme",
+    "ancestors",
+    "breadcrumb",
+    "category_tree",
+    "check_parents",
+    "comment_thread",
+    "commentable",
+    "ensure_category_tree",
+    "check_comment_access",
+    "react",
+    "rebuild_closure",
+    "recount_reactions",
+    "subtree",
+    "unreact",
 ]
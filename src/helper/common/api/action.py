@@ -38,12 +38,13 @@ async def get_actions_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = Action.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        ActionResponseScheme, objects, apply=pagination
+        ActionResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
@@ -10,12 +10,27 @@ from src.helper import (
     Paginated,
     Paginator,
     Status,
+    cache_response,
     create_filter_schema,
     has_access,
+    invalidate_cache,
     log_action,
     login_required,
 )
-from src.helper.common import Category, CategoryCreateScheme, CategoryResponseScheme
+from src.helper.common import (
+    Category,
+    CategoryClosure,
+    CategoryCreateScheme,
+    CategoryNodeScheme,
+    CategoryResponseScheme,
+    CategoryTreeScheme,
+    ancestors,
+    breadcrumb,
+    category_tree,
+    check_parents,
+    rebuild_closure,
+    subtree,
+)
 from src.helper.user.model import User
 
 router = APIRouter()
@@ -25,11 +40,30 @@ CategoryFilterSchema = create_filter_schema(Category)
 MODEL_NAME: str = Category._meta.db_table
 
 
+def parent_links(object: CategoryCreateScheme) -> list:
+    if "parent" not in object.model_fields_set:
+        return []
+    return [("parent", object.parent, Category)]
+
+
+async def serialize(id: int) -> CategoryResponseScheme:
+    return await CategoryResponseScheme.from_tortoise_orm(
+        CategoryResponseScheme, await Category.get(id=id), m2m=[("parent", "parent")]
+    )
+
+
+def found(nodes: list[dict], id: int) -> list[dict]:
+    if not nodes:
+        raise HTTPException(status_code=404, detail=f"Category {id} not found")
+    return nodes
+
+
 @router.get(
     "/", response_model=Paginated[CategoryResponseScheme] | List[CategoryResponseScheme]
 )
 @log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_categorys_router(
     request: Request,
     page: int = Query(1, ge=1),
@@ -38,33 +72,81 @@ async def get_categorys_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = Category.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        CategoryResponseScheme, objects, apply=pagination
+        CategoryResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
 @router.post("/", response_model=CategoryResponseScheme)
 @log_action(action=ActionEnum.CREATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def create_category_router(
     object: CategoryCreateScheme,
     user: User = Depends(login_required),
 ):
-    return await object.create(
-        Category,
-        serialize=True,
-        serializer=CategoryResponseScheme,
-        m2m=[],
-    )
+    category = await object.create(Category, m2m=parent_links(object))
+    await rebuild_closure(category.id)
+    return await serialize(category.id)
+
+
+@router.get("/tree", response_model=List[CategoryTreeScheme])
+@log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
+async def get_category_tree_router(
+    request: Request,
+    user: User = Depends(login_required),
+):
+    return await category_tree()
+
+
+@router.get("/{id}/subtree", response_model=List[CategoryNodeScheme])
+@log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
+async def get_category_subtree_router(
+    id: int,
+    request: Request,
+    max_depth: int | None = Query(None, ge=0),
+    user: User = Depends(login_required),
+):
+    return found(await subtree(id, max_depth), id)
+
+
+@router.get("/{id}/ancestors", response_model=List[CategoryNodeScheme])
+@log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
+async def get_category_ancestors_router(
+    id: int,
+    request: Request,
+    user: User = Depends(login_required),
+):
+    return found(await ancestors(id), id)
+
+
+@router.get("/{id}/breadcrumb", response_model=List[CategoryNodeScheme])
+@log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
+async def get_category_breadcrumb_router(
+    id: int,
+    request: Request,
+    user: User = Depends(login_required),
+):
+    return found(await breadcrumb(id), id)
 
 
 @router.get("/{id}", response_model=CategoryResponseScheme)
 @log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_category_router(
     id: str,
     request: Request,
@@ -80,26 +162,33 @@ async def get_category_router(
 @router.put("/{id}", response_model=CategoryResponseScheme)
 @log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.UPDATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def update_category_router(
     id: int,
     object: CategoryCreateScheme,
     user: User = Depends(login_required),
 ):
     objects = Category.all()
-    return await object.update(
-        await objects.get(id=id),
-        serialize=True,
-        serializer=CategoryResponseScheme,
-        m2m=[],
-    )
+    m2m = parent_links(object)
+    if m2m:
+        await check_parents(id, object.parent or [])
+    await object.update(await objects.get(id=id), m2m=m2m)
+    if m2m:
+        await rebuild_closure(id)
+    return await serialize(id)
 
 
 @router.delete("/{id}", response_model=Status)
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def delete_category_router(id: int, user: User = Depends(login_required)):
     objects = Category.filter().all()
+    children = await CategoryClosure.filter(ancestor_id=id, depth=1).values_list(
+        "descendant_id", flat=True
+    )
     deleted_count = await objects.filter(id=id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"Category {id} not found")
+    await rebuild_closure(*children)
     return Status(message=f"Deleted category {id}")
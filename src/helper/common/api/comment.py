@@ -15,7 +15,16 @@ from src.helper import (
     log_action,
     login_required,
 )
-from src.helper.common import Comment, CommentCreateScheme, CommentResponseScheme
+from src.helper.common import (
+    Comment,
+    CommentCreateScheme,
+    CommentResponseScheme,
+    CommentThreadScheme,
+    check_comment_access,
+    comment_thread,
+    react,
+    unreact,
+)
 from src.helper.user.model import User
 
 router = APIRouter()
@@ -38,15 +47,30 @@ async def get_comments_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = Comment.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        CommentResponseScheme, objects, apply=pagination
+        CommentResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
+@router.get("/for/{kind}/{object_id}", response_model=Paginated[CommentThreadScheme])
+@log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+async def get_object_comments_router(
+    kind: str,
+    object_id: int,
+    request: Request,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, le=100),
+    user: User = Depends(login_required),
+):
+    return await comment_thread(kind, object_id, user, page, limit)
+
+
 @router.post("/", response_model=CommentResponseScheme)
 @log_action(action=ActionEnum.CREATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
@@ -103,3 +127,29 @@ async def delete_comment_router(id: int, user: User = Depends(login_required)):
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"Comment {id} not found")
     return Status(message=f"Deleted comment {id}")
+
+
+@router.post("/{id}/react/{react_id}", response_model=Status)
+@log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+async def react_comment_router(
+    id: int, react_id: int, user: User = Depends(login_required)
+):
+    await check_comment_access(user, id)
+    if not await react(id, react_id, user.id):
+        return Status(message=f"Comment {id} already has react {react_id}")
+    return Status(message=f"Reacted {react_id} to comment {id}")
+
+
+@router.delete("/{id}/react/{react_id}", response_model=Status)
+@log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+async def unreact_comment_router(
+    id: int, react_id: int, user: User = Depends(login_required)
+):
+    await check_comment_access(user, id)
+    if not await unreact(id, react_id, user.id):
+        raise HTTPException(
+            status_code=404, detail=f"React {react_id} on comment {id} not found"
+        )
+    return Status(message=f"Removed react {react_id} from comment {id}")
@@ -10,8 +10,10 @@ from src.helper import (
     Paginated,
     Paginator,
     Status,
+    cache_response,
     create_filter_schema,
     has_access,
+    invalidate_cache,
     log_action,
     login_required,
 )
@@ -30,6 +32,7 @@ MODEL_NAME: str = Language._meta.db_table
 )
 @log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_languages_router(
     request: Request,
     page: int = Query(1, ge=1),
@@ -38,18 +41,20 @@ async def get_languages_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = Language.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        LanguageResponseScheme, objects, apply=pagination
+        LanguageResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
 @router.post("/", response_model=LanguageResponseScheme)
 @log_action(action=ActionEnum.CREATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def create_language_router(
     object: LanguageCreateScheme,
     user: User = Depends(login_required),
@@ -65,6 +70,7 @@ async def create_language_router(
 @router.get("/{id}", response_model=LanguageResponseScheme)
 @log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_language_router(
     id: str,
     request: Request,
@@ -80,6 +86,7 @@ async def get_language_router(
 @router.put("/{id}", response_model=LanguageResponseScheme)
 @log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.UPDATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def update_language_router(
     id: int,
     object: LanguageCreateScheme,
@@ -97,6 +104,7 @@ async def update_language_router(
 @router.delete("/{id}", response_model=Status)
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def delete_language_router(id: int, user: User = Depends(login_required)):
     objects = Language.filter().all()
     deleted_count = await objects.filter(id=id).delete()
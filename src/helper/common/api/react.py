@@ -15,7 +15,13 @@ from src.helper import (
     log_action,
     login_required,
 )
-from src.helper.common import React, ReactCreateScheme, ReactResponseScheme
+from src.helper.common import (
+    CommentReaction,
+    React,
+    ReactCreateScheme,
+    ReactResponseScheme,
+    recount_reactions,
+)
 from src.helper.user.model import User
 
 router = APIRouter()
@@ -38,12 +44,13 @@ async def get_reacts_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = React.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        ReactResponseScheme, objects, apply=pagination
+        ReactResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
@@ -99,7 +106,12 @@ async def update_react_router(
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
 async def delete_react_router(id: int, user: User = Depends(login_required)):
     objects = React.filter().all()
+    comment_ids = await CommentReaction.filter(react_id=id).values_list(
+        "comment_id", flat=True
+    )
     deleted_count = await objects.filter(id=id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"React {id} not found")
+    if comment_ids:
+        await recount_reactions(*set(comment_ids))
     return Status(message=f"Deleted react {id}")
@@ -10,8 +10,10 @@ from src.helper import (
     Paginated,
     Paginator,
     Status,
+    cache_response,
     create_filter_schema,
     has_access,
+    invalidate_cache,
     log_action,
     login_required,
 )
@@ -28,6 +30,7 @@ MODEL_NAME: str = Tag._meta.db_table
 @router.get("/", response_model=Paginated[TagResponseScheme] | List[TagResponseScheme])
 @log_action(action=ActionEnum.VIEW_ALL.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_tags_router(
     request: Request,
     page: int = Query(1, ge=1),
@@ -36,18 +39,20 @@ async def get_tags_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     objects = Tag.all()
     sort = OrderBy.create(objects, sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        TagResponseScheme, objects, apply=pagination
+        TagResponseScheme, objects, apply=pagination, fields=fields
     )
 
 
 @router.post("/", response_model=TagResponseScheme)
 @log_action(action=ActionEnum.CREATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def create_tag_router(
     object: TagCreateScheme,
     user: User = Depends(login_required),
@@ -63,6 +68,7 @@ async def create_tag_router(
 @router.get("/{id}", response_model=TagResponseScheme)
 @log_action(action=ActionEnum.VIEW.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_tag_router(
     id: str,
     request: Request,
@@ -78,6 +84,7 @@ async def get_tag_router(
 @router.put("/{id}", response_model=TagResponseScheme)
 @log_action(action=ActionEnum.UPDATE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.UPDATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def update_tag_router(
     id: int,
     object: TagCreateScheme,
@@ -95,6 +102,7 @@ async def update_tag_router(
 @router.delete("/{id}", response_model=Status)
 @log_action(action=ActionEnum.DELETE.value, model=MODEL_NAME)
 @has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def delete_tag_router(id: int, user: User = Depends(login_required)):
     objects = Tag.filter().all()
     deleted_count = await objects.filter(id=id).delete()
@@ -0,0 +1,184 @@
+"""
+Comment threads of the objects that hold comments through a `comment` m2m
+(`Category`, and whatever else registers with `commentable`). A page of a
+thread costs a fixed number of queries whatever its size: the count, the
+comments joined to their authors, their tags, and one GROUP BY for the
+reaction counts.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException
+from tortoise import Model
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F, Q
+from tortoise.functions import Count
+from tortoise.transactions import in_transaction
+
+from src.helper.paginate import Paginator
+from src.helper.utils import call
+
+from .model import Category, Comment, CommentReaction, React
+
+
+@dataclass
+class Commentable:
+    model: type[Model]
+    related_name: str
+    check: Callable[[Any, int], Awaitable[None]] | None = None
+
+
+targets: dict[str, Commentable] = {}
+
+
+def commentable(
+    model: type[Model],
+    kind: str,
+    check: Callable[[Any, int], Awaitable[None]] | None = None,
+) -> Commentable:
+    """
+    Serves the comments of `model` rows under `kind`. `check(user, id)` may
+    raise to refuse a user the thread of a row.
+    """
+    field = model._meta.fields_map["comment"]
+    targets[kind] = Commentable(model, field.related_name, check)
+    return targets[kind]
+
+
+async def reaction_counts(comment_ids: list[int], user_id: int) -> dict[int, list]:
+    """Per comment, how many users gave each react and whether `user_id` did."""
+    rows = (
+        await CommentReaction.filter(comment_id__in=comment_ids)
+        .annotate(count=Count("id"), mine=Count("id", _filter=Q(user_id=user_id)))
+        .group_by("comment_id", "react_id", "react__name")
+        .order_by("comment_id", "-count", "react_id")
+        .values("comment_id", "react_id", "react__name", "count", "mine")
+    )
+    counts: dict[int, list] = {comment_id: [] for comment_id in comment_ids}
+    for row in rows:
+        counts[row["comment_id"]].append(
+            {
+                "react_id": row["react_id"],
+                "name": row["react__name"],
+                "count": row["count"],
+                "mine": bool(row["mine"]),
+            }
+        )
+    return counts
+
+
+async def comment_thread(kind: str, object_id: int, user, page: int, limit: int):
+    """One page of the comments on `kind` `object_id`, oldest first."""
+    target = targets.get(kind)
+    if not target:
+        raise HTTPException(status_code=404, detail=f"Unknown comment target {kind}")
+    if target.check:
+        await call(target.check, user, object_id)
+    if not await target.model.exists(id=object_id):
+        raise HTTPException(status_code=404, detail=f"{kind} {object_id} not found")
+    comments = Comment.filter(**{target.related_name: object_id}).order_by(
+        "created_at", "id"
+    )
+    paginator = await Paginator(limit=limit, page=page).paginate(comments)
+    rows = await paginator.paginated_result.select_related("user").prefetch_related(
+        "tag"
+    )
+    counts = await reaction_counts([comment.id for comment in rows], user.id)
+    return await paginator.get_paginated_response(
+        [
+            {
+                "id": comment.id,
+                "text": comment.text,
+                "vote": comment.vote,
+                "created_at": comment.created_at,
+                "updated_at": comment.updated_at,
+                "author": {
+                    "id": comment.user.id,
+                    "username": comment.user.username,
+                    "name": comment.user.name,
+                },
+                "tags": [{"id": tag.id, "name": tag.name} for tag in comment.tag],
+                "reaction_count": comment.reaction_count,
+                "reactions": counts[comment.id],
+            }
+            for comment in rows
+        ]
+    )
+
+
+async def check_comment_access(user, comment_id: int):
+    """Raises unless `user` passes the check of every row the comment is on."""
+    for target in targets.values():
+        if not target.check:
+            continue
+        object_ids = await target.model.filter(comment__id=comment_id).values_list(
+            "id", flat=True
+        )
+        for object_id in object_ids:
+            await call(target.check, user, object_id)
+
+
+async def react(comment_id: int, react_id: int, user_id: int) -> bool:
+    """
+    Adds `user_id`'s `react_id` to the comment. Returns False if it was
+    already there.
+    """
+    if not await Comment.exists(id=comment_id):
+        raise HTTPException(status_code=404, detail=f"Comment {comment_id} not found")
+    if not await React.exists(id=react_id):
+        raise HTTPException(status_code=404, detail=f"React {react_id} not found")
+    try:
+        async with in_transaction("default") as connection:
+            await CommentReaction.create(
+                comment_id=comment_id,
+                react_id=react_id,
+                user_id=user_id,
+                using_db=connection,
+            )
+            # an UPDATE ... SET reaction_count = reaction_count + 1, so
+            # concurrent reactions are never lost
+            await Comment.filter(id=comment_id).using_db(connection).update(
+                reaction_count=F("reaction_count") + 1
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+async def unreact(comment_id: int, react_id: int, user_id: int) -> bool:
+    """Removes `user_id`'s `react_id` from the comment, if it was there."""
+    async with in_transaction("default") as connection:
+        deleted = (
+            await CommentReaction.filter(
+                comment_id=comment_id, react_id=react_id, user_id=user_id
+            )
+            .using_db(connection)
+            .delete()
+        )
+        if deleted:
+            await Comment.filter(id=comment_id).using_db(connection).update(
+                reaction_count=F("reaction_count") - deleted
+            )
+    return bool(deleted)
+
+
+async def recount_reactions(*comment_ids: int):
+    """
+    Resets `reaction_count` from the reaction rows, for every comment when
+    none are given. Needed after reactions are removed in bulk, e.g. when a
+    `React` is deleted.
+    """
+    comment = Comment._meta.db_table
+    reaction = CommentReaction._meta.db_table
+    query = (
+        f'UPDATE "{comment}" SET "reaction_count" = (SELECT COUNT(*) FROM '
+        f'"{reaction}" WHERE "{reaction}"."comment_id" = "{comment}"."id")'
+    )
+    if comment_ids:
+        query += f' WHERE "id" IN ({", ".join(str(int(id)) for id in comment_ids)})'
+    async with in_transaction("default") as connection:
+        await connection.execute_script(query)
+
+
+commentable(Category, "category")
@@ -1,6 +1,7 @@
-from tortoise import fields
+from tortoise import fields, models
 
 from src.base import BaseModel
+from src.helper.db import trigram_index
 
 
 class Language(BaseModel):
@@ -50,12 +51,14 @@ class React(BaseModel):
         table = "react"
 
 
+@trigram_index("text")
 class Comment(BaseModel):
     text = fields.TextField()
     user = fields.ForeignKeyField("models.User", related_name="comment")
-    react = fields.ManyToManyField("models.React", related_name="comment")
     tag = fields.ManyToManyField("models.Tag", related_name="comment")
     vote = fields.IntField(null=True)
+    # number of `CommentReaction` rows, kept in step by `comment.react`
+    reaction_count = fields.IntField(default=0)
 
     def __str__(self):
         return f"Comment {self.id} by User {self.user_id}"
@@ -64,6 +67,27 @@ class Comment(BaseModel):
         table = "comment"
 
 
+class CommentReaction(models.Model):
+    """One user's `React` on a comment."""
+
+    id = fields.IntField(primary_key=True)
+    comment = fields.ForeignKeyField(
+        "models.Comment", related_name="reactions", on_delete=fields.CASCADE
+    )
+    react = fields.ForeignKeyField(
+        "models.React", related_name="comment_reactions", on_delete=fields.CASCADE
+    )
+    user = fields.ForeignKeyField(
+        "models.User", related_name="comment_reactions", on_delete=fields.CASCADE
+    )
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "comment_reaction"
+        unique_together = (("comment_id", "react_id", "user_id"),)
+
+
+@trigram_index("name", "description")
 class Category(BaseModel):
     name = fields.CharField(max_length=128, unique=True)
     user = fields.ForeignKeyField("models.User", related_name="category")
@@ -72,9 +96,35 @@ class Category(BaseModel):
     parent = fields.ManyToManyField("models.Category", related_name="child")
     comment = fields.ManyToManyField("models.Comment", related_name="category")
     description = fields.TextField(null=True)
+    # ids from the root down to this category along the lowest-id parents,
+    # "1/5/9"; maintained by `tree.rebuild_closure`
+    path = fields.CharField(max_length=1024, default="")
 
     def __str__(self):
         return self.name
 
     class Meta:
         table = "category"
+
+
+class CategoryClosure(models.Model):
+    """
+    Every (ancestor, descendant) pair of the category graph, itself included
+    at depth 0, with the shortest distance between them. `primary` marks the
+    ancestors on the descendant's `path`.
+    """
+
+    id = fields.IntField(primary_key=True)
+    ancestor = fields.ForeignKeyField(
+        "models.Category", related_name="descendant_links", on_delete=fields.CASCADE
+    )
+    descendant = fields.ForeignKeyField(
+        "models.Category", related_name="ancestor_links", on_delete=fields.CASCADE
+    )
+    depth = fields.IntField()
+    primary = fields.BooleanField(default=False)
+
+    class Meta:
+        table = "category_closure"
+        unique_together = (("ancestor_id", "descendant_id"),)
+        indexes = (("descendant_id", "depth"),)
@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
 from src.base.scheme import BaseCreateScheme, BaseResponseScheme
 
 
@@ -40,12 +44,42 @@ class ReactResponseScheme(ReactCreateScheme, BaseResponseScheme): ...
 class CommentCreateScheme(BaseCreateScheme):
     text: str
     user_id: int
-    react: list[int] | None = None
     tag: list[int] | None = None
     vote: int | None = None
 
 
-class CommentResponseScheme(CommentCreateScheme, BaseResponseScheme): ...
+class CommentResponseScheme(CommentCreateScheme, BaseResponseScheme):
+    reaction_count: int = 0
+
+
+class CommentAuthorScheme(BaseModel):
+    id: int
+    username: str
+    name: str | None = None
+
+
+class CommentTagScheme(BaseModel):
+    id: int
+    name: str
+
+
+class ReactionCountScheme(BaseModel):
+    react_id: int
+    name: str
+    count: int
+    mine: bool = False
+
+
+class CommentThreadScheme(BaseModel):
+    id: int
+    text: str
+    vote: int | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    author: CommentAuthorScheme
+    tags: list[CommentTagScheme] = []
+    reaction_count: int = 0
+    reactions: list[ReactionCountScheme] = []
 
 
 class CategoryCreateScheme(BaseCreateScheme):
@@ -58,4 +92,19 @@ class CategoryCreateScheme(BaseCreateScheme):
     description: str | None = None
 
 
-class CategoryResponseScheme(CategoryCreateScheme, BaseResponseScheme): ...
+class CategoryResponseScheme(CategoryCreateScheme, BaseResponseScheme):
+    path: str = ""
+
+
+class CategoryNodeScheme(BaseModel):
+    id: int
+    name: str
+    description: str | None = None
+    path: str
+    depth: int
+
+
+class CategoryTreeScheme(BaseModel):
+    id: int
+    name: str
+    children: list["CategoryTreeScheme"] = []
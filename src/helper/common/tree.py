@@ -0,0 +1,168 @@
+"""
+The category graph (`Category.parent` allows several parents) kept as a
+closure table, so subtree, ancestor and breadcrumb reads are one query each.
+Writes that change parent links call `rebuild_closure` for the categories
+whose ancestry changed.
+"""
+
+from collections import defaultdict
+
+from fastapi import HTTPException
+from tortoise.transactions import in_transaction
+
+from .model import Category, CategoryClosure
+
+NODE_FIELDS = ("id", "name", "description", "path")
+
+
+async def _graph(connection) -> tuple[dict[int, list[int]], dict[int, str]]:
+    # read from the link table directly; joining the self-referencing m2m
+    # through the ORM yields ambiguous column names
+    field = Category._meta.fields_map["parent"]
+    paths = dict(await Category.all().using_db(connection).values_list("id", "path"))
+    parents: dict[int, list[int]] = {category_id: [] for category_id in paths}
+    _, links = await connection.execute_query(
+        f'SELECT "{field.backward_key}", "{field.forward_key}" FROM "{field.through}"'
+    )
+    for child, parent in links:
+        parents[child].append(parent)
+    return parents, paths
+
+
+def _ancestors(node: int, parents: dict[int, list[int]]) -> dict[int, int]:
+    depths, level, depth = {node: 0}, [node], 0
+    while level:
+        depth += 1
+        level = [
+            parent
+            for child in level
+            for parent in parents.get(child, [])
+            if parent not in depths
+        ]
+        for parent in level:
+            depths.setdefault(parent, depth)
+    return depths
+
+
+def _primary_path(node: int, parents: dict[int, list[int]]) -> list[int]:
+    path = [node]
+    while parents.get(path[-1]):
+        parent = min(parents[path[-1]])
+        if parent in path:
+            break
+        path.append(parent)
+    return path[::-1]
+
+
+def _closure(
+    parents: dict[int, list[int]], paths: dict[int, str], category_ids: tuple[int]
+) -> tuple[list[CategoryClosure], list[Category]]:
+    if category_ids:
+        children = defaultdict(list)
+        for child, links in parents.items():
+            for parent in links:
+                children[parent].append(child)
+        affected: set[int] = set()
+        pending = [node for node in category_ids if node in parents]
+        while pending:
+            node = pending.pop()
+            if node not in affected:
+                affected.add(node)
+                pending.extend(children[node])
+    else:
+        affected = set(parents)
+    rows, moved = [], []
+    for node in affected:
+        path = _primary_path(node, parents)
+        rows.extend(
+            CategoryClosure(
+                ancestor_id=ancestor,
+                descendant_id=node,
+                depth=depth,
+                primary=ancestor in path,
+            )
+            for ancestor, depth in _ancestors(node, parents).items()
+        )
+        path = "/".join(map(str, path))
+        if paths[node] != path:
+            moved.append(Category(id=node, path=path))
+    return rows, moved
+
+
+async def rebuild_closure(*category_ids: int):
+    """
+    Recomputes the closure rows and paths of `category_ids` and everything
+    below them, or of every category when none are given.
+    """
+    async with in_transaction("default") as connection:
+        parents, paths = await _graph(connection)
+        rows, moved = _closure(parents, paths, category_ids)
+        await CategoryClosure.filter(
+            descendant_id__in=list({row.descendant_id for row in rows})
+        ).using_db(connection).delete()
+        await CategoryClosure.bulk_create(rows, batch_size=1000, using_db=connection)
+        if moved:
+            await Category.bulk_update(
+                moved, fields=["path"], batch_size=1000, using_db=connection
+            )
+
+
+async def ensure_category_tree():
+    """Builds the closure table for categories that predate it."""
+    if await Category.exists() and not await CategoryClosure.exists():
+        await rebuild_closure()
+
+
+async def check_parents(category_id: int, parent_ids: list[int]):
+    if await CategoryClosure.filter(
+        ancestor_id=category_id, descendant_id__in=parent_ids
+    ).exists():
+        raise HTTPException(
+            status_code=400, detail="A category cannot be its own ancestor"
+        )
+
+
+async def _nodes(query, side: str) -> list[dict]:
+    rows = await query.values("depth", *(f"{side}__{field}" for field in NODE_FIELDS))
+    return [
+        {
+            "depth": row["depth"],
+            **{field: row[f"{side}__{field}"] for field in NODE_FIELDS},
+        }
+        for row in rows
+    ]
+
+
+async def subtree(category_id: int, max_depth: int | None = None) -> list[dict]:
+    """The category and its descendants, nearest first."""
+    query = CategoryClosure.filter(ancestor_id=category_id)
+    if max_depth is not None:
+        query = query.filter(depth__lte=max_depth)
+    return await _nodes(query.order_by("depth", "descendant__name"), "descendant")
+
+
+async def ancestors(category_id: int) -> list[dict]:
+    """Every ancestor through any parent, root first, ending with the category."""
+    query = CategoryClosure.filter(descendant_id=category_id)
+    return await _nodes(query.order_by("-depth", "ancestor__name"), "ancestor")
+
+
+async def breadcrumb(category_id: int) -> list[dict]:
+    """The categories along `path`, root first."""
+    query = CategoryClosure.filter(descendant_id=category_id, primary=True)
+    return await _nodes(query.order_by("-depth"), "ancestor")
+
+
+async def category_tree() -> list[dict]:
+    """Every category nested under the parent before it on its `path`."""
+    rows = await Category.all().order_by("name").values("id", "name", "path")
+    nodes = {
+        row["id"]: {"id": row["id"], "name": row["name"], "children": []}
+        for row in rows
+    }
+    roots = []
+    for row in rows:
+        path = row["path"].split("/")
+        parent = nodes.get(int(path[-2])) if len(path) > 1 else None
+        (parent["children"] if parent else roots).append(nodes[row["id"]])
+    return roots
@@ -0,0 +1,41 @@
+from .connection import advisory_lock, install_statement_timeout, statement_timeout
+from .indexes import (
+    btree_fields,
+    check_sort,
+    ensure_trigram_indexes,
+    is_indexed,
+    trigram_fields,
+    trigram_index,
+    unindexed_lookups,
+)
+from .routing import (
+    ReadReplicaMiddleware,
+    RecentWrites,
+    ReplicaRouter,
+    read_replica,
+    recent_writes,
+    replicate_sqlite,
+    route_user,
+    untracked_writes,
+)
+
+__all__ = [
+    "ReadReplicaMiddleware",
+    "RecentWrites",
+    "ReplicaRouter",
+    "read_replica",
+    "recent_writes",
+    "replicate_sqlite",
+    "route_user",
+    "statement_timeout",
+    "advisory_lock",
+    "install_statement_timeout",
+    "untracked_writes",
+    "btree_fields",
+    "check_sort",
+    "ensure_trigram_indexes",
+    "is_indexed",
+    "trigram_fields",
+    "trigram_index",
+    "unindexed_lookups",
+]
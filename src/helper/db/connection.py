@@ -0,0 +1,88 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from tortoise import Tortoise, connections
+
+QUERY_CANCELED = "57014"
+
+_timeout: ContextVar[int | None] = ContextVar("statement_timeout", default=None)
+
+
+@asynccontextmanager
+async def advisory_lock(name: str, connection_name: str = "default"):
+    """
+    Holds a postgres advisory lock on `name` for the block, so processes
+    starting together (the workers of `python -m src`) run it one after the
+    other. Other backends run it as is.
+    """
+    connection = Tortoise.get_connection(connection_name)
+    if connection.capabilities.dialect != "postgres":
+        yield
+        return
+    # a session lock, held on a connection of its own while the block uses
+    # the pool
+    async with connection.acquire_connection() as conn:
+        await conn.execute("SELECT pg_advisory_lock(hashtext($1))", name)
+        try:
+            yield
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", name)
+
+
+async def _apply_timeout(connection):
+    # asyncpg runs this on every pool checkout, in the caller's context; the
+    # pool's RESET ALL on release restores DB_STATEMENT_TIMEOUT
+    milliseconds = _timeout.get()
+    if milliseconds is not None:
+        await connection.execute(f"SET statement_timeout = {int(milliseconds)}")
+
+
+def install_statement_timeout():
+    """
+    Hooks `statement_timeout` into the pool of every postgres connection,
+    primary and replica. Call after `Tortoise.init`, before the pools open.
+    """
+    for connection in connections.all():
+        if connection.capabilities.dialect == "postgres":
+            connection.extra["setup"] = _apply_timeout
+
+
+async def _stream(milliseconds: int, body):
+    # runs after the router has returned, in the response's own task, so the
+    # override set here ends with the download
+    _timeout.set(milliseconds)
+    async for chunk in body:
+        yield chunk
+
+
+def statement_timeout(milliseconds: int):
+    """
+    Overrides `DB_STATEMENT_TIMEOUT` for the queries of the wrapped router on
+    postgres, on whichever connection each one is routed to, without
+    pinning them into a transaction. A cancelled statement answers 503. A
+    streamed response body is read under the same timeout, but can only be
+    cut short by then.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = _timeout.set(milliseconds)
+            try:
+                response = await func(*args, **kwargs)
+            except Exception as error:
+                if getattr(error, "sqlstate", None) != QUERY_CANCELED:
+                    raise
+                raise HTTPException(status_code=503, detail="Query timed out")
+            finally:
+                _timeout.reset(token)
+            if isinstance(response, StreamingResponse):
+                response.body_iterator = _stream(milliseconds, response.body_iterator)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,103 @@
+import logging
+from typing import Iterable
+
+from fastapi import HTTPException
+from tortoise import Model, Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from src.config.settings import INDEX_CHECK
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_OPERATIONS = {"contains", "icontains"}
+
+_trigram: dict[type[Model], tuple[str, ...]] = {}
+_warned: set[tuple[str, str]] = set()
+
+
+def trigram_index(*fields: str):
+    """
+    Declares trigram (pg_trgm GIN) indexes on `fields` so `contains` and
+    `icontains` filters on them can use an index on postgres.
+    """
+
+    def decorator(model: type[Model]) -> type[Model]:
+        _trigram[model] = fields
+        return model
+
+    return decorator
+
+
+def trigram_fields(model: type[Model]) -> tuple[str, ...]:
+    return _trigram.get(model, ())
+
+
+def btree_fields(model: type[Model]) -> set[str]:
+    """Columns that lead some b-tree index of `model`."""
+    meta = model._meta
+    columns = {meta.pk_attr}
+    for name, field in meta.fields_map.items():
+        if field.unique or field.index:
+            columns.add(field.source_field or name)
+    for index in (*meta.unique_together, *meta.indexes):
+        fields = index if isinstance(index, (tuple, list)) else index.fields
+        if fields:
+            columns.add(fields[0])
+    return columns
+
+
+def is_indexed(model: type[Model], field: str, operation: str | None = None) -> bool:
+    if operation in TRIGRAM_OPERATIONS:
+        return field in trigram_fields(model)
+    return field in btree_fields(model) or (
+        operation == "startswith" and field in trigram_fields(model)
+    )
+
+
+def unindexed_lookups(model: type[Model], lookups: Iterable[str]) -> list[str]:
+    """
+    Returns the `field__operation` lookups no index of `model` can serve.
+    Many-to-many lookups go through the join table and are not checked.
+    """
+    meta = model._meta
+    result = []
+    for lookup in lookups:
+        field, _, operation = lookup.partition("__")
+        if field in meta.m2m_fields or field.removesuffix("_id") in meta.m2m_fields:
+            continue
+        if field in meta.fk_fields or field in meta.o2o_fields:
+            field = f"{field}_id"
+        if not is_indexed(model, field, operation or None):
+            result.append(lookup)
+    return result
+
+
+def check_sort(model: type[Model], field: str):
+    """Warns about or rejects (per INDEX_CHECK) sorting on an unindexed column."""
+    if INDEX_CHECK == "off" or "__" in field or is_indexed(model, field):
+        return
+    if INDEX_CHECK == "reject":
+        raise HTTPException(
+            status_code=400, detail=f"Sorting on unindexed field: {field}"
+        )
+    if (model.__name__, field) not in _warned:
+        _warned.add((model.__name__, field))
+        logger.warning("%s sorted on unindexed field %s", model.__name__, field)
+
+
+async def ensure_trigram_indexes(connection: BaseDBAsyncClient | None = None):
+    connection = connection or Tortoise.get_connection("default")
+    if connection.capabilities.dialect != "postgres" or not _trigram:
+        return
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm;"]
+    for model, fields in _trigram.items():
+        table = model._meta.db_table
+        for field in fields:
+            column = f'CAST("{field}" AS VARCHAR)'
+            # matches the expressions tortoise emits for contains/icontains
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{table}_{field}_trgm_idx" '
+                f'ON "{table}" USING GIN (({column}) gin_trgm_ops, '
+                f"(UPPER({column})) gin_trgm_ops);"
+            )
+    await connection.execute_script("\n".join(statements))
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from tortoise import Model, connections
+from tortoise.backends.base.client import TransactionalDBClient
+from tortoise.backends.base.config_generator import expand_db_url
+
+from src.config.settings import DB_READ_URL, DB_RECENT_WRITE_TTL, USE_REDIS
+
+if USE_REDIS:
+    from src.helper.redis import async_redis
+
+logger = logging.getLogger(__name__)
+
+_untracked: set[type[Model]] = set()
+
+
+@dataclass
+class Routing:
+    read_only: bool = False
+    # pinned to the primary after a write, so the caller reads it back
+    primary: bool = False
+    wrote: bool = False
+    user_id: int | None = None
+
+
+_routing: ContextVar[Routing | None] = ContextVar("db_routing", default=None)
+
+
+def untracked_writes(model: type[Model]) -> type[Model]:
+    """Writes to `model` (audit rows and the like) do not pin reads to the primary."""
+    _untracked.add(model)
+    return model
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the `replica` connection inside `read_replica`, unless the
+    current request or user wrote recently or the read runs in a transaction.
+    Writes always go to `default`.
+    """
+
+    def db_for_read(self, model: type[Model]) -> str | None:
+        routing = _routing.get()
+        if not routing or not routing.read_only or routing.primary:
+            return None
+        if isinstance(connections.get("default"), TransactionalDBClient):
+            return None
+        return "replica"
+
+    def db_for_write(self, model: type[Model]) -> str | None:
+        routing = _routing.get()
+        if routing and model not in _untracked:
+            routing.primary = routing.wrote = True
+        return None
+
+
+@contextmanager
+def read_replica(enabled: bool = True):
+    routing = _routing.get()
+    if routing is None:
+        token = _routing.set(Routing(read_only=enabled))
+        try:
+            yield
+        finally:
+            _routing.reset(token)
+        return
+    previous, routing.read_only = routing.read_only, enabled
+    try:
+        yield
+    finally:
+        routing.read_only = previous
+
+
+class RecentWrites:
+    """
+    Users who wrote within the last `ttl` seconds, roughly the replica lag.
+    Their reads stay on the primary so they see their own changes. Kept in
+    redis, or process memory when redis is disabled.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        ttl: float = DB_RECENT_WRITE_TTL,
+        prefix: str = "db:recent_write",
+        max_entries: int = 100_000,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self._writes: dict[int, float] = {}
+
+    async def mark(self, user_id: int):
+        if self.redis:
+            await self.redis.set(f"{self.prefix}:{user_id}", 1, px=int(self.ttl * 1000))
+            return
+        now = time.monotonic()
+        if len(self._writes) >= self.max_entries:
+            self._writes = {k: v for k, v in self._writes.items() if v > now}
+        self._writes[user_id] = now + self.ttl
+
+    async def check(self, user_id: int) -> bool:
+        if self.redis:
+            return bool(await self.redis.exists(f"{self.prefix}:{user_id}"))
+        return self._writes.get(user_id, 0) > time.monotonic()
+
+
+recent_writes = RecentWrites(async_redis if USE_REDIS else None)
+
+
+async def route_user(user_id: int):
+    """Ties the current request to `user_id`, pinning it if they wrote recently."""
+    routing = _routing.get()
+    if not DB_READ_URL or routing is None or routing.user_id == user_id:
+        return
+    routing.user_id = user_id
+    try:
+        if await recent_writes.check(user_id):
+            routing.primary = True
+    except Exception:
+        logger.exception("Recent write check failed, reading from the primary")
+        routing.primary = True
+
+
+class ReadReplicaMiddleware:
+    """
+    Serves GET and HEAD requests (list/detail routers) from the replica and
+    records which users wrote, so their next reads go to the primary.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        routing = Routing(read_only=scope["method"] in ("GET", "HEAD"))
+        token = _routing.set(routing)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _routing.reset(token)
+            if routing.wrote and routing.user_id:
+                try:
+                    await recent_writes.mark(routing.user_id)
+                except Exception:
+                    logger.exception("Could not mark user %s as a writer", routing.user_id)
+
+
+def _sqlite_path(url: str) -> str:
+    return expand_db_url(url)["credentials"]["file_path"]
+
+
+async def replicate_sqlite(primary_url: str, replica_url: str, interval: float):
+    """
+    Local stand-in for streaming replication: copies the primary sqlite file
+    over the replica every `interval` seconds, so the replica lags like a real
+    one.
+    """
+    primary, replica = _sqlite_path(primary_url), _sqlite_path(replica_url)
+
+    def copy():
+        with closing(sqlite3.connect(primary)) as source:
+            with closing(sqlite3.connect(replica)) as target:
+                source.backup(target)
+
+    while True:
+        try:
+            await asyncio.to_thread(copy)
+        except sqlite3.Error:
+            logger.exception("Replicating %s to %s failed", primary, replica)
+        await asyncio.sleep(interval)
@@ -1,4 +1,4 @@
-from .controller import create_filter_schema
+from .controller import build_filter_schema, create_filter_schema
 from .model import Filter
 
-__all__ = ["Filter", "create_filter_schema"]
+__all__ = ["Filter", "build_filter_schema", "create_filter_schema"]
@@ -1,11 +1,18 @@
+import logging
+from functools import partial
 from typing import Any, Optional, Type
 
-from fastapi import Query
-from pydantic import create_model
+from fastapi import Query, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError, create_model
 from tortoise.fields import ManyToManyRelation
 from tortoise.models import Model
 
 from src.config import FILTER_OPERATIONS
+from src.config.settings import INDEX_CHECK, LAZY_STARTUP
+from src.helper.db.indexes import unindexed_lookups
+
+logger = logging.getLogger(__name__)
 
 
 def create_filter_schema(
@@ -13,6 +20,43 @@ def create_filter_schema(
     excludes: list[str] | None = None,
     includes: list[dict[str, tuple[type, Any]]] | None = None,
     filter_operations: list[str] | None = None,
+):
+    build = partial(
+        build_filter_schema, model, excludes, includes, filter_operations
+    )
+    return lazy_filter_schema(build) if LAZY_STARTUP else build()
+
+
+def lazy_filter_schema(build):
+    """
+    A `Depends()` stand-in for a filter schema: FastAPI sees one `Request`
+    parameter instead of a query parameter per lookup, and the schema is
+    built by `build` on the first request and then validates the query string.
+    """
+    schema = None
+
+    def filters(request: Request):
+        nonlocal schema
+        if schema is None:
+            schema = build()
+        try:
+            return schema.model_validate(dict(request.query_params))
+        except ValidationError as error:
+            raise RequestValidationError(
+                [
+                    {**detail, "loc": ("query", *detail["loc"])}
+                    for detail in error.errors(include_url=False)
+                ]
+            )
+
+    return filters
+
+
+def build_filter_schema(
+    model: Type[Model],
+    excludes: list[str] | None = None,
+    includes: list[dict[str, tuple[type, Any]]] | None = None,
+    filter_operations: list[str] | None = None,
 ):
     excludes = excludes or []
 
@@ -90,4 +134,22 @@ def create_filter_schema(
             for field_name, type_, default_ in includes or []
         }
     )
+    if INDEX_CHECK != "off":
+        included = {field_name for field_name, *_ in includes or []}
+        unindexed = unindexed_lookups(
+            model, [name for name in fields if name.split("__")[0] not in included]
+        )
+        if INDEX_CHECK == "reject":
+            for name in unindexed:
+                fields.pop(name)
+        elif unindexed:
+            lookups: dict[str, dict[str, None]] = {}
+            for name in unindexed:
+                field, _, operation = name.partition("__")
+                lookups.setdefault(field, {})[operation or "exact"] = None
+            logger.warning(
+                "%s exposes filters no index can serve: %s",
+                model.__name__,
+                " ".join(f"{field}[{','.join(ops)}]" for field, ops in lookups.items()),
+            )
     return create_model(f"{model.__name__}FilterSchema", **fields)
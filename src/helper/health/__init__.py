@@ -0,0 +1,3 @@
+from .controller import drain, is_ready, on_shutdown, readiness, set_ready
+
+__all__ = ["drain", "is_ready", "on_shutdown", "readiness", "set_ready"]
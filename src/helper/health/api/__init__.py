@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from src.helper.url import add_patterns
+
+from .health import router as health_router
+
+url_patterns = [
+    (health_router, "/health", ["Health"]),
+]
+
+router = add_patterns(APIRouter(), url_patterns)
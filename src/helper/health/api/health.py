@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+
+from src.helper.health.controller import is_ready, readiness
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def liveness_router():
+    """The process serves requests; touches no backend."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness_router():
+    """The worker finished starting, is not draining and reaches its backends."""
+    if not is_ready():
+        raise HTTPException(status_code=503, detail={"status": "not ready"})
+    checks = await readiness()
+    if any(result != "ok" for result in checks.values()):
+        raise HTTPException(status_code=503, detail=checks)
+    return checks
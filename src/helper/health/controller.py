@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from tortoise import Tortoise
+
+from src.config.settings import (
+    DB_READ_URL,
+    HEALTH_CHECK_TIMEOUT,
+    SHUTDOWN_DRAIN_TIMEOUT,
+    USE_REDIS,
+)
+
+logger = logging.getLogger(__name__)
+
+_ready = False
+_shutdown_hooks: list[Callable[[], Awaitable]] = []
+
+
+def set_ready(ready: bool):
+    global _ready
+    _ready = ready
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def on_shutdown(hook: Callable[[], Awaitable]):
+    """
+    Registers a coroutine function that `drain` awaits before the database
+    connections close, e.g. to flush a buffer or close a client.
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+async def drain(timeout: float = SHUTDOWN_DRAIN_TIMEOUT):
+    """Runs the shutdown hooks, newest first, each bounded by `timeout`."""
+    set_ready(False)
+    for hook in reversed(_shutdown_hooks):
+        try:
+            await asyncio.wait_for(hook(), timeout)
+        except Exception:
+            logger.exception("Shutdown hook %s failed", hook.__qualname__)
+
+
+async def _ping_database(name: str):
+    await Tortoise.get_connection(name).execute_query("SELECT 1")
+
+
+async def _ping_redis():
+    from src.helper.redis import async_redis
+
+    await async_redis.ping()
+
+
+async def readiness() -> dict[str, str]:
+    """Checks every backend a request depends on; values are "ok" or the error."""
+    checks = {"database": _ping_database("default")}
+    if DB_READ_URL:
+        checks["replica"] = _ping_database("replica")
+    if USE_REDIS:
+        checks["redis"] = _ping_redis()
+    results = await asyncio.gather(
+        *(asyncio.wait_for(check, HEALTH_CHECK_TIMEOUT) for check in checks.values()),
+        return_exceptions=True,
+    )
+    return {
+        name: "ok" if result is None else repr(result)
+        for name, result in zip(checks, results)
+    }
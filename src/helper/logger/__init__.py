@@ -1,12 +1,24 @@
+from src.config.settings import USE_CELERY, USE_SCHEDULER
+
 from .controller import add_log, log_action
-from .model import ActionEnum, Log
+from .model import ActionEnum, Log, LogDailyAggregate
+from .partition import ensure_log_partitions, partition_log_table
+from .retention import compact_view_logs
 from .schema import LogCreateScheme, LogResponseScheme
 
+if USE_SCHEDULER and not USE_CELERY:
+    # celery beat runs it otherwise
+    from . import schedule  # noqa: F401
+
 __all__ = [
     "Log",
+    "LogDailyAggregate",
     "ActionEnum",
     "LogCreateScheme",
     "LogResponseScheme",
     "log_action",
     "add_log",
+    "compact_view_logs",
+    "ensure_log_partitions",
+    "partition_log_table",
 ]
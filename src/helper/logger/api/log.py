@@ -1,31 +1,76 @@
+from datetime import datetime, timedelta
+
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import RedirectResponse
+from tortoise import timezone
 
+from src.config.settings import DB_EXPORT_STATEMENT_TIMEOUT, LOG_QUERY_WINDOW_DAYS
 from src.config.util import get_user_model
 from src.helper.auth import login_required
-from src.helper.filters import create_filter_schema
-from src.helper.logger import ActionEnum, Log, log_action
+from src.helper.db import statement_timeout
+from src.helper.filters import Filter, create_filter_schema
+from src.helper.logger import ActionEnum, Log, LogResponseScheme, log_action
+from src.helper.paginate import KeysetPaginated, KeysetPaginator
+from src.helper.permission.controller import has_access
 from src.helper.select import Select
+from src.helper.stream import stream_response
 
 router = APIRouter()
 
+MODEL_NAME = Log._meta.db_table
+
 LogFilterSchema = create_filter_schema(Log, ["last_value"])
 
 UserModel = get_user_model()
 
 
-@router.get("/")
+def recent_logs(since: datetime | None):
+    # the lower bound lets postgres prune every partition older than `since`
+    since = since or timezone.now() - timedelta(days=LOG_QUERY_WINDOW_DAYS)
+    return Log.filter(created_at__gte=since)
+
+
+@router.get(
+    "/",
+    response_model=KeysetPaginated[LogResponseScheme],
+    response_model_exclude_unset=True,
+)
 @log_action(action=ActionEnum.VIEW.value, model="Logs", user_field="cuser")
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME, user_field="cuser")
 async def get_logs(
     request: Request,
-    page: int = Query(1, ge=1),
     limit: int = Query(10, le=100),
+    cursor: str | None = Query(None),
     filters: LogFilterSchema = Depends(),  # type: ignore
     cuser=Depends(login_required),
-    sort_by: list[str] = Query([]),
-    pagination: bool = Query(True),
+    select: list[str] = Query(None),
+    since: datetime | None = Query(None),
+):
+    objects = Filter.create(recent_logs(since), filters)
+    return await KeysetPaginator(limit=limit, cursor=cursor).paginated(
+        LogResponseScheme, objects, select=Select.validate(select, Log)
+    )
+
+
+@router.get("/export")
+@log_action(action=ActionEnum.VIEW_ALL.value, model="Logs", user_field="cuser")
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME, user_field="cuser")
+@statement_timeout(DB_EXPORT_STATEMENT_TIMEOUT)
+async def export_logs(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: LogFilterSchema = Depends(),  # type: ignore
+    cuser=Depends(login_required),
+    select: list[str] = Query(None),
+    since: datetime | None = Query(None),
 ):
-    return {}
+    objects = Filter.create(recent_logs(since), filters)
+    return stream_response(
+        objects,
+        Select.validate(select, Log) or Select.fields(Log),
+        format=format,
+        filename="logs",
+    )
 
 
 @router.get("/{log_id}")
@@ -1,10 +1,19 @@
+import asyncio
+import logging
 from functools import wraps
 
 from fastapi import Request
 from tortoise import Model
 
+from src.config.settings import CELERY_TASK_ALWAYS_EAGER, USE_CELERY
+
 from .model import Log  # noqa
 
+if USE_CELERY:
+    from src.helper.celery.tasks import write_log
+
+logger = logging.getLogger(__name__)
+
 
 async def add_log(
     request: Request, user_id, action, model, model_id, success: bool = True
@@ -14,7 +23,7 @@ async def add_log(
     mac_address = None
     browser = user_agent.split(" ")[0] if user_agent else "unknown"
     location = None
-    await Log.create(
+    data = dict(
         user_id=user_id,
         action=action,
         db_model=model,
@@ -26,6 +35,18 @@ async def add_log(
         location=location,
         is_success=success,
     )
+    if USE_CELERY:
+        try:
+            if CELERY_TASK_ALWAYS_EAGER:
+                # runs as a task on this loop, nothing is published
+                write_log.delay(data)
+            else:
+                # publishing waits on the broker, which must not block the loop
+                await asyncio.to_thread(write_log.delay, data)
+            return
+        except Exception:
+            logger.exception("Could not queue an audit log, writing it directly")
+    await Log.create(**data)
 
 
 def log_action(
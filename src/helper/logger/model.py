@@ -3,6 +3,7 @@ from enum import Enum
 from tortoise import fields, models
 
 from src.config import USER_MODEL
+from src.helper.db import untracked_writes
 from src.helper.user.model import User
 
 
@@ -14,6 +15,7 @@ class ActionEnum(str, Enum):
     VIEW_ALL = "view_all"
 
 
+@untracked_writes
 class Log(models.Model):
     id = fields.BigIntField(pk=True)
     user: User = fields.ForeignKeyField(
@@ -34,3 +36,19 @@ class Log(models.Model):
 
     class Meta:
         table = "log"
+        indexes = (("user_id", "created_at"), ("db_model", "db_model_id"))
+
+
+class LogDailyAggregate(models.Model):
+    id = fields.BigIntField(pk=True)
+    day = fields.DateField()
+    user: User = fields.ForeignKeyField(
+        USER_MODEL, related_name="log_aggregate", on_delete=fields.CASCADE, null=True
+    )
+    action = fields.CharEnumField(ActionEnum, max_length=20, null=True)
+    db_model = fields.CharField(max_length=255, null=True)
+    count = fields.IntField(default=0)
+
+    class Meta:
+        table = "log_daily_aggregate"
+        indexes = (("day", "db_model"), ("user_id", "day"))
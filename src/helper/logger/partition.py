@@ -0,0 +1,126 @@
+import re
+from datetime import date
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from src.config.settings import LOG_PARTITION_MONTHS_AHEAD
+
+from .model import Log
+
+TABLE = Log._meta.db_table
+LEGACY = f"{TABLE}_legacy"
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    month = day.month - 1 + offset
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+async def is_partitioned(connection: BaseDBAsyncClient) -> bool:
+    if connection.capabilities.dialect != "postgres":
+        return False
+    _, rows = await connection.execute_query(
+        "SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = $1",
+        [TABLE],
+    )
+    return bool(rows)
+
+
+async def legacy_bound(connection: BaseDBAsyncClient) -> date | None:
+    """Upper bound of the attached pre-partitioning table, if there is one."""
+    _, rows = await connection.execute_query(
+        "SELECT pg_get_expr(relpartbound, oid) AS bound FROM pg_class "
+        "WHERE relname = $1 AND relispartition",
+        [LEGACY],
+    )
+    # e.g. FOR VALUES FROM (MINVALUE) TO ('2026-11-01 00:00:00+00')
+    match = rows and re.search(r"TO \('(\d{4}-\d{2}-\d{2})", rows[0]["bound"])
+    return date.fromisoformat(match.group(1)) if match else None
+
+
+async def partition_log_table(connection: BaseDBAsyncClient | None = None):
+    """
+    One-time conversion of `log` into a table range-partitioned by month on
+    `created_at`. Existing rows stay where they are: the old table is attached
+    as the partition holding everything before the current month, or before
+    the month after its newest row if that is later; monthly partitions start
+    at that bound.
+    """
+    connection = connection or Tortoise.get_connection("default")
+    if connection.capabilities.dialect != "postgres":
+        return
+    if await is_partitioned(connection):
+        return
+    user_table = Log._meta.fields_map["user"].related_model._meta.db_table
+    async with in_transaction(connection.connection_name) as conn:
+        _, rows = await conn.execute_query(
+            f'SELECT max("created_at") AS newest FROM "{TABLE}"'
+        )
+        newest = rows[0]["newest"]
+        bound = month_start(date.today())
+        if newest is not None:
+            bound = max(bound, month_start(newest.date(), 1))
+        await conn.execute_script(f"""
+            ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}";
+            CREATE TABLE "{TABLE}" (LIKE "{LEGACY}" INCLUDING DEFAULTS)
+                PARTITION BY RANGE ("created_at");
+            ALTER TABLE "{TABLE}" ADD PRIMARY KEY ("id", "created_at");
+            ALTER TABLE "{TABLE}" ADD FOREIGN KEY ("user_id")
+                REFERENCES "{user_table}" ("id") ON DELETE CASCADE;
+            CREATE INDEX ON "{TABLE}" ("user_id", "created_at");
+            CREATE INDEX ON "{TABLE}" ("db_model", "db_model_id");
+            ALTER TABLE "{TABLE}" ATTACH PARTITION "{LEGACY}"
+                FOR VALUES FROM (MINVALUE) TO ('{bound}');
+            CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT;
+            """)
+    await ensure_log_partitions(connection=connection)
+
+
+async def ensure_log_partitions(
+    months_ahead: int = LOG_PARTITION_MONTHS_AHEAD,
+    connection: BaseDBAsyncClient | None = None,
+):
+    connection = connection or Tortoise.get_connection("default")
+    if not await is_partitioned(connection):
+        return
+    today = date.today()
+    # months up to the legacy table's bound are already covered by it
+    first = max(month_start(today), await legacy_bound(connection) or date.min)
+    last = month_start(today, months_ahead + 1)
+    for offset in range((last.year - first.year) * 12 + last.month - first.month):
+        start, end = month_start(first, offset), month_start(first, offset + 1)
+        await add_partition(connection, start, end)
+
+
+async def add_partition(connection: BaseDBAsyncClient, start: date, end: date):
+    """
+    Adds the partition for `[start, end)`. Rows already written to the default
+    partition for that range (the app outlived the months made ahead of time)
+    are moved into it first, or postgres refuses the new partition.
+    """
+    name = f"{TABLE}_{start:%Y_%m}"
+    exists = "SELECT 1 FROM pg_class WHERE relname = $1"
+    if (await connection.execute_query(exists, [name]))[1]:
+        return
+    async with in_transaction(connection.connection_name) as conn:
+        # holds back writes to the default partition, and any other process
+        # adding the same partition, until the range is moved
+        await conn.execute_script(
+            f'LOCK TABLE "{TABLE}_default" IN ACCESS EXCLUSIVE MODE'
+        )
+        if (await conn.execute_query(exists, [name]))[1]:
+            return
+        await conn.execute_script(f"""
+            CREATE TABLE "{name}" (LIKE "{TABLE}" INCLUDING DEFAULTS);
+            WITH moved AS (
+                DELETE FROM "{TABLE}_default"
+                WHERE "created_at" >= '{start}' AND "created_at" < '{end}'
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved;
+            ALTER TABLE "{TABLE}" ATTACH PARTITION "{name}"
+                FOR VALUES FROM ('{start}') TO ('{end}');
+            """)
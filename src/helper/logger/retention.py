@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from tortoise import timezone
+from tortoise.functions import Count
+from tortoise.transactions import in_transaction
+
+from src.config.settings import LOG_VIEW_RETENTION_DAYS
+
+from .model import ActionEnum, Log, LogDailyAggregate
+
+VIEW_ACTIONS = [ActionEnum.VIEW, ActionEnum.VIEW_ALL]
+
+
+async def compact_view_logs(retention_days: int = LOG_VIEW_RETENTION_DAYS) -> int:
+    """
+    Rolls VIEW/VIEW_ALL rows older than `retention_days` into one
+    `LogDailyAggregate` row per (day, user, action, model) and deletes them,
+    one day per transaction. Returns the number of deleted rows.
+    """
+    cutoff = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    cutoff -= timedelta(days=retention_days)
+    expired = Log.filter(action__in=VIEW_ACTIONS, created_at__lt=cutoff)
+    compacted = 0
+    while oldest := await expired.order_by("created_at").first():
+        day = oldest.created_at.replace(hour=0, minute=0, second=0, microsecond=0)
+        rows = expired.filter(
+            created_at__gte=day, created_at__lt=day + timedelta(days=1)
+        )
+        async with in_transaction("default"):
+            aggregates = (
+                await rows.annotate(total=Count("id"))
+                .group_by("user_id", "action", "db_model")
+                .values("user_id", "action", "db_model", "total")
+            )
+            await LogDailyAggregate.bulk_create(
+                [
+                    LogDailyAggregate(
+                        day=day.date(),
+                        user_id=row["user_id"],
+                        action=row["action"],
+                        db_model=row["db_model"],
+                        count=row["total"],
+                    )
+                    for row in aggregates
+                ]
+            )
+            compacted += await rows.delete()
+    return compacted
@@ -0,0 +1,37 @@
+"""
+Nightly log maintenance through `scheduler`, for deployments without celery
+beat: tops up the monthly partitions and compacts old view logs, the work of
+the `audit.compact_logs` task.
+"""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from src.config.settings import TIMEZONE
+from src.helper.scheduler import scheduler
+
+from .partition import ensure_log_partitions
+from .retention import compact_view_logs
+
+MAINTENANCE = "log_maintenance"
+# the celery beat schedule runs at the same hour
+HOUR = 3
+
+
+def next_run(now: datetime | None = None) -> datetime:
+    now = now or datetime.now(ZoneInfo(TIMEZONE))
+    at = now.replace(hour=HOUR, minute=0, second=0, microsecond=0)
+    return at if at > now else at + timedelta(days=1)
+
+
+@scheduler.handler(MAINTENANCE)
+async def run_maintenance(ids: list[int]):
+    await ensure_log_partitions()
+    await compact_view_logs()
+    # a failed run stays leased and is retried; a finished one is moved on
+    await scheduler.schedule(MAINTENANCE, {0: next_run()})
+
+
+@scheduler.on_lead
+async def enqueue_maintenance():
+    await scheduler.schedule(MAINTENANCE, {0: next_run()})
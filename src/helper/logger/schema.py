@@ -1,7 +1,18 @@
 from src.base.scheme import BaseCreateScheme, BaseResponseScheme
 
 
-class LogCreateScheme(BaseCreateScheme): ...
+class LogCreateScheme(BaseCreateScheme):
+    user_id: int | None = None
+    action: str | None = None
+    db_model: str | None = None
+    db_model_id: str | None = None
+    ip_address: str | None = None
+    mac_address: str | None = None
+    browser: str | None = None
+    user_agent: str | None = None
+    location: str | None = None
+    last_value: dict | list | None = None
+    is_success: bool | None = None
 
 
 class LogResponseScheme(LogCreateScheme, BaseResponseScheme): ...
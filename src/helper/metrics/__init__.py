@@ -0,0 +1,17 @@
+from .queries import (
+    QueryStats,
+    QueryStatsMiddleware,
+    instrument_connections,
+    route_template,
+    sql_shape,
+    track_queries,
+)
+
+__all__ = [
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "instrument_connections",
+    "route_template",
+    "sql_shape",
+    "track_queries",
+]
@@ -0,0 +1,60 @@
+"""
+Prometheus exposition, kept off the API's port and event loop.
+
+`start_metrics_server` serves `/metrics` from a thread of the first worker
+that binds `METRICS_PORT`. With several workers, set
+`PROMETHEUS_MULTIPROC_DIR` so it reports every worker's samples, caches and
+websockets included (see `RuntimePublisher`), or point the standalone app at
+the same directory and run it on its own:
+
+    uvicorn src.helper.metrics.app:app --port 9100
+"""
+
+import logging
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, make_asgi_app
+from prometheus_client import multiprocess, start_http_server
+
+from src.config.settings import METRICS_ADDR, METRICS_PORT
+from src.helper.health import on_shutdown
+
+from .collectors import MULTIPROCESS, RuntimeCollector, RuntimePublisher
+
+logger = logging.getLogger(__name__)
+
+
+async def mark_process_dead():
+    # drops this worker's live gauges from the merged samples
+    multiprocess.mark_process_dead(os.getpid())
+
+
+def build_registry() -> CollectorRegistry:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        on_shutdown(mark_process_dead)
+    else:
+        registry = REGISTRY
+    registry.register(RuntimeCollector())
+    return registry
+
+
+registry = build_registry()
+app = make_asgi_app(registry)
+
+
+def start_metrics_server(port: int = METRICS_PORT, addr: str = METRICS_ADDR):
+    if MULTIPROCESS:
+        # every worker writes its share, whichever one serves the port
+        publisher = RuntimePublisher()
+        publisher.start()
+        on_shutdown(publisher.stop)
+    try:
+        start_http_server(port, addr=addr, registry=registry)
+    except OSError:
+        # another worker of this host already serves the port
+        logger.info("Metrics port %s is taken, not serving metrics here", port)
+        return False
+    logger.info("Serving metrics on %s:%s", addr, port)
+    return True
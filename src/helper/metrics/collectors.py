@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import os
+
+from prometheus_client import Counter, Gauge
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from src.config.settings import (
+    CELERY_BROKER_URL,
+    CELERY_DEFAULT_QUEUE,
+    CELERY_QUEUES,
+    METRICS_PUBLISH_INTERVAL,
+    USE_CELERY,
+    USE_REDIS,
+)
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+_caches: dict[str, object] = {}
+_websockets: dict[str, object] = {}
+
+
+def track_cache(name: str, cache):
+    """Exports the hit/miss counters of a `TieredCache` under `name`."""
+    _caches[name] = cache
+    return cache
+
+
+def track_websockets(name: str, manager):
+    """Exports the open connections of a `WebSocketManager` under `name`."""
+    _websockets[name] = manager
+    return manager
+
+
+class RuntimeCollector(Collector):
+    """
+    Reads in-process caches, websocket managers, redis and the celery broker
+    at scrape time. Scrapes run on the metrics server's thread, so the redis
+    calls here use blocking clients and never touch the API event loop.
+
+    Under `PROMETHEUS_MULTIPROC_DIR` the caches and websockets of the worker
+    serving the scrape are only its own share, so they come from
+    `RuntimePublisher` instead. Redis and the broker are shared, any worker
+    reads the same numbers.
+    """
+
+    def __init__(self):
+        self._redis = None
+        self._broker = None
+        if USE_REDIS:
+            from src.helper.redis import main_redis
+
+            self._redis = main_redis
+        if USE_CELERY and CELERY_BROKER_URL.startswith("redis"):
+            from redis import Redis
+
+            self._broker = Redis.from_url(CELERY_BROKER_URL)
+
+    def collect(self):
+        if not MULTIPROCESS:
+            yield from self._cache_metrics()
+            yield from self._websocket_metrics()
+        if self._redis:
+            yield from self._redis_metrics()
+        if self._broker:
+            yield from self._queue_metrics()
+
+    def _cache_metrics(self):
+        hits = CounterMetricFamily(
+            "cache_hits", "Cache hits per tier.", labels=["cache", "tier"]
+        )
+        misses = CounterMetricFamily("cache_misses", "Cache misses.", labels=["cache"])
+        coalesced = CounterMetricFamily(
+            "cache_coalesced",
+            "Lookups that waited on an in-flight load.",
+            labels=["cache"],
+        )
+        errors = CounterMetricFamily(
+            "cache_backend_errors", "Failed redis calls.", labels=["cache"]
+        )
+        ratio = GaugeMetricFamily(
+            "cache_hit_ratio", "Hits over lookups since start.", labels=["cache"]
+        )
+        for name, cache in _caches.items():
+            stats = cache.metrics()
+            hits.add_metric([name, "local"], stats["l1_hits"])
+            hits.add_metric([name, "redis"], stats["l2_hits"])
+            misses.add_metric([name], stats["misses"])
+            coalesced.add_metric([name], stats["coalesced"])
+            errors.add_metric([name], stats["errors"])
+            ratio.add_metric([name], stats["hit_ratio"])
+        yield from (hits, misses, coalesced, errors, ratio)
+
+    def _websocket_metrics(self):
+        active = GaugeMetricFamily(
+            "websocket_active_connections",
+            "Open websocket connections.",
+            labels=["manager"],
+        )
+        for name, manager in _websockets.items():
+            active.add_metric([name], len(manager.active_connections))
+        yield active
+
+    def _redis_metrics(self):
+        try:
+            info = self._redis.info("stats")
+        except Exception:
+            logger.warning("Could not read redis stats", exc_info=True)
+            return
+        hits, misses = info.get("keyspace_hits", 0), info.get("keyspace_misses", 0)
+        yield CounterMetricFamily(
+            "redis_keyspace_hits", "Redis key lookups that hit.", value=hits
+        )
+        yield CounterMetricFamily(
+            "redis_keyspace_misses", "Redis key lookups that missed.", value=misses
+        )
+        yield GaugeMetricFamily(
+            "redis_hit_ratio",
+            "Redis keyspace hits over lookups since the server started.",
+            value=hits / (hits + misses) if hits + misses else 0.0,
+        )
+
+    def _queue_metrics(self):
+        depth = GaugeMetricFamily(
+            "celery_queue_length",
+            "Messages waiting per queue; `audit` holds pending log writes.",
+            labels=["queue"],
+        )
+        queues = [CELERY_DEFAULT_QUEUE, *CELERY_QUEUES]
+        try:
+            pipeline = self._broker.pipeline()
+            for queue in queues:
+                pipeline.llen(queue)
+            lengths = pipeline.execute()
+        except Exception:
+            logger.warning("Could not read celery queue lengths", exc_info=True)
+            return
+        for queue, length in zip(queues, lengths):
+            depth.add_metric([queue], length)
+        yield depth
+
+
+class RuntimePublisher:
+    """
+    Copies this worker's cache counters and open websockets into the
+    multiprocess sample files every `interval` seconds, where the metrics
+    server sums them with the other workers'. The hit ratio is left out, it
+    does not add up across workers; derive it from hits and misses.
+    """
+
+    def __init__(self, interval: float = METRICS_PUBLISH_INTERVAL):
+        self.interval = interval
+        # registry=None: the sample files carry them, not this process
+        self.hits = Counter(
+            "cache_hits", "Cache hits per tier.", ["cache", "tier"], registry=None
+        )
+        self.counters = {
+            stat: Counter(name, documentation, ["cache"], registry=None)
+            for stat, name, documentation in (
+                ("misses", "cache_misses", "Cache misses."),
+                (
+                    "coalesced",
+                    "cache_coalesced",
+                    "Lookups that waited on an in-flight load.",
+                ),
+                ("errors", "cache_backend_errors", "Failed redis calls."),
+            )
+        }
+        self.active = Gauge(
+            "websocket_active_connections",
+            "Open websocket connections.",
+            ["manager"],
+            multiprocess_mode="livesum",
+            registry=None,
+        )
+        self._published: dict[tuple[str, str], float] = {}
+        self._task: asyncio.Task | None = None
+
+    def _add(self, counter, name: str, stat: str, value: float):
+        counter.inc(max(0, value - self._published.get((name, stat), 0)))
+        self._published[name, stat] = value
+
+    def publish(self):
+        for name, cache in _caches.items():
+            stats = cache.metrics()
+            self._add(
+                self.hits.labels(name, "local"), name, "l1_hits", stats["l1_hits"]
+            )
+            self._add(
+                self.hits.labels(name, "redis"), name, "l2_hits", stats["l2_hits"]
+            )
+            for stat, counter in self.counters.items():
+                self._add(counter.labels(name), name, stat, stats[stat])
+        for name, manager in _websockets.items():
+            self.active.labels(name).set(len(manager.active_connections))
+
+    async def _run(self):
+        while True:
+            try:
+                self.publish()
+            except Exception:
+                logger.exception("Could not publish runtime metrics")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        # the last numbers, so a restart loses none of the counts
+        self.publish()
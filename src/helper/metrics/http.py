@@ -0,0 +1,48 @@
+import time
+
+from prometheus_client import Gauge, Histogram
+
+from .queries import route_template
+
+REQUEST_TIME = Histogram(
+    "http_request_duration_seconds",
+    "Request latency per route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+
+class HTTPMetricsMiddleware:
+    """Latency per route template (not per raw path) and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            REQUEST_TIME.labels(method, route_template(scope), status).observe(
+                time.perf_counter() - start
+            )
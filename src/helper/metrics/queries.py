@@ -0,0 +1,231 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from src.config.settings import (
+    QUERY_N_PLUS_ONE_THRESHOLD,
+    QUERY_STATS_SAMPLE_RATE,
+    USE_METRICS,
+)
+
+if USE_METRICS:
+    from prometheus_client import Counter as MetricCounter
+    from prometheus_client import Histogram
+
+    QUERIES = Histogram(
+        "db_queries_per_request",
+        "Database queries issued by one request.",
+        ["route"],
+        buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+    )
+    QUERY_TIME = Histogram(
+        "db_query_seconds_per_request",
+        "Time one request spent waiting on the database.",
+        ["route"],
+    )
+    DUPLICATES = MetricCounter(
+        "db_duplicate_queries",
+        "Repeated SQL shapes within sampled requests.",
+        ["route"],
+    )
+    N_PLUS_ONE = MetricCounter(
+        "db_n_plus_one",
+        "Sampled requests that repeated one SQL shape past the threshold.",
+        ["route"],
+    )
+    STATEMENT_TIME = Histogram(
+        "db_statement_duration_seconds",
+        "Time of single statements per connection and statement type.",
+        ["connection", "statement"],
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+    )
+
+logger = logging.getLogger(__name__)
+
+METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|\?")
+LISTS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+_executing: ContextVar[bool] = ContextVar("query_executing", default=False)
+_reported: set[tuple[str, str]] = set()
+
+
+def route_template(scope) -> str:
+    """The matched route's full path template, e.g. `/api/group/{id}`."""
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(getattr(context, "starlette_route", None), "path_format", None)
+    path = path or getattr(context, "path_format", None)
+    return path or getattr(scope.get("route"), "path_format", None) or "unmatched"
+
+
+def statement_type(sql: str) -> str:
+    keyword = sql[:16].split(None, 1)[0].upper() if sql.strip() else ""
+    return keyword.lower() if keyword in STATEMENTS else "other"
+
+
+def sql_shape(sql: str) -> str:
+    """`sql` with literals and parameters replaced, so repeats compare equal."""
+    return LISTS.sub("(?)", LITERALS.sub("?", " ".join(sql.split())))
+
+
+@dataclass
+class QueryStats:
+    sampled: bool = False
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, sql: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        if self.sampled:
+            self.shapes[sql_shape(sql)] += 1
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.shapes.values())
+
+    def repeated(self, threshold: int = QUERY_N_PLUS_ONE_THRESHOLD):
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+@contextmanager
+def track_queries(sampled: bool = False):
+    """Collects the queries run inside the block into the yielded `QueryStats`."""
+    stats = QueryStats(sampled=sampled)
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+
+
+def _instrument(method):
+    @wraps(method)
+    async def wrapper(self, query, *args, **kwargs):
+        stats = _stats.get()
+        if (stats is None and not USE_METRICS) or _executing.get():
+            return await method(self, query, *args, **kwargs)
+        token = _executing.set(True)
+        start = time.perf_counter()
+        try:
+            return await method(self, query, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            _executing.reset(token)
+            if stats is not None:
+                stats.record(query, duration)
+            if USE_METRICS:
+                STATEMENT_TIME.labels(
+                    self.connection_name, statement_type(query)
+                ).observe(duration)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def _client_classes(cls: type) -> set[type]:
+    classes = {cls}
+    for subclass in cls.__subclasses__():
+        classes |= _client_classes(subclass)
+    return classes
+
+
+def instrument_connections():
+    """
+    Times the execute methods of every configured client class, transaction
+    wrappers included. Outside `QueryStatsMiddleware`, and with metrics off,
+    the wrappers only do a context lookup.
+    """
+    for connection in connections.all():
+        for cls in _client_classes(type(connection)):
+            if not issubclass(cls, BaseDBAsyncClient):
+                continue
+            for name in METHODS:
+                method = cls.__dict__.get(name)
+                if method and not getattr(method, "__instrumented__", False):
+                    setattr(cls, name, _instrument(method))
+
+
+def report_repeats(route: str, stats: QueryStats):
+    for shape, count in stats.repeated():
+        if USE_METRICS:
+            N_PLUS_ONE.labels(route).inc()
+        if (route, shape) in _reported:
+            continue
+        _reported.add((route, shape))
+        logger.warning(
+            "Possible N+1 on %s: %d queries of shape %s "
+            "(prefetch_related or a join would batch them)",
+            route,
+            count,
+            shape[:300],
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the queries and database time of every request and reports them
+    in a `Server-Timing` header and prometheus. A `QUERY_STATS_SAMPLE_RATE`
+    share of requests also records SQL shapes to catch duplicates and N+1
+    patterns.
+    """
+
+    def __init__(self, app, sample_rate: float = QUERY_STATS_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = QueryStats(sampled=random.random() < self.sample_rate)
+        token = _stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = (
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'
+                )
+                if stats.sampled:
+                    timing += f', db-dup;desc="{stats.duplicates} duplicates"'
+                timing += f", app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _stats.reset(token)
+            route = route_template(scope)
+            if USE_METRICS:
+                QUERIES.labels(route).observe(stats.count)
+                QUERY_TIME.labels(route).observe(stats.duration)
+                if stats.sampled:
+                    DUPLICATES.labels(route).inc(stats.duplicates)
+            if stats.sampled:
+                report_repeats(route, stats)
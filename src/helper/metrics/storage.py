@@ -0,0 +1,23 @@
+from prometheus_client import Counter, Histogram
+
+TRANSFERRED = Counter(
+    "storage_transferred_bytes",
+    "Bytes moved to or from object storage.",
+    ["direction"],
+)
+TRANSFER_TIME = Histogram(
+    "storage_transfer_duration_seconds",
+    "Object storage transfer time.",
+    ["direction"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+PRESIGNED = Counter(
+    "storage_presigned_urls",
+    "Presigned download urls handed out; those downloads bypass the API.",
+)
+
+
+def observe_transfer(direction: str, size: int, seconds: float):
+    """Throughput is `rate(storage_transferred_bytes_total)` over the transfer time."""
+    TRANSFERRED.labels(direction).inc(size)
+    TRANSFER_TIME.labels(direction).observe(seconds)
@@ -45,11 +45,12 @@ async def get_files_router(
     user=Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     sort = OrderBy.create(File.all(), sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        FileResponseScheme, objects, pagination
+        FileResponseScheme, objects, pagination, fields=fields
     )
 
 
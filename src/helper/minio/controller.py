@@ -1,4 +1,5 @@
 import os
+import time
 from datetime import timedelta
 
 from fastapi import HTTPException
@@ -11,8 +12,12 @@ from src.config.settings import (
     MINIO_BASE_BUCKETS,
     MINIO_KWARGS,
     MINIO_URI,
+    USE_METRICS,
 )
-from src.helper.redis.cache import cache, cached
+from src.helper.cache import cached
+
+if USE_METRICS:
+    from src.helper.metrics.storage import PRESIGNED, observe_transfer
 
 minio_client = Minio(
     endpoint=MINIO_URI,
@@ -41,9 +46,12 @@ async def upload_to_minio(
     bucket_name: str = MINIO_BASE_BUCKETS[0],
 ):
     try:
+        size, start = os.path.getsize(temp_file_path), time.perf_counter()
         minio_client.fput_object(
             bucket_name, file_name, temp_file_path, content_type=content_type
         )
+        if USE_METRICS:
+            observe_transfer("upload", size, time.perf_counter() - start)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to upload to MinIO: {str(e)}"
@@ -52,15 +60,18 @@ async def upload_to_minio(
         os.remove(temp_file_path)
 
 
-@cached(ttl=CACHE_TTL, cache=cache)
+@cached(ttl=CACHE_TTL)
 async def generate_presigned_url(
     file_name: str | list[str], bucket_name: str = MINIO_BASE_BUCKETS[0]
 ) -> str | list[str]:
     if isinstance(file_name, list):
         return [await generate_presigned_url(name) for name in file_name]
     try:
-        return minio_client.presigned_get_object(
+        url = minio_client.presigned_get_object(
             bucket_name, file_name, expires=timedelta(seconds=CACHE_TTL + 1)
         )
+        if USE_METRICS:
+            PRESIGNED.inc()
+        return url
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate URL: {str(e)}")
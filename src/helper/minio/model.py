@@ -8,9 +8,12 @@ from fastapi import UploadFile
 from tortoise import fields
 
 from src.base import BaseModel
-from src.config.settings import MINIO_BASE_BUCKETS
+from src.config.settings import MINIO_BASE_BUCKETS, USE_CELERY
 from src.helper.minio.controller import generate_presigned_url, upload_to_minio
 
+if USE_CELERY:
+    from src.helper.celery.tasks import create_thumbnail
+
 
 class File(BaseModel):
     url = fields.CharField(max_length=255, unique=True)
@@ -56,6 +59,8 @@ class File(BaseModel):
             bucket_name=bucket_name,
             size=file.size,
         )
+        if USE_CELERY and obj.content_type.startswith("image/"):
+            create_thumbnail.delay(obj.id)
         return obj, file_url
 
     async def download(self) -> str:
@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 from tortoise.queryset import QuerySet
 
+from src.helper.db.indexes import check_sort
+
 
 class OrderBy:
     def __init__(self):
@@ -30,6 +32,7 @@ class OrderBy:
                     continue
                 if allowed_fields and field.replace("-", "") in allowed_fields:
                     continue
+                check_sort(query.model, field.lstrip("-"))
                 order_obj.add(field)
             except ValueError:
                 raise HTTPException(
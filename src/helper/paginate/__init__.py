@@ -1,4 +1,17 @@
 from .controller import paginate
-from .models import BasePaginator, Paginated, Paginator
+from .models import (
+    BasePaginator,
+    KeysetPaginated,
+    KeysetPaginator,
+    Paginated,
+    Paginator,
+)
 
-__all__ = ["Paginated", "Paginator", "BasePaginator", "paginate"]
+__all__ = [
+    "Paginated",
+    "Paginator",
+    "BasePaginator",
+    "KeysetPaginated",
+    "KeysetPaginator",
+    "paginate",
+]
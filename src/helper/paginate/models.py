@@ -1,9 +1,15 @@
+import base64
+from datetime import datetime
 from typing import Callable, Generic, List, TypeVar
 
-from fastapi import HTTPException
+import orjson
+from fastapi import HTTPException, Response
 from pydantic import BaseModel
-from tortoise.queryset import QuerySet, ValuesQuery
+from tortoise import fields
+from tortoise.queryset import Q, QuerySet, ValuesQuery
 
+from src.helper.response import SchemeResponse
+from src.helper.select import Select
 from src.helper.utils import call
 
 T = TypeVar("T")
@@ -20,6 +26,12 @@ class Paginated(BaseModel, Generic[T]):
         extra = "allow"
 
 
+class KeysetPaginated(BaseModel, Generic[T]):
+    limit: int
+    next: str | None = None
+    data: List[T]
+
+
 class BasePaginator:
     def __init__(
         self,
@@ -103,10 +115,21 @@ class Paginator(BasePaginator):
         offset = (self.page - 1) * self.limit
         self.paginated_result = self.result[offset : offset + self.limit]
 
-    async def paginated(self, serializer, objects, apply=True, bounded: bool = False):
+    async def paginated(
+        self,
+        serializer,
+        objects,
+        apply=True,
+        bounded: bool = False,
+        fields: list[str] | None = None,
+        exclude: list[str] | None = None,
+    ):
+        fields = Select.validate(fields, objects.model, exclude, serializer)
+        if fields:
+            return await self.projected(objects, fields, apply, bounded)
         if apply:
             paginate = await self.paginate(objects.all())
-            return await paginate.get_paginated_response(
+            content = await paginate.get_paginated_response(
                 await call(
                     serializer.from_tortoise_orm,
                     serializer,
@@ -114,8 +137,9 @@ class Paginator(BasePaginator):
                     many=True,
                 )
             )
-        else:
-            return await call(
+            return SchemeResponse(Paginated[serializer].model_construct(**content))
+        return SchemeResponse(
+            await call(
                 serializer.from_tortoise_orm,
                 serializer,
                 (
@@ -124,4 +148,115 @@ class Paginator(BasePaginator):
                     else await objects.all().limit(self.limit)
                 ),
                 many=True,
+            ),
+            List[serializer],
+        )
+
+    async def projected(
+        self, objects, fields: list[str], apply=True, bounded: bool = False
+    ) -> Response:
+        """
+        Selects only `fields` and dumps the dict rows straight to JSON,
+        skipping model instances and response-model validation.
+        """
+        if apply:
+            paginate = await self.paginate(objects.all())
+            content = await paginate.get_paginated_response(
+                paginate.paginated_result.values(*fields)
+            )
+        else:
+            query = objects.all() if not bounded else objects.all().limit(self.limit)
+            content = await query.values(*fields)
+        return Response(
+            orjson.dumps(content, default=str), media_type="application/json"
+        )
+
+
+class KeysetPaginator:
+    """
+    Seek pagination over `keys`: each page continues after the row encoded in
+    `cursor` instead of using an offset, so deep pages cost the same as the
+    first one. The keys must be unique together (end them with the pk).
+    """
+
+    def __init__(
+        self,
+        limit: int = 10,
+        cursor: str | None = None,
+        keys: tuple[str, ...] = ("created_at", "id"),
+        descending: bool = True,
+    ) -> None:
+        self.limit = limit
+        self.cursor = cursor
+        self.keys = keys
+        self.descending = descending
+
+    def encode(self, row) -> str:
+        values = [
+            row[key] if isinstance(row, dict) else getattr(row, key)
+            for key in self.keys
+        ]
+        return base64.urlsafe_b64encode(orjson.dumps(values, default=str)).decode()
+
+    def decode(self, model) -> list | None:
+        if not self.cursor:
+            return None
+        try:
+            values = orjson.loads(base64.urlsafe_b64decode(self.cursor))
+            if len(values) != len(self.keys):
+                raise ValueError
+            return [
+                (
+                    datetime.fromisoformat(value)
+                    if isinstance(
+                        model._meta.fields_map[key],
+                        fields.DatetimeField,
+                    )
+                    else value
+                )
+                for key, value in zip(self.keys, values)
+            ]
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def apply(self, query: QuerySet) -> QuerySet:
+        query = query.order_by(
+            *(f"-{key}" if self.descending else key for key in self.keys)
+        )
+        values = self.decode(query.model)
+        if not values:
+            return query
+        operator = "lt" if self.descending else "gt"
+        condition = None
+        for index, key in enumerate(self.keys):
+            step = Q(
+                **dict(zip(self.keys[:index], values[:index])),
+                **{f"{key}__{operator}": values[index]},
             )
+            condition = step if condition is None else condition | step
+        return query.filter(condition)
+
+    async def paginated(self, serializer, objects: QuerySet, select=None):
+        query = self.apply(objects).limit(self.limit + 1)
+        if select:
+            query = query.values(*dict.fromkeys([*select, *self.keys]))
+        rows = await query
+        next_cursor = (
+            self.encode(rows[self.limit - 1]) if len(rows) > self.limit else None
+        )
+        rows = rows[: self.limit]
+        return SchemeResponse(
+            KeysetPaginated[serializer].model_construct(
+                limit=self.limit,
+                next=next_cursor,
+                data=(
+                    [serializer(**row) for row in rows]
+                    if select
+                    else await call(
+                        serializer.from_tortoise_orm, serializer, rows, many=True
+                    )
+                ),
+            ),
+            # selected rows leave the other fields unset
+            exclude_unset=bool(select),
+        )
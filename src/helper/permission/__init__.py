@@ -1,4 +1,10 @@
-from src.helper.permission.model import Group, Permission
+from src.helper.permission.hierarchy import (
+    check_group_parent,
+    ensure_group_permissions,
+    group_descendants,
+    refresh_group_permissions,
+)
+from src.helper.permission.model import EffectivePermission, Group, Permission
 from src.helper.permission.schema import (
     GroupCreateScheme,
     GroupResponseScheme,
@@ -9,8 +15,13 @@ from src.helper.permission.schema import (
 __all__ = [
     "Permission",
     "Group",
+    "EffectivePermission",
     "PermissionCreateScheme",
     "PermissionResponseScheme",
     "GroupCreateScheme",
     "GroupResponseScheme",
+    "check_group_parent",
+    "ensure_group_permissions",
+    "group_descendants",
+    "refresh_group_permissions",
 ]
@@ -9,23 +9,38 @@ from src.helper import (
     OrderBy,
     Paginator,
     Status,
+    cache_response,
     create_filter_schema,
+    has_access,
+    invalidate_cache,
     log_action,
     login_required,
 )
 from src.helper.paginate import Paginated
-from src.helper.permission import Group, GroupCreateScheme, GroupResponseScheme
+from src.helper.permission import (
+    Group,
+    GroupCreateScheme,
+    GroupResponseScheme,
+    Permission,
+    PermissionResponseScheme,
+    check_group_parent,
+    refresh_group_permissions,
+)
 
 router = APIRouter()
 
 
 GroupFilterSchema = create_filter_schema(Group)
 
+MODEL_NAME: str = Group._meta.db_table
+
 
 @router.get(
     "/", response_model=Paginated[GroupResponseScheme] | List[GroupResponseScheme]
 )
 @log_action(action=ActionEnum.VIEW.value, model="Group")
+@has_access(action=ActionEnum.VIEW_ALL.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_groups_router(
     request: Request,
     page: int = Query(1, ge=1),
@@ -34,24 +49,37 @@ async def get_groups_router(
     user=Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     sort = OrderBy.create(Group.all(), sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        GroupResponseScheme, objects, pagination
+        GroupResponseScheme, objects, pagination, fields=fields
     )
 
 
 @router.post("/", response_model=GroupResponseScheme)
+@log_action(action=ActionEnum.CREATE.value, model="Group")
+@has_access(action=ActionEnum.CREATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def create_group_router(
     object: GroupCreateScheme,
     user=Depends(login_required),
 ):
-    return await object.create(Group, serialize=True, serializer=GroupResponseScheme)
+    group = await object.create(
+        Group,
+        serialize=True,
+        serializer=GroupResponseScheme,
+        m2m=[("permissions", object.permissions, Permission)],
+    )
+    await refresh_group_permissions(group.id)
+    return group
 
 
 @router.get("/{id}", response_model=GroupResponseScheme)
 @log_action(action=ActionEnum.VIEW.value, model="Group")
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
 async def get_group_router(
     id: str,
     request: Request,
@@ -64,17 +92,53 @@ async def get_group_router(
 
 
 @router.put("/{id}", response_model=GroupResponseScheme)
+@log_action(action=ActionEnum.UPDATE.value, model="Group")
+@has_access(action=ActionEnum.UPDATE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
 async def update_group_router(
     id: int,
     object: GroupCreateScheme,
     user=Depends(login_required),
 ):
-    await Group.filter(id=id).update(**object.model_dump(exclude_unset=True))
-    return await GroupResponseScheme.from_tortoise_orm(await Group.get(id=id))
+    data = object.model_dump(exclude_unset=True, exclude={"permissions"})
+    if "parent_id" in data:
+        await check_group_parent(id, data["parent_id"])
+    if data:
+        await Group.filter(id=id).update(**data)
+    group = await Group.get(id=id)
+    if "permissions" in object.model_fields_set:
+        await object.update_m2m(
+            group, [("permissions", object.permissions, Permission)]
+        )
+    if "parent_id" in data or "permissions" in object.model_fields_set:
+        await refresh_group_permissions(id)
+    return await GroupResponseScheme.from_tortoise_orm(
+        GroupResponseScheme, group, m2m=[("permissions", "permissions")]
+    )
+
+
+@router.get("/{id}/permissions", response_model=List[PermissionResponseScheme])
+@log_action(action=ActionEnum.VIEW.value, model="Group")
+@has_access(action=ActionEnum.VIEW.value, to=MODEL_NAME)
+@cache_response(MODEL_NAME)
+async def get_group_permissions_router(
+    id: int,
+    request: Request,
+    user=Depends(login_required),
+):
+    """The group's own permissions and those it inherits."""
+    return await PermissionResponseScheme.from_tortoise_orm(
+        PermissionResponseScheme,
+        await Permission.filter(effective_groups__group_id=id).order_by("name"),
+        many=True,
+    )
 
 
 @router.delete("/{id}", response_model=Status)
-async def delete_group_router(id: int):
+@log_action(action=ActionEnum.DELETE.value, model="Group")
+@has_access(action=ActionEnum.DELETE.value, to=MODEL_NAME)
+@invalidate_cache(MODEL_NAME)
+async def delete_group_router(id: int, user=Depends(login_required)):
     deleted_count = await Group.filter(id=id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"Group {id} not found")
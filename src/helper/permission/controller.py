@@ -2,11 +2,16 @@ from functools import wraps
 
 from fastapi import HTTPException, Request
 
-from src.helper.permission.model import Permission
+from src.helper.db import read_replica
+from src.helper.permission.model import EffectivePermission, Permission
 
 
 async def has_permission(user, permission):
-    return await user.group.filter(permissions=permission).exists()
+    """Checks the user's group, inherited permissions included."""
+    with read_replica():
+        return await EffectivePermission.filter(
+            group_id=user.group_id, permission_id=permission.id
+        ).exists()
 
 
 class Access:
@@ -0,0 +1,88 @@
+"""
+Group permissions are inherited down `Group.parent`: a group holds its own
+permissions and those of every ancestor. The effective set is materialized
+in `group_effective_permission` by recursive queries (postgres and sqlite
+both support `WITH RECURSIVE`), so a permission check is a single indexed
+lookup. Writes that change a group's parent or permissions refresh it and
+every group below it.
+"""
+
+from fastapi import HTTPException
+from tortoise.transactions import in_transaction
+
+from .model import EffectivePermission, Group
+
+# bounds the walk up the hierarchy should a cycle slip in
+MAX_DEPTH = 32
+
+
+def _descendants(group_ids: list[int] | None) -> str:
+    # table names are only known once Tortoise is initialised
+    group = Group._meta.db_table
+    seed = (
+        f'WHERE "id" IN ({", ".join(str(int(id)) for id in group_ids)})'
+        if group_ids is not None
+        else ""
+    )
+    return f"""
+        "tree"("id") AS (
+            SELECT "id" FROM "{group}" {seed}
+            UNION
+            SELECT "child"."id" FROM "{group}" "child"
+            JOIN "tree" ON "child"."parent_id" = "tree"."id"
+        )"""
+
+
+async def group_descendants(group_id: int, connection=None) -> set[int]:
+    """The group and every group below it."""
+    connection = connection or Group._meta.db
+    _, rows = await connection.execute_query(
+        f'WITH RECURSIVE {_descendants([group_id])} SELECT "id" FROM "tree"'
+    )
+    return {row["id"] for row in rows}
+
+
+async def refresh_group_permissions(*group_ids: int):
+    """
+    Rematerializes the effective permissions of `group_ids` and the groups
+    below them, or of every group when none are given.
+    """
+    tree = _descendants(list(group_ids) if group_ids else None)
+    group = Group._meta.db_table
+    links = Group._meta.fields_map["permissions"]
+    effective = EffectivePermission._meta.db_table
+    async with in_transaction("default") as connection:
+        await connection.execute_query(
+            f'WITH RECURSIVE {tree} DELETE FROM "{effective}" '
+            f'WHERE "group_id" IN (SELECT "id" FROM "tree")'
+        )
+        await connection.execute_query(f"""
+            WITH RECURSIVE {tree},
+            "lineage"("group_id", "ancestor_id", "depth") AS (
+                SELECT "id", "id", 0 FROM "tree"
+                UNION ALL
+                SELECT "lineage"."group_id", "parent"."parent_id", "lineage"."depth" + 1
+                FROM "lineage"
+                JOIN "{group}" "parent" ON "parent"."id" = "lineage"."ancestor_id"
+                WHERE "parent"."parent_id" IS NOT NULL
+                AND "lineage"."depth" < {MAX_DEPTH}
+            )
+            INSERT INTO "{effective}" ("group_id", "permission_id")
+            SELECT DISTINCT "lineage"."group_id", "link"."{links.forward_key}"
+            FROM "lineage"
+            JOIN "{links.through}" "link"
+                ON "link"."{links.backward_key}" = "lineage"."ancestor_id"
+            """)
+
+
+async def ensure_group_permissions():
+    """Materializes the effective permissions of groups that predate them."""
+    if not await EffectivePermission.exists():
+        await refresh_group_permissions()
+
+
+async def check_group_parent(group_id: int, parent_id: int | None):
+    if parent_id is not None and parent_id in await group_descendants(group_id):
+        raise HTTPException(
+            status_code=400, detail="A group cannot inherit from its own descendant"
+        )
@@ -1,4 +1,4 @@
-from tortoise import fields
+from tortoise import fields, models
 
 from src.base import BaseModel
 
@@ -23,6 +23,25 @@ class Group(BaseModel):
         return self.__str__()
 
 
+class EffectivePermission(models.Model):
+    """
+    A permission a group holds directly or through an ancestor group,
+    materialized by `hierarchy.refresh_group_permissions`.
+    """
+
+    id = fields.IntField(primary_key=True)
+    group = fields.ForeignKeyField(
+        "models.Group", related_name="effective_permissions", on_delete=fields.CASCADE
+    )
+    permission = fields.ForeignKeyField(
+        "models.Permission", related_name="effective_groups", on_delete=fields.CASCADE
+    )
+
+    class Meta:
+        table = "group_effective_permission"
+        unique_together = (("group_id", "permission_id"),)
+
+
 class Access(BaseModel):
     user = fields.ForeignKeyField("models.User")
     role = fields.CharField(max_length=256)
@@ -14,6 +14,7 @@ class PermissionResponseScheme(PermissionCreateScheme, BaseResponseScheme): ...
 class GroupCreateScheme(BaseCreateScheme):
     name: str
     parent_id: int | None = None
+    permissions: list[int] | None = None
 
 
 class GroupResponseScheme(GroupCreateScheme, BaseResponseScheme): ...
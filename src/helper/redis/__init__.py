@@ -1,6 +1,7 @@
 import time
 from typing import Any, Dict, List, Optional
 
+from redis.asyncio import Redis as AsyncRedis
 from redis.client import Redis
 
 from src.config.settings import (
@@ -10,6 +11,7 @@ from src.config.settings import (
     REDIS_PORT,
     REDIS_USERNAME,
 )
+from src.helper.health import on_shutdown
 
 main_redis = Redis(
     REDIS_HOST,
@@ -19,6 +21,16 @@ main_redis = Redis(
     **REDIS_KWARGS,
 )
 
+async_redis = AsyncRedis(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    password=REDIS_PASSWORD,
+    username=REDIS_USERNAME,
+    **REDIS_KWARGS,
+)
+# registered first, so it closes after the caches built on it
+on_shutdown(async_redis.aclose)
+
 
 def set_key_if_not_exists(
     redis_client: Redis, key: str, value: Any, expire: Optional[int] = None
@@ -1,9 +1,3 @@
-from aiocache import Cache, cached
-
-from src.config.settings import REDIS_HOST, REDIS_PORT
-
-cache = Cache.REDIS
-
-Cache.REDIS(endpoint=REDIS_HOST, port=int(REDIS_PORT), timeout=10)
+from src.helper.cache import cache, cached
 
 __all__ = ["cache", "cached"]
@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class ORJSONResponse(Response):
+    """Default response class: dumps with orjson instead of `json.dumps`."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def adapter(type_) -> TypeAdapter:
+    """One `TypeAdapter` per response type, built on first use."""
+    return TypeAdapter(type_)
+
+
+class SchemeResponse(Response):
+    """
+    Dumps schemes that are already validated straight to JSON bytes with
+    pydantic-core. Routers returning a `Response` bypass `response_model`,
+    so the content is not validated a second time.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        type_: Any = None,
+        exclude_unset: bool = False,
+        **kwargs,
+    ) -> None:
+        super().__init__(
+            adapter(type_ or type(content)).dump_json(
+                content, by_alias=True, exclude_unset=exclude_unset
+            ),
+            **kwargs,
+        )
@@ -0,0 +1,268 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from src.config.settings import (
+    SCHEDULER_BATCH_SIZE,
+    SCHEDULER_LEADER_TTL,
+    SCHEDULER_LEASE,
+    SCHEDULER_POLL_INTERVAL,
+    USE_REDIS,
+)
+
+if USE_REDIS:
+    from src.helper.redis import async_redis
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[list[int]], Awaitable]
+
+# pushes the due items' scores to the lease deadline and returns them, in one
+# step, so a crashed leader's claims simply come due again
+CLAIM = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[3])
+for _, item in ipairs(items) do
+    redis.call('ZADD', KEYS[1], ARGV[2], item)
+end
+return items
+"""
+# drops claimed items, unless they were rescheduled while being handled
+ACK = """
+local removed = 0
+for i = 2, #ARGV do
+    local score = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if score and tonumber(score) == tonumber(ARGV[1]) then
+        removed = removed + redis.call('ZREM', KEYS[1], ARGV[i])
+    end
+end
+return removed
+"""
+RENEW = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _timestamp(at: datetime | float) -> float:
+    return at.timestamp() if isinstance(at, datetime) else float(at)
+
+
+class Scheduler:
+    """
+    A time-indexed queue of `kind:id` items, scored by when they fall due.
+
+    Only the holder of the leader lock polls it. Each poll claims at most
+    `batch_size` due items at a time by moving their score `lease` seconds
+    ahead, hands every kind its ids in one handler call, and removes the items
+    once the handler returns. Items whose handler raises, or whose leader
+    dies, come due again when the lease ends: delivery is at least once, so
+    handlers must be idempotent. Many items due at the same moment cost one
+    handler call per batch, drained by one process.
+
+    Without redis the queue lives in process memory and every process leads
+    its own. `on_lead` hooks run on taking the lead, e.g. to rebuild the
+    queue from the database; the lock is renewed in the background while they
+    run, however long that takes.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        batch_size: int = SCHEDULER_BATCH_SIZE,
+        lease: int = SCHEDULER_LEASE,
+        leader_ttl: int = SCHEDULER_LEADER_TTL,
+        poll_interval: float = SCHEDULER_POLL_INTERVAL,
+        prefix: str = "scheduler",
+    ):
+        self.redis = redis
+        self.batch_size = batch_size
+        self.lease = lease
+        self.leader_ttl = leader_ttl
+        self.poll_interval = poll_interval
+        self.queue_key = f"{prefix}:queue"
+        self.leader_key = f"{prefix}:leader"
+        self.handlers: dict[str, Handler] = {}
+        self._on_lead: list[Callable[[], Awaitable]] = []
+        self._token = uuid.uuid4().hex
+        self._leader = False
+        self._memory: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+        if redis:
+            self._claim = redis.register_script(CLAIM)
+            self._ack = redis.register_script(ACK)
+            self._renew = redis.register_script(RENEW)
+            self._release = redis.register_script(RELEASE)
+
+    def handler(self, kind: str):
+        """Registers `func(ids)` for the due items of `kind`."""
+
+        def decorator(func: Handler) -> Handler:
+            self.handlers[kind] = func
+            return func
+
+        return decorator
+
+    def on_lead(self, func: Callable[[], Awaitable]):
+        """Registers `func()` to run whenever this process becomes the leader."""
+        self._on_lead.append(func)
+        return func
+
+    async def schedule(self, kind: str, due: dict[int, datetime | float]):
+        """Queues (or moves) each `id: when` of `kind`."""
+        if not due:
+            return
+        items = {f"{kind}:{id}": _timestamp(at) for id, at in due.items()}
+        if self.redis:
+            await self.redis.zadd(self.queue_key, items)
+            return
+        self._memory.update(items)
+
+    async def unschedule(self, kind: str, *ids: int):
+        if not ids:
+            return
+        items = [f"{kind}:{id}" for id in ids]
+        if self.redis:
+            await self.redis.zrem(self.queue_key, *items)
+            return
+        for item in items:
+            self._memory.pop(item, None)
+
+    async def claim(self, now: float) -> tuple[float, list[str]]:
+        """Leases up to `batch_size` due items; returns the lease and the items."""
+        until = now + self.lease
+        if self.redis:
+            items = await self._claim(
+                keys=[self.queue_key], args=[now, until, self.batch_size]
+            )
+            return until, [
+                item.decode() if isinstance(item, bytes) else item for item in items
+            ]
+        due = sorted(
+            (score, item) for item, score in self._memory.items() if score <= now
+        )[: self.batch_size]
+        for _, item in due:
+            self._memory[item] = until
+        return until, [item for _, item in due]
+
+    async def ack(self, lease: float, items: list[str]):
+        if not items:
+            return
+        if self.redis:
+            await self._ack(keys=[self.queue_key], args=[lease, *items])
+            return
+        for item in items:
+            if self._memory.get(item) == lease:
+                del self._memory[item]
+
+    async def renew(self) -> bool:
+        """Extends the leader lock; False once another process holds it."""
+        if self.redis and self._leader:
+            self._leader = bool(
+                await self._renew(
+                    keys=[self.leader_key],
+                    args=[self._token, int(self.leader_ttl * 1000)],
+                )
+            )
+        return self._leader
+
+    async def _keep_lead(self):
+        while await self.renew():
+            await asyncio.sleep(self.leader_ttl / 3)
+
+    async def lead(self) -> bool:
+        """Takes or keeps the leader lock; True while this process holds it."""
+        if not self.redis:
+            elected = not self._leader
+            self._leader = True
+        else:
+            ttl = int(self.leader_ttl * 1000)
+            await self.renew()
+            elected = not self._leader and bool(
+                await self.redis.set(self.leader_key, self._token, nx=True, px=ttl)
+            )
+            self._leader = self._leader or elected
+        if elected and self._on_lead:
+            keeper = asyncio.create_task(self._keep_lead())
+            try:
+                for hook in self._on_lead:
+                    await hook()
+            finally:
+                keeper.cancel()
+        return self._leader
+
+    async def resign(self):
+        if self.redis and self._leader:
+            await self._release(keys=[self.leader_key], args=[self._token])
+        self._leader = False
+
+    async def _dispatch(self, lease: float, items: list[str]):
+        ids: dict[str, list[int]] = defaultdict(list)
+        for item in items:
+            kind, _, id = item.rpartition(":")
+            ids[kind].append(int(id))
+        done = []
+        for kind, kind_ids in ids.items():
+            handler = self.handlers.get(kind)
+            if handler is None:
+                logger.warning("No scheduler handler for %s, dropping", kind)
+            else:
+                try:
+                    await handler(kind_ids)
+                except Exception:
+                    # retried once the lease runs out
+                    logger.exception("Scheduler handler %s failed", kind)
+                    continue
+            done.extend(f"{kind}:{id}" for id in kind_ids)
+        await self.ack(lease, done)
+
+    async def tick(self) -> int:
+        """Fires every due item if this process leads; returns how many."""
+        fired = 0
+        while await self.lead():
+            lease, items = await self.claim(time.time())
+            if not items:
+                break
+            await self._dispatch(lease, items)
+            fired += len(items)
+            if len(items) < self.batch_size:
+                break
+        return fired
+
+    async def run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.resign()
+
+
+scheduler = Scheduler(async_redis if USE_REDIS else None)
+
+__all__ = ["Scheduler", "scheduler"]
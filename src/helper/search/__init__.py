@@ -0,0 +1,16 @@
+from .controller import ensure_search_index, search
+from .model import SearchDocument
+from .registry import index_rows, reindex, search_scope, searchable
+from .scheme import SearchResponseScheme, SearchResultScheme
+
+__all__ = [
+    "SearchDocument",
+    "SearchResultScheme",
+    "SearchResponseScheme",
+    "ensure_search_index",
+    "index_rows",
+    "reindex",
+    "search",
+    "search_scope",
+    "searchable",
+]
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from src.helper.url import add_patterns
+
+from .search import router as search_router
+
+url_patterns = [
+    (search_router, "/search", ["Search"]),
+]
+
+router = add_patterns(APIRouter(), url_patterns)
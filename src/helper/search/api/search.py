@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from src.helper.auth import login_required
+from src.helper.logger import ActionEnum, log_action
+from src.helper.search.controller import search
+from src.helper.search.scheme import SearchResponseScheme
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResponseScheme)
+@log_action(action=ActionEnum.VIEW_ALL.value, model="Search")
+async def search_router(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=256),
+    kind: list[str] = Query(None),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, le=100),
+    user=Depends(login_required),
+):
+    # results are scoped to the caller, so there is nothing to show anonymously
+    if not user:
+        raise HTTPException(status_code=401, detail="User authentication required")
+    return {
+        "page": page,
+        "limit": limit,
+        "data": await search(q, user, kind, limit=limit, offset=(page - 1) * limit),
+    }
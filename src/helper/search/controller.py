@@ -0,0 +1,169 @@
+import re
+
+from fastapi import HTTPException
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from src.config.settings import SEARCH_LANGUAGE, SEARCH_SNIPPET_WORDS
+
+from .model import SearchDocument
+from .registry import accessible_projects, registry
+
+TABLE = SearchDocument._meta.db_table
+FTS_TABLE = f"{TABLE}_fts"
+START, STOP = "<mark>", "</mark>"
+
+
+def get_connection(connection: BaseDBAsyncClient | None = None):
+    return connection or Tortoise.get_connection("default")
+
+
+async def ensure_search_index(connection: BaseDBAsyncClient | None = None):
+    """
+    Creates the full-text index next to `search_document`: a generated,
+    weighted `tsvector` column with a GIN index on postgres, or an FTS5
+    external-content table kept in sync by triggers on sqlite.
+    """
+    connection = get_connection(connection)
+    dialect = connection.capabilities.dialect
+    if dialect == "postgres":
+        await connection.execute_script(f"""
+            ALTER TABLE "{TABLE}" ADD COLUMN IF NOT EXISTS "document" tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce("title", '')), 'A')
+                    || setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce("body", '')), 'B')
+                ) STORED;
+            CREATE INDEX IF NOT EXISTS "{TABLE}_document_idx"
+                ON "{TABLE}" USING GIN ("document");
+            """)
+    elif dialect == "sqlite":
+        _, rows = await connection.execute_query(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", [FTS_TABLE]
+        )
+        if rows:
+            return
+        await connection.execute_script(f"""
+            CREATE VIRTUAL TABLE "{FTS_TABLE}" USING fts5(
+                title, body, content="{TABLE}", content_rowid="id"
+            );
+            CREATE TRIGGER "{TABLE}_ai" AFTER INSERT ON "{TABLE}" BEGIN
+                INSERT INTO "{FTS_TABLE}"(rowid, title, body)
+                VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TRIGGER "{TABLE}_ad" AFTER DELETE ON "{TABLE}" BEGIN
+                INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}", rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+            END;
+            CREATE TRIGGER "{TABLE}_au" AFTER UPDATE ON "{TABLE}" BEGIN
+                INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}", rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+                INSERT INTO "{FTS_TABLE}"(rowid, title, body)
+                VALUES (new.id, new.title, new.body);
+            END;
+            INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}") VALUES ('rebuild');
+            """)
+
+
+def fts5_query(text: str) -> str:
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return ""
+    # quoted terms are literal; the last one is a prefix for search-as-you-type
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+async def _postgres_search(connection, text, kinds, projects, user_id, limit, offset):
+    query = f"websearch_to_tsquery('{SEARCH_LANGUAGE}', $1)"
+    options = (
+        f"StartSel={START}, StopSel={STOP}, MaxFragments=2, "
+        f"MaxWords={SEARCH_SNIPPET_WORDS}, MinWords={SEARCH_SNIPPET_WORDS // 3}"
+    )
+    # headlines are costly, so they are only built for the page of hits
+    _, rows = await connection.execute_query(
+        f"""
+        WITH hits AS (
+            SELECT "id", "kind", "object_id", "project_id", "title", "body",
+                ts_rank_cd("document", {query}) AS "rank"
+            FROM "{TABLE}"
+            WHERE "document" @@ {query}
+                AND "kind" = ANY($2)
+                AND ("project_id" = ANY($3) OR "user_id" = $4)
+            ORDER BY "rank" DESC, "id" DESC
+            LIMIT $5 OFFSET $6
+        )
+        SELECT "kind", "object_id", "project_id", "title", "rank",
+            ts_headline('{SEARCH_LANGUAGE}', coalesce("body", "title", ''),
+                {query}, '{options}') AS "snippet"
+        FROM hits ORDER BY "rank" DESC, "id" DESC
+        """,
+        [text, kinds, projects, user_id, limit, offset],
+    )
+    return [dict(row) for row in rows]
+
+
+async def _sqlite_search(connection, text, kinds, projects, user_id, limit, offset):
+    match = fts5_query(text)
+    if not match:
+        return []
+    _, rows = await connection.execute_query(
+        f"""
+        SELECT d."kind", d."object_id", d."project_id", d."title",
+            -bm25("{FTS_TABLE}", 10.0, 1.0) AS "rank",
+            snippet("{FTS_TABLE}", -1, '{START}', '{STOP}', '…',
+                {SEARCH_SNIPPET_WORDS}) AS "snippet"
+        FROM "{FTS_TABLE}" JOIN "{TABLE}" d ON d."id" = "{FTS_TABLE}".rowid
+        WHERE "{FTS_TABLE}" MATCH ?
+            AND d."kind" IN ({", ".join("?" * len(kinds))})
+            AND (d."project_id" IN ({", ".join("?" * len(projects)) or "NULL"})
+                OR d."user_id" = ?)
+        ORDER BY bm25("{FTS_TABLE}", 10.0, 1.0), d."id" DESC
+        LIMIT ? OFFSET ?
+        """,
+        [match, *kinds, *projects, user_id, limit, offset],
+    )
+    return [dict(row) for row in rows]
+
+
+async def drop_stale(rows: list[dict]) -> list[dict]:
+    """Removes hits whose object was deleted without firing a signal."""
+    stale = set()
+    for kind in {row["kind"] for row in rows}:
+        ids = [row["object_id"] for row in rows if row["kind"] == kind]
+        alive = set(
+            await registry[kind].model.filter(id__in=ids).values_list("id", flat=True)
+        )
+        stale |= {(kind, i) for i in ids if i not in alive}
+    for kind, object_id in stale:
+        await SearchDocument.filter(kind=kind, object_id=object_id).delete()
+    return [row for row in rows if (row["kind"], row["object_id"]) not in stale]
+
+
+async def search(
+    text: str,
+    user,
+    kinds: list[str] | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    connection: BaseDBAsyncClient | None = None,
+) -> list[dict]:
+    """
+    Ranked hits for `text` among the documents `user` may see: those in a
+    project they can access, plus their own.
+    """
+    kinds = kinds or list(registry)
+    for kind in kinds:
+        if kind not in registry:
+            raise HTTPException(status_code=400, detail=f"Invalid search kind: {kind}")
+    connection = get_connection(connection)
+    dialect = connection.capabilities.dialect
+    if dialect == "postgres":
+        backend = _postgres_search
+    elif dialect == "sqlite":
+        backend = _sqlite_search
+    else:
+        raise HTTPException(
+            status_code=501, detail=f"Search is not supported on {dialect}"
+        )
+    projects = await accessible_projects(user)
+    rows = await backend(connection, text, kinds, projects, user.id, limit, offset)
+    return await drop_stale(rows)
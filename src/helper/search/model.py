@@ -0,0 +1,20 @@
+from tortoise import fields
+
+from src.base import BaseModel
+
+
+class SearchDocument(BaseModel):
+    kind = fields.CharField(max_length=32)
+    object_id = fields.IntField()
+    project_id = fields.IntField(null=True)
+    user_id = fields.IntField(null=True)
+    title = fields.TextField(null=True)
+    body = fields.TextField(null=True)
+
+    def __repr__(self):
+        return self.__str__()
+
+    class Meta:
+        table = "search_document"
+        unique_together = (("kind", "object_id"),)
+        indexes = (("project_id",), ("user_id",))
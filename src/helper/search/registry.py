@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+from tortoise import Model
+from tortoise.signals import post_delete, post_save
+
+from src.helper.utils import call
+
+from .model import SearchDocument
+
+
+@dataclass
+class Searchable:
+    model: type[Model]
+    kind: str
+    title: str | None
+    body: str
+    project: Callable[[Model], Any] | None = None
+    user: str | None = None
+
+    async def document(self, instance: Model) -> dict[str, Any]:
+        return {
+            "project_id": (
+                await call(self.project, instance) if self.project else None
+            ),
+            "user_id": getattr(instance, self.user) if self.user else None,
+            "title": getattr(instance, self.title) if self.title else None,
+            "body": getattr(instance, self.body),
+        }
+
+
+registry: dict[str, Searchable] = {}
+_scope: Callable[[Any], Awaitable[list[int]]] | None = None
+
+
+async def index_object(entry: Searchable, instance: Model):
+    await SearchDocument.update_or_create(
+        defaults=await entry.document(instance),
+        kind=entry.kind,
+        object_id=instance.pk,
+    )
+
+
+async def index_rows(
+    kind: str, rows: list[dict], project_id: int | None = None, using_db=None
+):
+    """
+    Indexes rows just inserted past the signals (dicts of their fields, `id`
+    included) in one bulk insert. Their project is given, not resolved per
+    row.
+    """
+    entry = registry[kind]
+    await SearchDocument.bulk_create(
+        [
+            SearchDocument(
+                kind=kind,
+                object_id=row["id"],
+                project_id=project_id,
+                user_id=row.get(entry.user) if entry.user else None,
+                title=row.get(entry.title) if entry.title else None,
+                body=row.get(entry.body),
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+        using_db=using_db,
+    )
+
+
+async def unindex_object(entry: Searchable, object_id: int):
+    await SearchDocument.filter(kind=entry.kind, object_id=object_id).delete()
+
+
+def searchable(
+    model: type[Model],
+    kind: str,
+    title: str | None,
+    body: str,
+    project: Callable[[Model], Any] | None = None,
+    user: str | None = None,
+) -> Searchable:
+    """
+    Indexes `model` under `kind` and keeps the index in sync through
+    `post_save`/`post_delete`; a `title` of None indexes the body alone.
+    `project` resolves the project that scopes who may see a row; `user` names
+    the author field, who can always see it.
+    Queryset `.update()`/`.delete()` bypass signals; search drops documents
+    whose object no longer exists.
+    """
+    entry = Searchable(model, kind, title, body, project, user)
+    registry[kind] = entry
+
+    @post_save(model)
+    async def on_save(sender, instance, created, using_db, update_fields):
+        await index_object(entry, instance)
+
+    @post_delete(model)
+    async def on_delete(sender, instance, using_db):
+        await unindex_object(entry, instance.pk)
+
+    return entry
+
+
+def search_scope(func: Callable[[Any], Awaitable[list[int]]]):
+    """Registers the resolver for the project ids a user may search in."""
+    global _scope
+    _scope = func
+    return func
+
+
+async def accessible_projects(user) -> list[int]:
+    return list(await _scope(user)) if _scope else []
+
+
+async def reindex(
+    kind: str | None = None, chunk_size: int = 500, ids: Iterable[int] | None = None
+) -> int:
+    """
+    Rebuilds the documents of `kind` (or every kind), or only of the rows
+    `ids`, from the source tables.
+    """
+    indexed = 0
+    for entry in [registry[kind]] if kind else registry.values():
+        rows = entry.model.all() if ids is None else entry.model.filter(id__in=ids)
+        last = 0
+        while (
+            objects := await rows.filter(id__gt=last).order_by("id").limit(chunk_size)
+        ):
+            for instance in objects:
+                await index_object(entry, instance)
+            indexed += len(objects)
+            last = objects[-1].id
+    return indexed
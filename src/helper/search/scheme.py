@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class SearchResultScheme(BaseModel):
+    kind: str
+    object_id: int
+    project_id: int | None = None
+    title: str | None = None
+    snippet: str | None = None
+    rank: float
+
+
+class SearchResponseScheme(BaseModel):
+    page: int
+    limit: int
+    data: list[SearchResultScheme]
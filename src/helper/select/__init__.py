@@ -1,6 +1,7 @@
 from typing import Any
 
 from fastapi import HTTPException
+from pydantic import BaseModel
 from tortoise import Model
 from tortoise.queryset import QuerySet, QuerySetSingle
 
@@ -73,6 +74,42 @@ class Select:
 
         return query.values(*list(set(self.data)))
 
+    @staticmethod
+    def fields(model: Model, exclude: list[str] = None) -> list[str]:
+        exclude = exclude or []
+        return [
+            name
+            for name in model._meta.fields_map
+            if name in model._meta.db_fields
+            and name not in exclude
+            and name.removesuffix("_id") not in exclude
+        ]
+
+    @staticmethod
+    def validate(
+        select: list[str] | None,
+        model: Model,
+        exclude: list[str] = None,
+        scheme: type[BaseModel] | None = None,
+    ) -> list[str] | None:
+        """
+        Returns `select` deduplicated, or raises 400 if it names a column that
+        is excluded, not stored on `model`, or not exposed by `scheme`.
+        """
+        if not select:
+            return None
+        allowed = [
+            field
+            for field in Select.fields(model, exclude)
+            if scheme is None or field in scheme.model_fields
+        ]
+        for field in select:
+            if field not in allowed:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid select field: {field}"
+                )
+        return list(dict.fromkeys(select))
+
     @staticmethod
     def create(
         query: QuerySet | list[dict[str, Any]],
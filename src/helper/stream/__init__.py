@@ -0,0 +1,97 @@
+import csv
+import io
+from typing import Any, AsyncIterator
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from tortoise.queryset import QuerySet
+
+from src.config.settings import STREAM_CHUNK_SIZE
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def iterate_values(
+    query: QuerySet, fields: list[str], chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Yields the rows of `query` as lists of at most `chunk_size` dicts.
+
+    Postgres reads through a server-side cursor; other backends page through
+    the table by primary key, so memory stays bounded either way.
+    """
+    values = query.values(*fields)
+    values._choose_db_if_not_chosen()
+    connection = values._db
+    if connection.capabilities.dialect == "postgres":
+        values._make_query()
+        sql, params = values.query.get_parameterized_sql()
+        async with connection.acquire_connection() as conn:
+            async with conn.transaction():
+                chunk = []
+                async for record in conn.cursor(sql, *params, prefetch=chunk_size):
+                    chunk.append(dict(record))
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+                if chunk:
+                    yield chunk
+        return
+
+    pk = query.model._meta.pk_attr
+    fields = list(dict.fromkeys([*fields, pk]))
+    last = None
+    while True:
+        page = query.order_by(pk).limit(chunk_size)
+        if last is not None:
+            page = page.filter(**{f"{pk}__gt": last})
+        rows = await page.values(*fields)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1][pk]
+
+
+async def ndjson_stream(
+    chunks: AsyncIterator[list[dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield b"".join(orjson.dumps(row, default=str) + b"\n" for row in chunk)
+
+
+async def csv_stream(
+    chunks: AsyncIterator[list[dict[str, Any]]], fields: list[str]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    async for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_response(
+    query: QuerySet,
+    fields: list[str],
+    format: str = "ndjson",
+    filename: str = "export",
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> StreamingResponse:
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid export format: {format}")
+    chunks = iterate_values(query, fields, chunk_size)
+    return StreamingResponse(
+        ndjson_stream(chunks) if format == "ndjson" else csv_stream(chunks, fields),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{format}"},
+    )
+
+
+__all__ = ["iterate_values", "ndjson_stream", "csv_stream", "stream_response"]
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
-from src.helper import authenticate_user, login, logout
+from src.helper import authenticate_user, login, login_throttle, logout
 from src.helper.scheme import Detail, LoginSerializer, Token
 from src.helper.user import User, UserCreateScheme
 
@@ -9,11 +9,24 @@ router = APIRouter()
 
 @router.post("/login", response_model=Token)
 async def login_router(
-    credentials: LoginSerializer, response: Response, next: str = Query(None)
+    credentials: LoginSerializer,
+    request: Request,
+    response: Response,
+    next: str = Query(None),
 ):
+    ip_address = request.client.host if request.client else None
+    if retry_after := await login_throttle.locked(credentials.username, ip_address):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     if user := await authenticate_user(credentials.username, credentials.password):
+        await login_throttle.reset(credentials.username, ip_address)
         return await login(user, response)
 
+    await login_throttle.fail(credentials.username, ip_address)
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
     )
@@ -29,5 +42,5 @@ async def register_router(user: UserCreateScheme, response: Response):
 
 
 @router.get("/logout", response_model=Detail)
-async def logout_router(response: Response):
-    return await logout(response)
+async def logout_router(request: Request, response: Response):
+    return await logout(response, request.cookies.get("refresh_token"))
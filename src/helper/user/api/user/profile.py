@@ -33,11 +33,12 @@ async def get_profiles_router(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     sort = OrderBy.create((await User.get(id=user_id)).image.all(), sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        FileResponseScheme, objects, pagination
+        FileResponseScheme, objects, pagination, fields=fields
     )
 
 
@@ -2,7 +2,7 @@ from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
-from src.helper.auth import login_required
+from src.helper.auth import login_required, revocation_store
 from src.helper.filters import Filter, create_filter_schema
 from src.helper.logger import ActionEnum, log_action
 from src.helper.orderby import OrderBy
@@ -29,11 +29,12 @@ async def get_user(
     user: User = Depends(login_required),
     sort_by: list[str] = Query([]),
     pagination: bool = Query(True),
+    fields: list[str] = Query(None),
 ):
     sort = OrderBy.create(User.all(), sort_by)
     objects = Filter.create(sort, filters)
     return await Paginator(limit=limit, page=page).paginated(
-        UserResponseScheme, objects, pagination
+        UserResponseScheme, objects, pagination, fields=fields, exclude=["password"]
     )
 
 
@@ -70,6 +71,8 @@ async def update_user(user_id: int, user: UserCreateScheme):
         result.password = user.password
 
     await result.save(password_changed=password_changed)
+    if password_changed:
+        await revocation_store.revoke_user(result.id)
     return await UserResponseScheme.from_tortoise_orm(UserResponseScheme, result)
 
 
@@ -10,6 +10,11 @@ from fastapi import Security, WebSocket, WebSocketDisconnect, status
 from pydantic import BaseModel, ValidationError
 from redis.asyncio import Redis
 
+from src.config.settings import USE_METRICS
+
+if USE_METRICS:
+    from src.helper.metrics.collectors import track_websockets
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +43,7 @@ class WebSocketManager:
         max_message_size: int = 1024 * 1024,
         auth_dependency: Optional[Callable] = None,
         message_model: Optional[BaseModel] = WebSocketMessage,
+        name: str = "default",
     ):
         self.redis = Redis.from_url(redis_url) if redis_url else None
         self.rate_limit = rate_limit
@@ -46,6 +52,8 @@ class WebSocketManager:
         self.message_model = message_model
         self.active_connections: Dict[str, ConnectionMetadata] = {}
         self.rate_limits: Dict[str, deque] = {}
+        if USE_METRICS:
+            track_websockets(name, self)
 
     async def connect(self, websocket: WebSocket, connection_id: str):
         await websocket.accept()